@@ -1,35 +1,99 @@
+# Library grafik & peta (altair, folium) diimport di halaman yang memakainya: tiap rerun hanya
+# menjalankan halaman aktif, jadi halaman lain tidak ikut menanggung waktu import-nya.
 import streamlit as st
 import pandas as pd
-import altair as alt
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import folium
-from streamlit_folium import st_folium
-import xml.etree.ElementTree as ET
-import io
+import numpy as np
+import json
+import math
+import os
+import tempfile
+import time
 from modules.backend import IrigasiBackend
+from modules.instrumen import Pelacak
+from modules.riwayat import proyeksi
+from modules.iksi import NAMA_PARAMETER
+from modules.skenario import grid_parameter
+from modules.prioritas import LABEL_KELAS
+from modules.wilayah import RegistriDI
 
 st.set_page_config(page_title="SMART-PAI - Enterprise", layout="wide")
 st.title("🌊 SMART-PAI (Profil Aset Irigas)")
 st.markdown("✅ **Status:** Enterprise Ready (Master Data + Inspeksi Berkala)")
 
-if 'backend' not in st.session_state:
-    st.session_state.backend = IrigasiBackend()
-app = st.session_state.backend
+# Pelacak kinerja dibagi semua backend. Jejak JSONL hanya ke path dari server (SMARTPAI_JEJAK, default
+# log/jejak_backend.jsonl), aktif dari awal jika SMARTPAI_JEJAK diisi; panel admin cuma menyalakan/mematikan.
+PATH_JEJAK = os.environ.get("SMARTPAI_JEJAK") or os.path.join("log", "jejak_backend.jsonl")
+# Impor arsip PAI hanya dari folder di bawah akar ini (bukan path bebas dari browser)
+AKAR_ARSIP_PAI = os.path.abspath(os.environ.get("SMARTPAI_ARSIP_PAI") or "arsip_pai")
+
+@st.cache_resource
+def get_pelacak():
+    return Pelacak(PATH_JEJAK if os.environ.get("SMARTPAI_JEJAK") else None)
+
+# Satu backend per proses (dibagi semua sesi): pool koneksi baca + 1 penulis, WAL
+@st.cache_resource
+def get_backend():
+    return IrigasiBackend(pelacak=get_pelacak())
+
+# Mode multi-DI: satu database per Daerah Irigasi, dipilih di sidebar
+@st.cache_resource
+def get_registri():
+    return RegistriDI(pelacak=get_pelacak())
+
+registri = get_registri()
+daftar_di = registri.daftar()
+pilihan_di = st.sidebar.selectbox("🏞️ Daerah Irigasi", ["(Utama)"] + daftar_di['kode'].tolist(),
+                                  format_func=lambda k: k if k == "(Utama)" else f"{k} - {daftar_di.set_index('kode').at[k, 'nama']}")
+app = get_backend() if pilihan_di == "(Utama)" else registri.backend(pilihan_di)
+
+# Grid per halaman (keyset pagination): hanya `batas` baris yang diambil & dirender tiap rerun
+def grid_halaman(tabel, key, batas=50, **opsi):
+    kursor = st.session_state.setdefault(f"kursor_{key}", [None])
+    h = app.get_halaman(tabel, setelah=kursor[-1], batas=batas, **opsi)
+    if h['total'] == 0:
+        st.info("Belum ada data.")
+        return
+    st.dataframe(h['data'], use_container_width=True)
+    c1, c2, c3 = st.columns([1, 1, 6])
+    if c1.button("◀", key=f"mundur_{key}", disabled=len(kursor) == 1):
+        kursor.pop()
+        st.rerun()
+    if c2.button("▶", key=f"maju_{key}", disabled=h['berikut'] is None):
+        kursor.append(h['berikut'])
+        st.rerun()
+    awal = (len(kursor) - 1) * batas
+    c3.caption(f"Baris {awal + 1:,}-{awal + len(h['data']):,} dari {h['total']:,}")
+
+# File backup milik sesi ini (temp unik per sesi), dihapus setelah diunduh / saat disiapkan ulang
+def hapus_backup():
+    path = st.session_state.pop('path_backup', None)
+    if path and os.path.exists(path): os.remove(path)
 
 # --- SIDEBAR: ADMIN PANEL ---
 st.sidebar.divider()
 with st.sidebar.expander("🛠️ Admin & Backup"):
     if st.button("⚠️ RESET SEMUA DATA"): 
-        app.hapus_semua_data()
-        st.rerun()
+        pesan = app.hapus_semua_data()
+        if "✅" in pesan: st.rerun()
+        else: st.error(pesan)
     
-    # Download Backup JSON
-    json_data = app.export_ke_json()
-    st.download_button("⬇️ Download Backup (JSON)", json_data, "backup_full.json", "application/json")
+    # Download Backup JSON: dibuat hanya saat diminta, streaming ke file .json.gz (bukan tiap render)
+    if st.button("📦 Siapkan Backup (JSON)"):
+        hapus_backup()
+        fd, path_backup = tempfile.mkstemp(prefix="smartpai_backup_", suffix=".json.gz")
+        os.close(fd)
+        st.session_state.path_backup = path_backup
+        pesan = app.export_ke_file(path_backup)
+        if "✅" not in pesan:
+            hapus_backup()
+            st.error(pesan)
+    if os.path.exists(st.session_state.get('path_backup', '')):
+        with open(st.session_state.path_backup, 'rb') as f:
+            st.download_button("⬇️ Download Backup (JSON.GZ)", f.read(), "backup_full.json.gz", "application/gzip",
+                               on_click=hapus_backup)
     
     # Restore Backup JSON
-    up_json = st.file_uploader("⬆️ Restore Backup (JSON)", type=["json"])
+    up_json = st.file_uploader("⬆️ Restore Backup (JSON)", type=["json", "gz"])
     if up_json and st.button("Restore Sekarang"):
         pesan = app.import_dari_json(up_json)
         if "Berhasil" in pesan:
@@ -38,7 +102,58 @@ with st.sidebar.expander("🛠️ Admin & Backup"):
         else:
             st.error(pesan)
 
-menu = st.sidebar.radio("Navigasi", ["Dashboard", "1. Master Aset (Statis)", "2. Inspeksi (Dinamis)", "3. Non-Fisik", "4. Laporan & Prioritas"])
+    if st.button("🧹 Bersihkan Foto Tak Terpakai"):
+        st.info(app.bersihkan_foto())
+
+    # Impor massal arsip blangko PAI lama (.xls/.xlsx terisi, satu aset per file)
+    if os.path.isdir(AKAR_ARSIP_PAI):
+        sub = sorted(os.path.relpath(d, AKAR_ARSIP_PAI) for d, _, _ in os.walk(AKAR_ARSIP_PAI))
+        folder_pai = st.selectbox(f"📂 Folder Arsip PAI Lama (di {AKAR_ARSIP_PAI})", sub)
+    else:
+        folder_pai = None
+        st.caption(f"📂 Arsip PAI lama: letakkan folder blangko di {AKAR_ARSIP_PAI} (atau atur SMARTPAI_ARSIP_PAI)")
+    if folder_pai and st.button("Impor Arsip PAI"):
+        pesan = app.impor_pai_lama(os.path.join(AKAR_ARSIP_PAI, folder_pai))
+        if "✅" in pesan: st.success(pesan)
+        else: st.error(pesan)
+
+    # Daftarkan Daerah Irigasi baru (database terpisah)
+    with st.form("form_di", clear_on_submit=True):
+        kode_di = st.text_input("Kode DI", placeholder="contoh: DI-CIHEA")
+        nama_di = st.text_input("Nama DI")
+        kab_di = st.text_input("Kabupaten")
+        luas_di = st.number_input("Luas Baku (Ha)", min_value=0.0)
+        if st.form_submit_button("➕ Tambah DI"):
+            pesan = registri.tambah(kode_di, nama_di, kab_di, luas_di)
+            if "✅" in pesan:
+                st.success(pesan)
+                st.rerun()
+            else: st.error(pesan)
+
+# Kinerja backend: durasi, baris & SQL per method, panggilan terakhir, galat yang ditelan
+with st.sidebar.expander("⏱️ Kinerja Backend"):
+    pelacak = get_pelacak()
+    if st.checkbox("📊 Tampilkan Statistik", key="kinerja_tampil"):
+        stat = pelacak.statistik()
+        if stat.empty: st.caption("Belum ada panggilan tercatat.")
+        else:
+            st.dataframe(stat.round(2), hide_index=True, use_container_width=True)
+            galat_saja = st.checkbox("Hanya yang galat")
+            terakhir = pelacak.terakhir(50, galat_saja)
+            if not terakhir.empty:
+                st.dataframe(terakhir[['waktu', 'metode', 'durasi_ms', 'baris', 'baris_ditulis', 'jumlah_sql', 'galat']].round(2),
+                             hide_index=True, use_container_width=True)
+                if st.checkbox("🔎 SQL panggilan terakhir"):
+                    st.json(dict(terakhir.iloc[0][['metode', 'sql']]))
+    jejak = st.checkbox(f"📝 Tulis Jejak JSONL ({PATH_JEJAK})", value=pelacak.path_jejak is not None)
+    if jejak != (pelacak.path_jejak is not None):
+        if jejak and os.path.dirname(PATH_JEJAK): os.makedirs(os.path.dirname(PATH_JEJAK), exist_ok=True)
+        pelacak.atur_jejak(PATH_JEJAK if jejak else None)
+    if st.button("🔄 Reset Statistik"):
+        pelacak.reset()
+        st.rerun()
+
+menu = st.sidebar.radio("Navigasi", ["Dashboard", "1. Master Aset (Statis)", "2. Inspeksi (Dinamis)", "3. Non-Fisik", "4. Laporan & Prioritas", "5. Rekap Provinsi"])
 
 # --- DASHBOARD ---
 if menu == "Dashboard":
@@ -57,6 +172,82 @@ if menu == "Dashboard":
         st.dataframe(df_p[['nama_aset', 'Kelas_Prioritas', 'Skor_Prioritas', 'estimasi_biaya']].head(5), use_container_width=True)
     else: st.info("Belum ada data inspeksi.")
 
+    # What-if bobot/koefisien: semua kombinasi dievaluasi sekaligus atas data yang sudah dimuat
+    with st.expander("🎛️ Analisis Sensitivitas Parameter"):
+        rentang = {}
+        bawaan = ['bobot_fisik', 'koef_kerusakan']
+        for i, kolom in enumerate(st.columns(2)):
+            nama = kolom.selectbox(f"Parameter {i + 1}", ["-"] + NAMA_PARAMETER, index=NAMA_PARAMETER.index(bawaan[i]) + 1,
+                                   key=f"sens_nama_{i}")
+            if nama == "-": continue
+            dasar = float(getattr(app.parameter, nama))
+            awal = kolom.number_input("Dari", value=dasar * 0.5, key=f"sens_awal_{i}")
+            akhir = kolom.number_input("Sampai", value=dasar * 1.5, key=f"sens_akhir_{i}")
+            titik = kolom.slider("Jumlah titik", 2, 50, 11, key=f"sens_titik_{i}")
+            rentang[nama] = [float(x) for x in np.linspace(awal, akhir, titik)]
+        if rentang and st.checkbox("▶️ Hitung Sensitivitas", key="sens_hitung"):
+            import altair as alt
+            hasil = app.analisis_sensitivitas(grid_parameter(app.parameter, **rentang))
+            sumbu = list(rentang)
+            grafik = alt.Chart(hasil).mark_line(point=True).encode(
+                x=f"{sumbu[0]}:Q", y=alt.Y('IKSI:Q', scale=alt.Scale(zero=False)),
+                **({'color': f"{sumbu[1]}:N"} if len(sumbu) > 1 else {}))
+            st.altair_chart(grafik, use_container_width=True)
+            st.dataframe(hasil.drop(columns='top10'), hide_index=True)
+
+# --- 1. MASTER ASET (PETA) ---
+elif menu == "1. Master Aset (Statis)":
+    st.header("🗺️ Peta Jaringan & Master Aset")
+    up_kmz = st.file_uploader("Unggah Geometri Jaringan (KMZ/KML)", type=["kmz", "kml"])
+    if up_kmz and st.button("Simpan Geometri"):
+        pesan = app.impor_geometri_kmz(up_kmz)
+        if "✅" in pesan: st.success(pesan)
+        else: st.error(pesan)
+
+    # Peta hanya memuat fitur di viewport (R*Tree), disederhanakan sesuai zoom
+    batas = app.get_batas_geometri()
+    if batas:
+        if 'peta_view' not in st.session_state:
+            x0, y0, x1, y1 = batas
+            lebar = max(x1 - x0, y1 - y0, 1e-4)
+            zoom = int(max(1, min(18, math.log2(360 * 800 / (256 * lebar)))))
+            st.session_state.peta_view = {'bounds': batas, 'zoom': zoom}
+        import folium
+        from streamlit_folium import st_folium
+        view = st.session_state.peta_view
+        x0, y0, x1, y1 = view['bounds']
+        peta = folium.Map(location=[(y0 + y1) / 2, (x0 + x1) / 2], zoom_start=view['zoom'])
+        geojson = app.get_geometri_viewport(x0, y0, x1, y1, view['zoom'])
+        if geojson['features']:
+            folium.GeoJson(geojson, tooltip=folium.GeoJsonTooltip(['nama'])).add_to(peta)
+        st.caption(f"{len(geojson['features']):,} fitur di layar (zoom {view['zoom']})")
+        hasil = st_folium(peta, height=500, use_container_width=True, returned_objects=['bounds', 'zoom'], key='peta')
+        b = (hasil or {}).get('bounds') or {}
+        if b.get('_southWest') and b['_southWest'].get('lng') is not None:
+            baru = {'bounds': (b['_southWest']['lng'], b['_southWest']['lat'], b['_northEast']['lng'], b['_northEast']['lat']),
+                    'zoom': int(hasil.get('zoom') or view['zoom'])}
+            if baru != view:
+                st.session_state.peta_view = baru
+                st.rerun()
+    else:
+        st.info("Belum ada geometri. Unggah file KMZ/KML jaringan irigasi.")
+
+    # Filter & rekap atribut teknis dihitung SQLite (kolom dim_* ber-index), bukan json.loads per baris
+    with st.expander("📐 Cari & Rekap Data Teknis"):
+        c1, c2, c3 = st.columns(3)
+        atribut = c1.selectbox("Atribut", ["panjang", "lebar", "tinggi", "debit"])
+        op = c2.selectbox("Operator", [">", ">=", "<", "<=", "="])
+        nilai = c3.number_input("Nilai", 0.0)
+        if st.checkbox("🔎 Tampilkan Hasil", key="teknis_tampil"):
+            st.dataframe(app.cari_aset_teknis(filter=[(atribut, op, nilai)], urut=f"-{atribut}", batas=500), use_container_width=True)
+            st.caption(f"Total & rata-rata {atribut} per jenis aset:")
+            rekap = app.agregat_teknis(atribut, 'sum')
+            rekap[f"avg_{atribut}"] = app.agregat_teknis(atribut, 'avg')[f"avg_{atribut}"]
+            st.dataframe(rekap, use_container_width=True)
+
+    st.caption("Master Aset:")
+    grid_halaman('master_aset', 'master')
+
 # --- 3. NON FISIK (LENGKAP) ---
 elif menu == "3. Non-Fisik":
     st.header("Data Penunjang IKSI")
@@ -85,7 +276,7 @@ elif menu == "3. Non-Fisik":
                 st.success(app.tambah_data_tanam_lengkap(mt, lr, lrl, qa, qb, padi, palawija))
         
         st.caption("Riwayat Data Tanam:")
-        st.dataframe(app.get_table_data('data_tanam'), use_container_width=True)
+        grid_halaman('data_tanam', 'tanam')
 
     # --- TAB 2: P3A ---
     with t_p3a:
@@ -102,7 +293,7 @@ elif menu == "3. Non-Fisik":
                 st.success(app.tambah_data_p3a(nm, ds, stt, akt, ang))
         
         st.caption("Database P3A:")
-        st.dataframe(app.get_table_data('data_p3a'), use_container_width=True)
+        grid_halaman('data_p3a', 'p3a')
 
     # --- TAB 3: SDM & SARANA ---
     with t_sdm:
@@ -118,7 +309,7 @@ elif menu == "3. Non-Fisik":
                 st.success(app.tambah_sdm_sarana(jns, nm, cond, ket))
         
         st.caption("Inventaris SDM & Sarana:")
-        st.dataframe(app.get_table_data('data_sdm_sarana'), use_container_width=True)
+        grid_halaman('data_sdm_sarana', 'sdm')
 
     # --- TAB 4: DOKUMENTASI ---
     with t_dok:
@@ -152,11 +343,41 @@ elif menu == "2. Inspeksi (Dinamis)":
     st.header("🔍 Inspeksi Berkala")
     st.warning("Penilaian dipisah: SIPIL (Struktur) vs ME (Pintu/Mesin).")
     
-    m = app.get_master_aset()
-    if m.empty: st.error("Master Aset Kosong!"); st.stop()
+    if app.hitung_baris('master_aset') == 0: st.error("Master Aset Kosong!"); st.stop()
     
-    aset = st.selectbox("Pilih Aset", m['nama_aset'].tolist())
-    aid = int(m[m['nama_aset']==aset].iloc[0]['id'])
+    # Cari per awalan kata (FTS5), hanya 50 hasil teratas yang masuk selectbox
+    teks = st.text_input("🔎 Cari Aset (nama / kode / jenis)")
+    hasil = app.cari_aset(teks, batas=50)
+    if hasil.empty: st.warning("Aset tidak ditemukan."); st.stop()
+    pilihan = {int(i): f"{n} ({k})" for i, n, k in zip(hasil['id'], hasil['nama_aset'], hasil['kode_aset'])}
+    aid = st.selectbox("Pilih Aset", list(pilihan), format_func=pilihan.get)
+
+    # Tren dari semua inspeksi aset ini + proyeksi laju kemerosotan (ringkasan_kondisi)
+    with st.expander("📈 Riwayat & Prediksi Kondisi"):
+        if st.checkbox("📊 Tampilkan Riwayat", key="riwayat_tampil"):
+            riwayat, ringkas = app.get_riwayat_aset(aid)
+            if riwayat.empty:
+                st.info("Belum ada inspeksi untuk aset ini.")
+            else:
+                riwayat['Kondisi'] = riwayat[['kondisi_sipil', 'kondisi_me']].min(axis=1)
+                riwayat['Fungsi'] = riwayat[['nilai_fungsi_sipil', 'nilai_fungsi_me']].min(axis=1)
+                kurva = riwayat[['tahun', 'Kondisi', 'Fungsi']].assign(Seri='Inspeksi')
+                if ringkas is not None:
+                    m1, m2, m3, m4 = st.columns(4)
+                    m1.metric("Laju Kondisi", f"{ringkas['laju_kondisi']:.1f} /thn" if pd.notna(ringkas['laju_kondisi']) else "-")
+                    m2.metric("Laju Fungsi", f"{ringkas['laju_fungsi']:.1f} /thn" if pd.notna(ringkas['laju_fungsi']) else "-")
+                    m3.metric("Prediksi Mendesak", f"{ringkas['tahun_mendesak']:.0f}" if pd.notna(ringkas['tahun_mendesak']) else "-")
+                    m4.metric("Prediksi Darurat", f"{ringkas['tahun_darurat']:.0f}" if pd.notna(ringkas['tahun_darurat']) else "-")
+                    dt = pd.Series(range(0, 21, 2), dtype=float)
+                    k, f, _ = proyeksi(ringkas['kondisi_terakhir'], ringkas['fungsi_terakhir'], 0.0,
+                                       ringkas['laju_kondisi'], ringkas['laju_fungsi'], dt, app.parameter)
+                    kurva = pd.concat([kurva, pd.DataFrame({'tahun': ringkas['tahun_terakhir'] + dt, 'Kondisi': k,
+                                                            'Fungsi': f, 'Seri': 'Prediksi'})])
+                kurva = kurva.melt(['tahun', 'Seri'], var_name='Nilai', value_name='%')
+                import altair as alt
+                st.altair_chart(alt.Chart(kurva).mark_line(point=True).encode(
+                    x=alt.X('tahun:Q', title='Tahun', scale=alt.Scale(zero=False)), y=alt.Y('%:Q', scale=alt.Scale(domain=[0, 100])),
+                    color='Nilai:N', strokeDash='Seri:N'), use_container_width=True)
     
     c1, c2 = st.columns(2)
     with c1:
@@ -174,8 +395,46 @@ elif menu == "2. Inspeksi (Dinamis)":
     rek = st.text_input("Rekomendasi")
     biaya = st.number_input("Estimasi Biaya Rehab (Rp)", 0.0, step=1000000.0)
     
+    surveyor = st.text_input("Nama Surveyor", key="nama_surveyor")
+    foto = st.file_uploader("📷 Foto Bukti", type=["jpg", "jpeg", "png", "webp"], accept_multiple_files=True)
+    
     if st.button("Simpan Laporan"):
-        st.success(app.tambah_inspeksi(aid, "Surveyor", ks, kme, nfs, nfme, ls_imp, rek, biaya))
+        if not surveyor.strip(): st.error("❌ Isi nama surveyor dulu")
+        else: st.success(app.tambah_inspeksi(aid, surveyor.strip(), ks, kme, nfs, nfme, ls_imp, rek, biaya, foto=foto))
+
+    # Galeri: thumbnail dari cache LRU / file thumbnail, foto asli hanya dibaca (mmap) saat dipilih
+    with st.expander("🖼️ Foto Bukti Aset"):
+        if st.checkbox("🖼️ Tampilkan Foto", key="galeri_tampil"):
+            galeri = app.get_foto_aset(aid)
+            if galeri.empty:
+                st.info("Belum ada foto bukti untuk aset ini.")
+            else:
+                # Tidak menunggu worker: thumbnail yang belum jadi tampil sebagai placeholder (muncul saat rerun)
+                kolom = st.columns(6)
+                for n, baris in enumerate(galeri.itertuples()):
+                    thumb = app.foto_thumbnail(baris.hash, tunggu=0)
+                    if thumb: kolom[n % 6].image(thumb, caption=baris.tanggal_inspeksi, use_container_width=True)
+                    else: kolom[n % 6].caption(f"⏳ {baris.tanggal_inspeksi}: thumbnail belum tersedia")
+                pilih = st.selectbox("Lihat Ukuran Asli", [None] + galeri['hash'].tolist(),
+                                     format_func=lambda h: "-" if h is None else h[:12])
+                if pilih:
+                    with app.buka_foto(pilih) as data: st.image(data.tobytes())
+
+    # Paket dari perangkat offline: {"kursor": ..., "inspeksi": [{uuid, aset_id, waktu_survei, ...}]}
+    with st.expander("📲 Sinkron Data Lapangan (Offline)"):
+        up_sinkron = st.file_uploader("Paket Sinkron Perangkat (JSON)", type=["json"])
+        if up_sinkron and st.button("Sinkron Sekarang"):
+            try:
+                paket = json.load(up_sinkron)
+                hasil = app.sinkron_inspeksi(paket.get('inspeksi', []), kursor=paket.get('kursor'))
+            except (ValueError, AttributeError) as e:
+                st.error(f"❌ Paket tidak valid: {e}")
+            else:
+                if "✅" in hasil['pesan']: st.success(hasil['pesan'])
+                else: st.error(hasil['pesan'])
+                if hasil['konflik']: st.warning(f"{len(hasil['konflik']):,} record bentrok dengan data server (revisi lama), tidak ditimpa.")
+                if hasil['ditolak']: st.dataframe(pd.DataFrame(hasil['ditolak']), hide_index=True)
+                st.download_button("⬇️ Balasan untuk Perangkat (JSON)", json.dumps(hasil), "balasan_sinkron.json", "application/json")
 
 # --- 3. NON FISIK ---
 elif menu == "3. Non-Fisik":
@@ -186,7 +445,7 @@ elif menu == "3. Non-Fisik":
         mt = c1.selectbox("Musim", ["MT1","MT2"]); lr = c1.number_input("Rencana (Ha)"); lrl = c1.number_input("Realisasi (Ha)")
         qa = c2.number_input("Debit Andalan (L/dt)"); qb = c2.number_input("Kebutuhan Air (L/dt)")
         if st.button("Simpan Tanam"): st.success(app.tambah_data_tanam_lengkap(mt, lr, lrl, qa, qb, 0, 0))
-        st.dataframe(app.get_table_data('data_tanam'))
+        grid_halaman('data_tanam', 'tanam_2')
     with t2:
         st.info("Fitur P3A, SDM, Dokumen tersedia di backend.")
 
@@ -195,26 +454,63 @@ elif menu == "4. Laporan & Prioritas":
     st.header("📄 Cetak Laporan Resmi")
     st.write("Menggunakan format standar Dinas PU (Header, Tabel Prioritas, Valuasi).")
     
+    # Laporan dibuat di proses worker; halaman hanya memantau status (rerun tidak membatalkan)
     if st.button("Generate Excel Blangko"):
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-            wb = writer.book
-            fmt_header = wb.add_format({'bold': True, 'align': 'center', 'bg_color': '#D9D9D9', 'border': 1})
-            
-            # 1. SHEET PRIORITAS
-            ws1 = wb.add_worksheet('Prioritas Penanganan')
-            df_p = app.get_prioritas_matematis()
-            
-            headers = ['Nama Aset', 'Jenis', 'Kondisi Sipil', 'Kondisi ME', 'Skor Bahaya', 'Kelas Prioritas', 'Biaya Rehab']
-            for col, h in enumerate(headers): ws1.write(0, col, h, fmt_header)
-            
-            if not df_p.empty:
-                for idx, row in enumerate(df_p.itertuples(), 1):
-                    ws1.write_row(idx, 0, [row.nama_aset, row.jenis_aset, row.kondisi_sipil, row.kondisi_me, row.Skor_Prioritas, row.Kelas_Prioritas, row.estimasi_biaya])
-            
-            # 2. SHEET MASTER
-            app.get_master_aset().to_excel(writer, sheet_name='Master Data', index=False)
-            
-        st.download_button("Download Laporan Siap Cetak", buffer, "Laporan_Resmi_SIKI.xlsx")
+        st.session_state.id_laporan = app.mulai_laporan('excel')
+    status = app.status_laporan(st.session_state.id_laporan) if 'id_laporan' in st.session_state else None
+    if status and status['status'] in ('antri', 'berjalan'):
+        st.progress(status['kemajuan'], text=f"⏳ Menyusun laporan... {status['kemajuan']:.0%}")
+        time.sleep(1)
+        st.rerun()
+    elif status and status['status'] == 'selesai' and os.path.exists(status['path']):
+        st.success(status['pesan'])
+        with open(status['path'], 'rb') as f:
+            st.download_button("Download Laporan Siap Cetak", f, "Laporan_Resmi_SIKI.xlsx")
+    elif status and status['status'] == 'gagal':
+        st.error(status['pesan'])
 
+    # Prediksi dari laju kemerosotan riwayat inspeksi (bukan hanya inspeksi terakhir)
+    st.subheader("⏳ Prediksi Tahun Masuk Kelas Prioritas")
+    prediksi = app.get_ringkasan_kondisi('tahun_mendesak', batas=50)
+    if prediksi.empty:
+        st.info("Belum ada riwayat inspeksi.")
+    else:
+        st.dataframe(prediksi[['kode_aset', 'nama_aset', 'jenis_aset', 'jumlah_inspeksi', 'kondisi_terakhir',
+                               'laju_kondisi', 'laju_fungsi', 'skor_terakhir', 'tahun_perhatian', 'tahun_mendesak',
+                               'tahun_darurat']], hide_index=True)
+
+    # Pilih paket pekerjaan di bawah pagu tahunan (bukan sekadar potong daftar prioritas)
+    st.subheader("💰 Optimasi Anggaran Rehabilitasi")
+    teks_pagu = st.text_input("Pagu per Tahun (Rp, pisahkan dengan koma)", "5000000000")
+    bawa_sisa = st.checkbox("Sisa anggaran dibawa ke tahun berikutnya")
+    try:
+        pagu = [float(p.replace('.', '').strip()) for p in teks_pagu.split(',') if p.strip()]
+        rencana, per_tahun = app.rencana_penanganan(pagu, bawa_sisa=bawa_sisa)
+    except ValueError as e:
+        st.error(f"❌ Pagu tidak valid: {e}")
+    else:
+        if per_tahun.empty:
+            st.info("Belum ada data prioritas.")
+        else:
+            st.dataframe(per_tahun, hide_index=True)
+            st.dataframe(rencana[['tahun_ke', 'nama_aset', 'jenis_aset', 'Kelas_Prioritas', 'Skor_Prioritas',
+                                  'luas_terdampak_aktual', 'estimasi_biaya', 'Manfaat']], hide_index=True)
 
+# --- REKAP PROVINSI (SEMUA DI) ---
+elif menu == "5. Rekap Provinsi":
+    st.header("🗺️ Rekap Provinsi (Multi-DI)")
+    if daftar_di.empty:
+        st.info("Belum ada DI terdaftar. Tambahkan lewat menu Admin di sidebar.")
+    else:
+        # Agregat dihitung per DI (paralel) lalu dijumlahkan; DI yang tidak berubah diambil dari cache
+        per_di, provinsi, teratas = registri.rekap_provinsi(parameter=app.parameter)
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("IKSI Provinsi", f"{provinsi['IKSI']:.2f}")
+        c2.metric("Jumlah DI", len(per_di))
+        c3.metric("Aset Terinspeksi", f"{provinsi['jumlah_aset']:,}")
+        c4.metric("Aset Darurat", f"{provinsi[LABEL_KELAS[0]]:,}")
+        st.subheader("Rekap per DI")
+        st.dataframe(per_di, hide_index=True, use_container_width=True)
+        st.subheader("🔥 Prioritas Teratas Provinsi")
+        if teratas.empty: st.info("Belum ada data inspeksi.")
+        else: st.dataframe(teratas, hide_index=True, use_container_width=True)
@@ -0,0 +1,64 @@
+"""Benchmark backup: export_ke_json lama (pandas + json.dumps satu string) vs export_ke_file
+streaming (fetchmany, gzip). Diukur puncak memori Python (tracemalloc) & waktu.
+
+Jalankan dari root repo:  python benchmarks/bench_backup.py [jumlah_inspeksi ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend, TABEL_DATA
+
+
+# Export lama, disalin apa adanya sebagai pembanding
+def export_lama(app):
+    data = {}
+    with app._baca() as conn:
+        for t in TABEL_DATA:
+            data[t] = pd.read_sql(f"SELECT * FROM {t}", conn).to_dict(orient='records')
+    return json.dumps(data, indent=2)
+
+
+def isi_data(app, n, seed=3):
+    rng = np.random.default_rng(seed)
+    n_aset = max(1, n // 10)
+    app.hapus_semua_data()
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset, dimensi_teknis) VALUES (?, ?, ?, ?, ?)",
+                        [(a, f"SAL-{a}", f"Saluran {a}", "Saluran", '{"panjang": 1200}') for a in range(1, n_aset + 1)])
+        k = rng.integers(0, 101, n).tolist()
+        cur.executemany('''INSERT INTO inspeksi_aset
+            (aset_id, tanggal_inspeksi, nama_surveyor, kondisi_sipil, kondisi_me, nilai_fungsi_sipil, nilai_fungsi_me,
+             luas_terdampak_aktual, rekomendasi_penanganan, estimasi_biaya)
+            VALUES (?, '2024-01-01', 'Surveyor', ?, ?, 100, 70, 50, 'Perbaikan pasangan batu', 1e6)''',
+                        [(i % n_aset + 1, k[i], k[i]) for i in range(n)])
+
+
+def ukur(fungsi):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fungsi()
+    durasi = time.perf_counter() - t0
+    puncak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return puncak / 1e6, durasi
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 300_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        path = os.path.join(tmp, 'backup.json.gz')
+        print(f"{'inspeksi':>9} | {'lama MB':>8} | {'lama s':>7} | {'stream MB':>9} | {'stream s':>8} | {'file gz MB':>10}")
+        for n in ukuran:
+            isi_data(app, n)
+            mb_lama, t_lama = ukur(lambda: export_lama(app))
+            mb_baru, t_baru = ukur(lambda: app.export_ke_file(path))
+            print(f"{n:>9,} | {mb_lama:>8.1f} | {t_lama:>7.2f} | {mb_baru:>9.1f} | {t_baru:>8.2f} | {os.path.getsize(path) / 1e6:>10.1f}")
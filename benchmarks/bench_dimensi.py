@@ -0,0 +1,72 @@
+"""Benchmark atribut teknis: filter & agregat dimensi_teknis cara lama (baca semua baris lalu
+json.loads di Python) vs kolom generated dim_* + index (cari_aset_teknis / agregat_teknis).
+
+Jalankan dari root repo:  python benchmarks/bench_dimensi.py [jumlah_aset ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+
+JENIS = ['Saluran', 'Tanggul', 'Bendung', 'Bangunan Bagi', 'Gorong-Gorong', 'Talang']
+
+
+def isi_aset(app, n, seed=7):
+    rng = np.random.default_rng(seed)
+    jenis = rng.choice(JENIS, n)
+    app.hapus_semua_data()
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (kode_aset, nama_aset, jenis_aset, dimensi_teknis) VALUES (?, ?, ?, ?)", [
+            (f"A-{i}", f"Aset {i}", j, json.dumps(
+                {'panjang': round(float(rng.uniform(50, 5000)), 1), 'b': round(float(rng.uniform(0.5, 12)), 2), 'h': 1.5,
+                 'bahan': 'Pasangan Batu'} if j in ('Saluran', 'Tanggul') else
+                {'b': round(float(rng.uniform(1, 60)), 2), 'h': round(float(rng.uniform(0.5, 8)), 2), 'tipe': 'Tetap',
+                 'ruas': [{'awal': 0, 'akhir': 100}]}))
+            for i, j in enumerate(jenis)])
+        cur.execute("ANALYZE")
+
+
+# Cara lama: semua baris ke pandas, json.loads per baris
+def lama_filter(app):
+    df = app.get_master_aset()
+    df = df[df['jenis_aset'] == 'Bendung']
+    lebar = df['dimensi_teknis'].map(lambda t: json.loads(t).get('b'))
+    return df[lebar > 50]
+
+
+def lama_agregat(app):
+    df = app.get_master_aset()
+    df['panjang'] = df['dimensi_teknis'].map(lambda t: json.loads(t).get('panjang'))
+    return df.groupby('jenis_aset')['panjang'].sum()
+
+
+def ukur(fungsi, ulang=5):
+    t0 = time.perf_counter()
+    for _ in range(ulang): hasil = fungsi()
+    return (time.perf_counter() - t0) / ulang * 1e3, len(hasil)
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 300_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        print(f"{'aset':>8} | {'filter lama ms':>14} | {'filter SQL ms':>13} | {'agregat lama ms':>15} | {'agregat SQL ms':>14}")
+        for n in ukuran:
+            isi_aset(app, n)
+            fl, n1 = ukur(lambda: lama_filter(app))
+            fb, n2 = ukur(lambda: app.cari_aset_teknis('Bendung', [('lebar', '>', 50)]))
+            al, _ = ukur(lambda: lama_agregat(app))
+            ab, _ = ukur(lambda: app.agregat_teknis('panjang', 'sum'))
+            assert n1 == n2
+            print(f"{n:>8,} | {fl:>14.1f} | {fb:>13.1f} | {al:>15.1f} | {ab:>14.1f}")
+        with app._baca() as conn:
+            for sql in ("SELECT jenis_aset, SUM(dim_panjang) FROM master_aset INDEXED BY idx_dim_panjang GROUP BY jenis_aset",
+                        "SELECT * FROM master_aset WHERE jenis_aset = 'Bendung' AND dim_lebar > 50"):
+                print(conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()[0][-1])
@@ -0,0 +1,83 @@
+"""Benchmark gudang foto bukti (modules/foto.py):
+- unggah: foto multi-MB, sebagian besar unggahan ulang foto yang sama -> byte di disk vs byte diunggah,
+  dibanding menyimpan BLOB di tabel SQLite (ukuran file DB)
+- thumbnail: dibuat worker pool (draft JPEG) vs dekode penuh + resize per foto
+- render halaman inspeksi (24 thumbnail): cache LRU hangat vs file thumbnail vs dekode foto asli tiap render
+
+Jalankan dari root repo:  python benchmarks/bench_foto.py [jumlah_foto_unik] [jumlah_unggahan]
+"""
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.foto import GudangFoto
+
+
+def buat_jpeg(seed, lebar=4000, tinggi=3000):
+    # Blok 8x8 acak: ukuran file mirip foto kamera ponsel (~2-3 MB)
+    rng = np.random.default_rng(seed)
+    piksel = rng.integers(0, 255, (tinggi // 8, lebar // 8, 3), dtype=np.uint8).repeat(8, 0).repeat(8, 1)
+    buf = io.BytesIO()
+    Image.fromarray(piksel).save(buf, 'JPEG', quality=92)
+    return buf.getvalue()
+
+
+def thumbnail_langsung(data, sisi=320):
+    with Image.open(io.BytesIO(data)) as im:
+        im = im.convert('RGB')
+        im.thumbnail((sisi, sisi))
+        buf = io.BytesIO()
+        im.save(buf, 'JPEG', quality=80)
+        return buf.getvalue()
+
+
+def detik(fungsi):
+    t0 = time.perf_counter()
+    hasil = fungsi()
+    return time.perf_counter() - t0, hasil
+
+
+if __name__ == '__main__':
+    unik = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    unggah = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    foto = [buat_jpeg(i) for i in range(unik)]
+    urutan = np.random.default_rng(19).integers(0, unik, unggah)
+    byte_unggah = sum(len(foto[i]) for i in urutan)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        gudang = GudangFoto(os.path.join(tmp, 'foto'))
+        t_simpan, hash_foto = detik(lambda: [gudang.simpan(io.BytesIO(foto[i]))[0] for i in urutan])
+        byte_disk = sum(os.path.getsize(gudang._path(h)) for h in set(hash_foto))
+        t_thumb, _ = detik(lambda: [gudang.thumbnail(h, tunggu=600) for h in dict.fromkeys(hash_foto)])
+
+        db = os.path.join(tmp, 'blob.db')
+        with sqlite3.connect(db) as conn:
+            conn.execute("CREATE TABLE foto (id INTEGER PRIMARY KEY, inspeksi_id INTEGER, data BLOB)")
+            t_blob, _ = detik(lambda: conn.executemany("INSERT INTO foto (inspeksi_id, data) VALUES (?, ?)",
+                                                       ((n, foto[i]) for n, i in enumerate(urutan))))
+        byte_blob = os.path.getsize(db)
+
+        contoh = list(dict.fromkeys(hash_foto))[:24]
+        gudang_dingin = GudangFoto(os.path.join(tmp, 'foto'))
+        t_file, _ = detik(lambda: [gudang_dingin.thumbnail(h) for h in contoh])
+        t_lru, _ = detik(lambda: [gudang_dingin.thumbnail(h) for h in contoh])
+        asli = {h: foto[i] for h, i in zip(hash_foto, urutan)}
+        t_dekode, _ = detik(lambda: [thumbnail_langsung(asli[h]) for h in contoh])
+        t_serial, _ = detik(lambda: [thumbnail_langsung(foto[i]) for i in range(unik)])
+        gudang.tutup()
+
+    print(f"{unggah:,} unggahan dari {unik:,} foto unik, CPU {os.cpu_count()}")
+    print(f"  unggah + hash + simpan     : {t_simpan:7.2f} s  ({byte_unggah / 1e6 / t_simpan:,.0f} MB/s)")
+    print(f"  byte diunggah / di disk    : {byte_unggah / 1e6:8.1f} MB / {byte_disk / 1e6:.1f} MB")
+    print(f"  simpan sebagai BLOB SQLite : {t_blob:7.2f} s, file DB {byte_blob / 1e6:.1f} MB")
+    print(f"  thumbnail worker (draft)   : {t_thumb:7.2f} s menunggu {unik} thumbnail selesai setelah unggah")
+    print(f"  thumbnail dekode penuh     : {t_serial:7.2f} s untuk {unik} foto")
+    print(f"  render 24 thumbnail:  LRU {t_lru * 1e3:.2f} ms | file {t_file * 1e3:.1f} ms | "
+          f"dekode asli {t_dekode * 1e3:,.0f} ms")
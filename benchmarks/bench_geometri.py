@@ -0,0 +1,87 @@
+"""Benchmark peta: latensi query viewport (R*Tree + level penyederhanaan) pada 50k fitur vs scan
+tabel kotak biasa + geometri asli. Data sintetis: KML saluran (random walk), bangunan (titik),
+petak (poligon) di area ~2 x 2 derajat, diimpor lewat impor_geometri_kmz (iterparse).
+
+Jalankan dari root repo:  python benchmarks/bench_geometri.py [jumlah_fitur]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+from modules.geometri import ke_geojson
+
+PUSAT = (110.0, -7.0)
+
+
+def tulis_kml(path, n, seed=11):
+    rng = np.random.default_rng(seed)
+    with open(path, 'w') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="http://www.opengis.net/kml/2.2"><Document>\n')
+        for i in range(n):
+            x, y = PUSAT[0] + rng.uniform(-1, 1), PUSAT[1] + rng.uniform(-1, 1)
+            jenis = i % 10
+            if jenis < 6:    # saluran: 20-300 titik, langkah ~10 m
+                k = int(rng.integers(20, 300))
+                xy = np.cumsum(rng.normal(0, 1e-4, (k, 2)), axis=0) + (x, y)
+                geom = f"<LineString><coordinates>{' '.join(f'{a:.6f},{b:.6f},0' for a, b in xy)}</coordinates></LineString>"
+            elif jenis < 9:  # bangunan
+                geom = f"<Point><coordinates>{x:.6f},{y:.6f},0</coordinates></Point>"
+            else:            # petak tersier: poligon 40 titik
+                t = np.linspace(0, 2 * np.pi, 40)
+                r = 2e-3 * (1 + 0.2 * rng.random(40))
+                xy = np.c_[x + r * np.cos(t), y + r * np.sin(t)]
+                xy[-1] = xy[0]
+                geom = (f"<Polygon><outerBoundaryIs><LinearRing><coordinates>{' '.join(f'{a:.6f},{b:.6f}' for a, b in xy)}"
+                        f"</coordinates></LinearRing></outerBoundaryIs></Polygon>")
+            f.write(f"<Placemark><name>Fitur {i}</name>{geom}</Placemark>\n")
+        f.write('</Document></kml>\n')
+
+
+def viewport(rng, zoom, piksel=(800, 500)):
+    dpp = 360.0 / (256 * 2 ** zoom)
+    x, y = PUSAT[0] + rng.uniform(-1, 1), PUSAT[1] + rng.uniform(-1, 1)
+    return x - dpp * piksel[0] / 2, y - dpp * piksel[1] / 2, x + dpp * piksel[0] / 2, y + dpp * piksel[1] / 2
+
+
+def tanpa_index(conn, x0, y0, x1, y1, batas=5000):
+    # Pembanding: kotak di tabel biasa (scan penuh) + geometri asli tanpa penyederhanaan
+    return ke_geojson(conn.execute('''
+        SELECT f.id, f.aset_id, f.nama, f.tipe, g.koordinat FROM kotak_polos k
+        JOIN geometri_fitur f ON f.id = k.id JOIN geometri_level g ON g.fitur_id = f.id AND g.level = 0
+        WHERE k.max_x >= ? AND k.min_x <= ? AND k.max_y >= ? AND k.min_y <= ? LIMIT ?''',
+                                   (x0, x1, y0, y1, batas)).fetchall())
+
+
+def ukur(fungsi, rng, zoom, ulang=30):
+    waktu, jumlah = [], []
+    for _ in range(ulang):
+        vp = viewport(rng, zoom)
+        t0 = time.perf_counter()
+        g = fungsi(*vp)
+        waktu.append(time.perf_counter() - t0)
+        jumlah.append(len(g['features']))
+    return np.percentile(waktu, 50) * 1e3, np.percentile(waktu, 95) * 1e3, int(np.mean(jumlah))
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        kml = os.path.join(tmp, 'jaringan.kml')
+        tulis_kml(kml, n)
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        t0 = time.perf_counter()
+        print(app.impor_geometri_kmz(kml), f"| KML {os.path.getsize(kml) / 1e6:.0f} MB -> {time.perf_counter() - t0:.1f} s")
+        with app._tulis() as cur:
+            cur.execute("CREATE TABLE kotak_polos AS SELECT id, min_x, max_x, min_y, max_y FROM geometri_rtree")
+
+        print(f"{'zoom':>4} | {'rtree p50':>9} | {'p95 ms':>7} | {'fitur':>6} | {'scan p50':>8} | {'p95 ms':>7} | {'fitur':>6}")
+        with app._baca() as conn:
+            for zoom in (9, 11, 13, 15):
+                a = ukur(lambda *vp: app.get_geometri_viewport(*vp, zoom), np.random.default_rng(zoom), zoom)
+                b = ukur(lambda *vp: tanpa_index(conn, *vp), np.random.default_rng(zoom), zoom)
+                print(f"{zoom:>4} | {a[0]:>9.1f} | {a[1]:>7.1f} | {a[2]:>6,} | {b[0]:>8.1f} | {b[1]:>7.1f} | {b[2]:>6,}")
@@ -0,0 +1,61 @@
+"""Benchmark grid: muat tabel penuh (get_master_aset, cara lama tiap rerun) vs get_halaman
+(keyset, 50 baris) di halaman pertama & halaman jauh, dibanding LIMIT/OFFSET; serta pencarian
+aset LIKE '%teks%' (scan) vs cari_aset (FTS5 awalan).
+
+Jalankan dari root repo:  python benchmarks/bench_halaman.py [jumlah_aset ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+
+SUNGAI = ['Cibeet', 'Citarum', 'Ciliwung', 'Cisadane', 'Cimanuk', 'Bengawan', 'Brantas', 'Serayu']
+
+
+def isi_aset(app, n, seed=13):
+    rng = np.random.default_rng(seed)
+    sungai = rng.choice(SUNGAI, n)
+    app.hapus_semua_data()
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (kode_aset, nama_aset, jenis_aset, tahun_bangun, dimensi_teknis) VALUES (?, ?, ?, ?, ?)",
+                        [(f"SAL-{i}", f"Saluran Sekunder {s} {i}", 'Saluran', 1970 + i % 50, '{"panjang": 1200}')
+                         for i, s in enumerate(sungai)])
+
+
+def ms(fungsi, ulang=5):
+    t0 = time.perf_counter()
+    for _ in range(ulang): fungsi()
+    return (time.perf_counter() - t0) / ulang * 1e3
+
+
+def offset(app, n_offset, batas=50):
+    with app._baca() as conn:
+        return pd.read_sql("SELECT * FROM master_aset ORDER BY id LIMIT ? OFFSET ?", conn, params=[batas, n_offset])
+
+
+def like(app, teks, batas=50):
+    with app._baca() as conn:
+        return pd.read_sql("SELECT id, kode_aset, nama_aset, jenis_aset FROM master_aset WHERE nama_aset LIKE ? LIMIT ?",
+                           conn, params=[f"%{teks}%", batas])
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 500_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        print(f"{'aset':>8} | {'tabel penuh':>11} | {'hal. 1':>6} | {'hal. 90% keyset':>15} | {'OFFSET':>7} | "
+              f"{'LIKE 999':>8} | {'FTS 999':>7} | {'LIKE ciman 99':>13} | {'FTS ciman 99':>12}  (ms)")
+        for n in ukuran:
+            isi_aset(app, n)
+            jauh = int(n * 0.9)
+            kursor = (jauh, jauh)  # urut id: kursor = (id, id) baris terakhir halaman sebelumnya
+            print(f"{n:>8,} | {ms(app.get_master_aset, 2):>11.1f} | {ms(lambda: app.get_halaman('master_aset')):>6.1f} | "
+                  f"{ms(lambda: app.get_halaman('master_aset', setelah=kursor)):>15.1f} | {ms(lambda: offset(app, jauh)):>7.1f} | "
+                  f"{ms(lambda: like(app, '999')):>8.1f} | {ms(lambda: app.cari_aset('999', 50)):>7.1f} | "
+                  f"{ms(lambda: like(app, 'Cimanuk 99')):>13.1f} | {ms(lambda: app.cari_aset('ciman 99', 50)):>12.1f}")
@@ -0,0 +1,102 @@
+"""Benchmark impor blangko PAI lama.
+
+1. Blangko bawaan di data_lama/: waktu membaca peta isian (template) & memindai semua file;
+   contoh blangko terisi di data_lama/contoh/ harus benar-benar terimpor (aset & inspeksi > 0).
+2. Arsip satu kabupaten sintetis: blangko bawaan diisi nilai acak (.xlsx, satu aset per file,
+   beberapa tahun survei per aset), lalu diurai serial vs ProcessPool dan dimuat ke SQLite.
+
+Jalankan dari root repo:  python benchmarks/bench_impor_pai.py [jumlah_aset] [tahun_survei]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import xlrd
+import xlsxwriter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules import impor_pai
+from modules.backend import IrigasiBackend
+
+
+def isi_blangko(grid, stem, no, tahun, rng):
+    """Ganti placeholder blangko dengan nilai sintetis"""
+    def nilai(teks):
+        m = impor_pai._TOKEN.match(teks.strip())
+        if not m: return teks
+        nama = m.group(1) or m.group(3)
+        if nama == 'aset': return f"{stem.upper()}-{no:05d}"
+        if nama == 'nama': return f"{impor_pai.JENIS_PAI[stem][0]} {no}"
+        if nama == 'tahun': return tahun
+        if nama == 'tahun_dibangun': return rng.randint(1970, 2015)
+        if nama in ('kondisi_sipil', 'kondisi_me'): return rng.randint(20, 100)
+        if nama in ('fungsi_sipil', 'fungsi_me'): return rng.choice(["Baik", "Kurang", "Rusak"])
+        if nama in ('pek_sipil', 'pek_me', 'urgensi', 'tujuan', 'catatan', 'di', 'nomen'): return f"{nama} {no}"
+        return round(rng.uniform(1, 500), 2)
+    return [[nilai(v) if isinstance(v, str) else v for v in baris] for baris in grid]
+
+
+def buat_arsip(folder, n_aset, n_tahun, seed=11):
+    rng = random.Random(seed)
+    grids = {}
+    for stem in impor_pai.JENIS_PAI:
+        sh = xlrd.open_workbook(os.path.join(impor_pai.FOLDER_TEMPLATE, f'{stem}.xls')).sheet_by_index(0)
+        grids[stem] = [sh.row_values(r) for r in range(sh.nrows)]
+    stems = list(grids)
+    for no in range(n_aset):
+        stem = stems[no % len(stems)]
+        for t in range(n_tahun):
+            wb = xlsxwriter.Workbook(os.path.join(folder, f'{stem}_{no:05d}_{2020 + t}.xlsx'))
+            ws = wb.add_worksheet('data')
+            for r, baris in enumerate(isi_blangko(grids[stem], stem, no, 2020 + t, rng)):
+                ws.write_row(r, 0, baris)
+            wb.close()
+
+
+if __name__ == '__main__':
+    n_aset = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_tahun = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    t0 = time.perf_counter()
+    template = impor_pai.muat_template()
+    t_template = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    bawaan = impor_pai.urai_arsip(impor_pai.FOLDER_TEMPLATE, proses=1)
+    print(f"data_lama: {len(template)} blangko aset dipetakan dalam {t_template:.2f} s; "
+          f"{len(bawaan)} file dipindai dalam {time.perf_counter() - t0:.2f} s "
+          f"({sum('lewati' in h for h in bawaan)} dilewati: blangko kosong / bukan blangko aset)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bawaan.db'))
+        print(f"  {app.impor_pai_lama(impor_pai.FOLDER_TEMPLATE, proses=1)}")
+        n_m, n_i = len(app.get_master_aset()), len(app.get_table_data('inspeksi_aset'))
+        assert n_m > 0 and n_i > 0, (n_m, n_i)
+        app.tutup()
+
+        arsip = os.path.join(tmp, 'arsip')
+        os.makedirs(arsip)
+        buat_arsip(arsip, n_aset, n_tahun)
+        n_file = n_aset * n_tahun
+
+        t0 = time.perf_counter()
+        serial = impor_pai.urai_arsip(arsip, proses=1)
+        t_serial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        paralel = impor_pai.urai_arsip(arsip)
+        t_paralel = time.perf_counter() - t0
+        assert serial == paralel and not any('lewati' in h for h in paralel)
+
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        pesan = app.impor_pai_lama(arsip)
+        ulang = app.impor_pai_lama(arsip)  # impor ulang harus idempoten
+        n_m = len(app.get_master_aset())
+        n_i = len(app.get_table_data('inspeksi_aset'))
+        assert (n_m, n_i) == (n_aset, n_file), (n_m, n_i)
+
+        print(f"arsip sintetis: {n_file:,} file ({n_aset:,} aset x {n_tahun} tahun survei), {os.cpu_count()} CPU")
+        print(f"  urai serial  : {t_serial:.2f} s ({n_file / t_serial:,.0f} file/s)")
+        print(f"  urai paralel : {t_paralel:.2f} s ({n_file / t_paralel:,.0f} file/s)")
+        print(f"  {pesan}")
+        print(f"  impor ulang  : {ulang}")
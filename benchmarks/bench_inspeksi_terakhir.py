@@ -0,0 +1,74 @@
+"""Benchmark "inspeksi terakhir per aset": JOIN semua riwayat + drop_duplicates (lama)
+vs view latest_inspeksi + index komposit (baru), untuk beberapa kedalaman riwayat.
+
+Jalankan dari root repo:  python benchmarks/bench_inspeksi_terakhir.py [jumlah_aset]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+
+QUERY_LAMA = '''
+    SELECT m.nama_aset, m.jenis_aset, m.luas_layanan_desain, m.nilai_aset_baru,
+           i.kondisi_sipil, i.kondisi_me, i.nilai_fungsi_sipil, i.nilai_fungsi_me,
+           i.luas_terdampak_aktual, i.estimasi_biaya
+    FROM master_aset m
+    JOIN inspeksi_aset i ON m.id = i.aset_id
+    ORDER BY i.tanggal_inspeksi DESC
+'''
+
+QUERY_BARU = '''
+    SELECT i.aset_id, m.nama_aset, m.jenis_aset, m.luas_layanan_desain, m.nilai_aset_baru,
+           i.kondisi_sipil, i.kondisi_me, i.nilai_fungsi_sipil, i.nilai_fungsi_me,
+           i.luas_terdampak_aktual, i.estimasi_biaya
+    FROM master_aset m
+    JOIN latest_inspeksi i ON m.id = i.aset_id
+'''
+
+
+def isi_data(app, n_aset, kedalaman, seed=7):
+    rng = np.random.default_rng(seed)
+    app.hapus_semua_data()
+    app.cursor.executemany(
+        "INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset) VALUES (?, ?, ?, ?)",
+        [(a, f"BND-{a}", f"Aset {a}", "Bendung") for a in range(1, n_aset + 1)])
+    baris = []
+    for d in range(kedalaman):
+        tgl = f"{2010 + d // 12:04d}-{d % 12 + 1:02d}-01"
+        k = rng.integers(0, 101, n_aset)
+        for a in range(n_aset):
+            baris.append((a + 1, tgl, float(k[a]), float(k[a]), 100.0, 70.0, 50.0, 1e6))
+    app.cursor.executemany('''INSERT INTO inspeksi_aset
+        (aset_id, tanggal_inspeksi, kondisi_sipil, kondisi_me, nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual, estimasi_biaya)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', baris)
+    app.conn.commit()
+    app.cursor.execute("ANALYZE")
+
+
+def ukur(app, query, dedupe):
+    t0 = time.perf_counter()
+    df = pd.read_sql(query, app.conn)
+    if dedupe:
+        df = df.drop_duplicates(subset=['nama_aset'])
+    return len(df), time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    n_aset = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        print(f"{n_aset:,} aset")
+        print(f"{'riwayat':>8} | {'baris inspeksi':>14} | {'lama (s)':>9} | {'baru (s)':>9}")
+        for kedalaman in [1, 5, 20, 50]:
+            isi_data(app, n_aset, kedalaman)
+            n_lama, t_lama = ukur(app, QUERY_LAMA, dedupe=True)
+            n_baru, t_baru = ukur(app, QUERY_BARU, dedupe=False)
+            assert n_lama == n_baru == n_aset
+            print(f"{kedalaman:>8} | {n_aset * kedalaman:>14,} | {t_lama:>9.3f} | {t_baru:>9.3f}")
+        app.conn.close()
@@ -0,0 +1,66 @@
+"""Benchmark laporan Excel: cara lama di app.py (BytesIO + write_row per itertuples + to_excel
+Master Data) vs buat_laporan_excel (constant_memory, potongan 10k baris, langsung ke file).
+Frame prioritas dihitung dulu (cache) agar yang diukur hanya penulisan workbook.
+
+Jalankan dari root repo:  python benchmarks/bench_laporan.py [jumlah_aset ...]
+"""
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_backup import ukur
+from modules.backend import IrigasiBackend
+
+
+# Laporan lama dari app.py, disalin apa adanya sebagai pembanding
+def laporan_lama(app):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        wb = writer.book
+        fmt_header = wb.add_format({'bold': True, 'align': 'center', 'bg_color': '#D9D9D9', 'border': 1})
+        ws1 = wb.add_worksheet('Prioritas Penanganan')
+        df_p = app.get_prioritas_matematis()
+        headers = ['Nama Aset', 'Jenis', 'Kondisi Sipil', 'Kondisi ME', 'Skor Bahaya', 'Kelas Prioritas', 'Biaya Rehab']
+        for col, h in enumerate(headers): ws1.write(0, col, h, fmt_header)
+        if not df_p.empty:
+            for idx, row in enumerate(df_p.itertuples(), 1):
+                ws1.write_row(idx, 0, [row.nama_aset, row.jenis_aset, row.kondisi_sipil, row.kondisi_me, row.Skor_Prioritas, row.Kelas_Prioritas, row.estimasi_biaya])
+        app.get_master_aset().to_excel(writer, sheet_name='Master Data', index=False)
+    return buffer
+
+
+def isi_aset(app, n, seed=5):
+    """n aset, masing-masing satu inspeksi"""
+    rng = np.random.default_rng(seed)
+    app.hapus_semua_data()
+    with app._tulis() as cur:
+        cur.executemany('''INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset, satuan, tahun_bangun,
+                               luas_layanan_desain, nilai_aset_baru, dimensi_teknis) VALUES (?, ?, ?, ?, 'm', 1990, ?, 5e8, ?)''',
+                        [(a, f"SAL-{a}", f"Saluran Sekunder {a}", "Saluran", 50 + a % 200, '{"panjang": 1200}') for a in range(1, n + 1)])
+        k = rng.integers(20, 101, (n, 4)).tolist()
+        cur.executemany('''INSERT INTO inspeksi_aset
+            (aset_id, tanggal_inspeksi, nama_surveyor, kondisi_sipil, kondisi_me, nilai_fungsi_sipil, nilai_fungsi_me,
+             luas_terdampak_aktual, rekomendasi_penanganan, estimasi_biaya)
+            VALUES (?, '2024-01-01', 'Surveyor', ?, ?, ?, ?, 50, 'Perbaikan pasangan batu', 1e6)''',
+                        [(a + 1, *k[a]) for a in range(n)])
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 200_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        path = os.path.join(tmp, 'laporan.xlsx')
+        print(f"{'aset':>8} | {'lama MB':>8} | {'lama s':>7} | {'baru MB':>8} | {'baru s':>7} | {'s/10k':>6} | {'file MB':>7}")
+        for n in ukuran:
+            isi_aset(app, n)
+            app.get_prioritas_matematis()
+            mb_lama, t_lama = ukur(lambda: laporan_lama(app))
+            mb_baru, t_baru = ukur(lambda: app.buat_laporan_excel(path))
+            print(f"{n:>8,} | {mb_lama:>8.1f} | {t_lama:>7.2f} | {mb_baru:>8.1f} | {t_baru:>7.2f} | "
+                  f"{t_baru / n * 1e4:>6.2f} | {os.path.getsize(path) / 1e6:>7.1f}")
@@ -0,0 +1,96 @@
+"""Benchmark pembaca Paradox: dekode per kolom dari mmap (TabelParadox) vs dekode per record
+dengan struct (cara naif), lalu migrasi penuh ke SQLite.
+
+File uji dibuat dari data_lama/prioritas.db: header yang sama, record aslinya diulang sampai
+N record di blok-blok 2 KB baru.
+
+Jalankan dari root repo:  python benchmarks/bench_paradox.py [jumlah_record ...]
+"""
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+from modules.paradox import TabelParadox, TIPE_ALPHA
+
+SUMBER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data_lama', 'prioritas.db')
+
+
+def buat_paradox(path, n):
+    with TabelParadox(SUMBER) as px:
+        header = bytearray(px._mm[:px.ukuran_header])
+        rs, bs = px.ukuran_record, px.ukuran_blok
+        record = px._record()
+        contoh = [bytes(record[b, i]) for b, j in zip(*px._rantai_blok()) for i in range(j)]
+        del record
+    # Nomor blok 16-bit: tabel besar memakai blok lebih besar (maks 32 KB), seperti Paradox asli
+    while -(-n // ((bs - 6) // rs)) > 65000 and bs < 32 * 1024:
+        bs *= 2
+    header[0x05] = bs // 1024
+    per_blok = (bs - 6) // rs
+    n_blok = -(-n // per_blok)
+    struct.pack_into('<I', header, 0x06, n)
+    struct.pack_into('<HHHH', header, 0x0A, n_blok + 1, n_blok, 1, n_blok)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for b in range(n_blok):
+            isi = min(per_blok, n - b * per_blok)
+            blok = struct.pack('<HHh', b + 2 if b + 1 < n_blok else 0, b, (isi - 1) * rs)
+            blok += b''.join(contoh[(b * per_blok + i) % len(contoh)] for i in range(isi))
+            f.write(blok.ljust(bs, b'\0'))
+
+
+def baca_naif(path):
+    """Per record: struct.unpack tiap field, baris demi baris"""
+    with TabelParadox(path) as px:
+        record = px._record()
+        blok, jumlah = px._rantai_blok()
+        offset = [px.ukuran_header + int(b) * px.ukuran_blok + 6 + i * px.ukuran_record
+                  for b, j in zip(blok, jumlah) for i in range(j)]
+        del record
+        field = px.field
+        data = px._mm
+        baris = []
+        for o in offset:
+            rec = []
+            for _, tipe, ukuran, off in field:
+                b = data[o + off:o + off + ukuran]
+                if not any(b): rec.append(None)
+                elif tipe == TIPE_ALPHA: rec.append(b.rstrip(b'\0').decode('cp1252'))
+                elif ukuran == 8:
+                    b = bytes([b[0] ^ 0x80]) + b[1:] if b[0] & 0x80 else bytes(x ^ 0xFF for x in b)
+                    rec.append(struct.unpack('>d', b)[0])
+                else: rec.append(b)
+            baris.append(rec)
+        return baris
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'record':>10} | {'file MB':>7} | {'naif s':>7} | {'kolom s':>7} | {'migrasi SQLite':>30}")
+        for n in ukuran:
+            path = os.path.join(tmp, f'prioritas_{n}.db')
+            buat_paradox(path, n)
+
+            t0 = time.perf_counter()
+            naif = baca_naif(path) if n <= 100_000 else None
+            t_naif = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            with TabelParadox(path) as px:
+                kolom = px.kolom()
+            t_kolom = time.perf_counter() - t0
+            assert len(kolom['Urut']) == n
+            if naif is not None:
+                assert [r[3] for r in naif] == list(kolom['N_aset'])
+                assert np.allclose([r[11] for r in naif], kolom['Biaya'], equal_nan=True)
+
+            app = IrigasiBackend(os.path.join(tmp, f'bench_{n}.db'))
+            pesan = app.migrasi_paradox(path)
+            naif_s = f"{t_naif:>7.2f}" if naif is not None else f"{'-':>7}"
+            print(f"{n:>10,} | {os.path.getsize(path) / 1e6:>7.1f} | {naif_s} | {t_kolom:>7.2f} | {pesan}")
@@ -0,0 +1,76 @@
+"""Benchmark mesin prioritas: apply per baris (lama) vs NumPy per kolom (baru).
+
+Jalankan dari root repo:  python benchmarks/bench_prioritas.py [jumlah_baris ...]
+"""
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.prioritas import hitung_prioritas
+
+
+def data_sintetis(n, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'nama_aset': [f"ASET-{i}" for i in range(n)],
+        'kondisi_sipil': rng.integers(0, 101, n).astype(float),
+        'kondisi_me': rng.integers(0, 101, n).astype(float),
+        'nilai_fungsi_sipil': rng.choice([100.0, 70.0, 40.0], n),
+        'nilai_fungsi_me': rng.choice([100.0, 70.0, 0.0], n),
+        'luas_terdampak_aktual': np.where(rng.random(n) < 0.1, 0.0, rng.gamma(2.0, 150.0, n)),
+        'estimasi_biaya': rng.integers(1, 500, n) * 1e6,
+    })
+
+
+# Rumus lama (df.apply axis=1), disalin apa adanya sebagai pembanding
+def prioritas_lama(df):
+    df = df.copy()
+
+    def hitung_skor_urgensi(row):
+        K = min(row['kondisi_sipil'], row['kondisi_me'])
+        F = min(row['nilai_fungsi_sipil'], row['nilai_fungsi_me'])
+        A_as = row['luas_terdampak_aktual']
+        Impact_Factor = math.log10(A_as + 1) if A_as > 0 else 0
+
+        Kerusakan_Fisik = (100 - K) * 0.4
+        Kegagalan_Fungsi = (100 - F) * 1.5 * 0.6
+
+        return (Kerusakan_Fisik + Kegagalan_Fungsi) * Impact_Factor
+
+    df['Skor_Prioritas'] = df.apply(hitung_skor_urgensi, axis=1)
+
+    def label_prioritas(skor):
+        if skor > 200: return "1. DARURAT (Segera)"
+        if skor > 100: return "2. MENDESAK (Thn Depan)"
+        if skor > 50: return "3. PERLU PERHATIAN"
+        return "4. RUTIN"
+
+    df['Kelas_Prioritas'] = df['Skor_Prioritas'].apply(label_prioritas)
+    return df.sort_values(by='Skor_Prioritas', ascending=False)
+
+
+def ukur(fungsi, df):
+    t0 = time.perf_counter()
+    hasil = fungsi(df)
+    return hasil, time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    ukuran = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'baris':>10} | {'apply (s)':>10} | {'numpy (s)':>10} | {'speedup':>8}")
+    for n in ukuran:
+        df = data_sintetis(n)
+        lama, t_lama = ukur(prioritas_lama, df)
+        baru, t_baru = ukur(hitung_prioritas, df)
+
+        # Hasil harus identik (dibandingkan per index, urutan sort boleh beda saat skor sama)
+        lama, baru = lama.sort_index(), baru.sort_index()
+        assert np.allclose(lama['Skor_Prioritas'], baru['Skor_Prioritas'], rtol=0, atol=1e-9)
+        assert (lama['Kelas_Prioritas'] == baru['Kelas_Prioritas']).all()
+
+        print(f"{n:>10,} | {t_lama:>10.3f} | {t_baru:>10.3f} | {t_lama / t_baru:>7.0f}x")
@@ -0,0 +1,50 @@
+"""Benchmark restore: import lama (json.load + hapus_semua_data + to_sql per tabel) vs
+import_dari_json baru (parse streaming + executemany per batch, satu transaksi, index ditunda).
+
+Jalankan dari root repo:  python benchmarks/bench_restore.py [jumlah_inspeksi ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend, TABEL_DATA
+from bench_backup import isi_data
+
+
+# Restore lama, disalin apa adanya sebagai pembanding
+def restore_lama(app, path):
+    with open(path, 'rb') as f:
+        data = json.load(f)
+    app.hapus_semua_data()
+    for t in TABEL_DATA:
+        if data.get(t):
+            pd.DataFrame(data[t]).to_sql(t, app.conn, if_exists='append', index=False)
+    app.conn.commit()
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 300_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        path = os.path.join(tmp, 'backup.json')
+        print(f"{'inspeksi':>9} | {'lama s':>7} | {'baru s':>7} | {'baru baris/s':>12}")
+        for n in ukuran:
+            isi_data(app, n)
+            app.export_ke_file(path)
+
+            t0 = time.perf_counter()
+            restore_lama(app, path)
+            t_lama = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            with open(path, 'rb') as f:
+                pesan = app.import_dari_json(f)
+            t_baru = time.perf_counter() - t0
+            assert pesan.startswith("✅"), pesan
+            total = n + max(1, n // 10)
+            print(f"{n:>9,} | {t_lama:>7.2f} | {t_baru:>7.2f} | {total / t_baru:>12,.0f}")
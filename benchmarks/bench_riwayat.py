@@ -0,0 +1,79 @@
+"""Benchmark riwayat kondisi: hitung ulang ringkasan semua aset (bincount, sekali jalan) vs loop
+per aset (groupby + np.polyfit), latensi tambah_inspeksi (ringkasan 1 aset diperbarui inkremental)
+dan baca get_ringkasan_kondisi. Laju hasil vektor dicek sama dengan polyfit per aset.
+
+Jalankan dari root repo:  python benchmarks/bench_riwayat.py [jumlah_aset ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend, TAHUN_DESIMAL
+
+KEDALAMAN = 6   # inspeksi per aset (tahunan)
+
+
+def isi_riwayat(app, n, seed=14):
+    rng = np.random.default_rng(seed)
+    app.hapus_semua_data()
+    bangun = rng.integers(1970, 2010, n)
+    rehab = np.where(rng.random(n) < 0.3, rng.integers(2012, 2018, n), 0)
+    laju = rng.uniform(0, 4, n)
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset, tahun_bangun, tahun_rehab_terakhir) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(a + 1, f"BND-{a + 1}", f"Aset {a + 1}", 'Bendung', int(bangun[a]), int(rehab[a])) for a in range(n)])
+        for d in range(KEDALAMAN):
+            tahun = 2018 + d
+            k = np.clip(95 - laju * (tahun - 2018) + rng.normal(0, 3, n), 0, 100).round()
+            cur.executemany('''INSERT INTO inspeksi_aset (aset_id, tanggal_inspeksi, kondisi_sipil, kondisi_me,
+                nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual) VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                            [(a + 1, f"{tahun}-0{1 + a % 9}-15", k[a], k[a] + 5, min(k[a] + 10, 100), 90.0, 300.0)
+                             for a in range(n)])
+
+
+def laju_polyfit(app):
+    """Cara per aset: tarik riwayat, loop groupby, np.polyfit tiap aset (tanpa titik acuan)"""
+    with app._baca() as conn:
+        df = pd.read_sql(f'''SELECT i.aset_id, {TAHUN_DESIMAL.format('i.tanggal_inspeksi')} AS tahun,
+                i.kondisi_sipil, i.kondisi_me, m.tahun_bangun, m.tahun_rehab_terakhir
+            FROM inspeksi_aset i JOIN master_aset m ON m.id = i.aset_id ORDER BY i.aset_id, i.tanggal_inspeksi''', conn)
+    hasil = {}
+    for aset_id, g in df.groupby('aset_id'):
+        g = g[g['tahun'] >= g['tahun_rehab_terakhir']]
+        k = g[['kondisi_sipil', 'kondisi_me']].min(axis=1)
+        if len(g) >= 2: hasil[aset_id] = max(-np.polyfit(g['tahun'], k, 1)[0], 0)
+    return pd.Series(hasil)
+
+
+if __name__ == '__main__':
+    ukuran = [int(x) for x in sys.argv[1:]] or [10_000, 100_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        print(f"{'aset':>8} | {'inspeksi':>9} | {'segarkan semua s':>16} | {'polyfit/aset s':>14} | "
+              f"{'selisih maks':>12} | {'tambah_inspeksi ms':>18} | {'baca ringkasan ms':>17}")
+        for n in ukuran:
+            isi_riwayat(app, n)
+            t0 = time.perf_counter()
+            app.segarkan_ringkasan(semua=True)
+            t_semua = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            acuan = laju_polyfit(app)
+            t_loop = time.perf_counter() - t0
+            laju = app.get_ringkasan_kondisi('aset_id').set_index('aset_id')['laju_kondisi']
+            selisih = (laju.reindex(acuan.index) - acuan).abs().max()
+
+            t0 = time.perf_counter()
+            for a in range(1, 51): app.tambah_inspeksi(a * (n // 50), 'Bench', 60, 65, 70, 75, 300.0, '-', 0)
+            t_tambah = (time.perf_counter() - t0) / 50 * 1e3
+
+            t0 = time.perf_counter()
+            app.get_ringkasan_kondisi(batas=100)
+            t_baca = (time.perf_counter() - t0) * 1e3
+            print(f"{n:>8,} | {n * KEDALAMAN:>9,} | {t_semua:>16.2f} | {t_loop:>14.2f} | {selisih:>12.2e} | "
+                  f"{t_tambah:>18.2f} | {t_baca:>17.1f}")
@@ -0,0 +1,95 @@
+"""Uji beban sinkron lapangan: 10k inspeksi offline dikirim lewat sinkron_inspeksi
+- satu batch & per batch 500 (ukuran kiriman perangkat), dibanding tambah_inspeksi per record
+  (diukur pada sebagian record lalu diekstrapolasi)
+- kiriman ulang batch yang sama (harus duplikat semua, jumlah baris tetap)
+- edit dengan revisi_dasar lama (harus konflik semua, data server tidak berubah)
+- tarik delta master setelah sebagian kecil aset diubah vs tarik penuh
+
+Jalankan dari root repo:  python benchmarks/bench_sinkron.py [jumlah_record] [jumlah_aset]
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+
+
+def buat_record(n, jumlah_aset, seed=18):
+    rng = np.random.default_rng(seed)
+    detik = rng.integers(0, 90 * 86400, n)
+    return [{'uuid': str(uuid.UUID(int=int(rng.integers(0, 2 ** 63)) << 64 | i)), 'aset_id': int(rng.integers(1, jumlah_aset + 1)),
+             'waktu_survei': f"2025-{1 + d // (30 * 86400):02d}-{1 + d // 86400 % 28:02d}T{d // 3600 % 24:02d}:{d // 60 % 60:02d}:00+07:00",
+             'nama_surveyor': f"Surveyor {i % 40}", 'kondisi_sipil': int(rng.integers(0, 101)),
+             'kondisi_me': int(rng.integers(0, 101)), 'nilai_fungsi_sipil': float(rng.choice([40, 70, 100])),
+             'nilai_fungsi_me': float(rng.choice([0, 70, 100])), 'luas_terdampak_aktual': float(rng.lognormal(4, 1.2)),
+             'estimasi_biaya': float(np.round(rng.lognormal(19.5, 1), -5))} for i, d in enumerate(detik.tolist())]
+
+
+def siapkan(path, jumlah_aset):
+    app = IrigasiBackend(path)
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset) VALUES (?, ?, ?, 'Bendung')",
+                        [(a, f"BND-{a}", f"Aset {a}") for a in range(1, jumlah_aset + 1)])
+    return app
+
+
+def jumlah_inspeksi(app):
+    with app._baca() as conn: return conn.execute("SELECT COUNT(*) FROM inspeksi_aset").fetchone()[0]
+
+
+def detik(fungsi):
+    t0 = time.perf_counter()
+    hasil = fungsi()
+    return time.perf_counter() - t0, hasil
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    m = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    record = buat_record(n, m)
+    with tempfile.TemporaryDirectory() as tmp:
+        app = siapkan(os.path.join(tmp, 'satu.db'), m)
+        kursor = app.tarik_perubahan(batas=m)['kursor']
+        t_satu, h = detik(lambda: app.sinkron_inspeksi(record, kursor=kursor))
+        assert h['diterima'] == n, h['pesan']
+        t_ulang, h = detik(lambda: app.sinkron_inspeksi(record, kursor=kursor))
+        assert h['duplikat'] == n and jumlah_inspeksi(app) == n, h['pesan']
+        basi = [{**r, 'rekomendasi_penanganan': 'Perbaikan', 'revisi_dasar': 0} for r in record]
+        t_konflik, h = detik(lambda: app.sinkron_inspeksi(basi, kursor=kursor))
+        assert len(h['konflik']) == n and jumlah_inspeksi(app) == n, h['pesan']
+        edit = [{**r, 'rekomendasi_penanganan': 'Perbaikan', 'revisi_dasar': 1} for r in record]
+        t_edit, h = detik(lambda: app.sinkron_inspeksi(edit, kursor=kursor))
+        assert h['diperbarui'] == n, h['pesan']
+
+        # Delta master: 1% aset diubah sejak kursor terakhir
+        with app._tulis() as cur:
+            cur.executemany("UPDATE master_aset SET nama_aset = nama_aset || ' (rev)' WHERE id = ?",
+                            [(a,) for a in range(1, m + 1, 100)])
+        t_delta, delta = detik(lambda: app.tarik_perubahan(kursor, batas=m))
+        t_penuh, penuh = detik(lambda: app.tarik_perubahan(None, batas=m))
+
+        app_b = siapkan(os.path.join(tmp, 'batch.db'), m)
+        kursor_b = app_b.tarik_perubahan(batas=m)['kursor']
+        t_batch, _ = detik(lambda: [app_b.sinkron_inspeksi(record[i:i + 500], kursor=kursor_b) for i in range(0, n, 500)])
+
+        app_c = siapkan(os.path.join(tmp, 'form.db'), m)
+        contoh = record[:500]
+        t_form, _ = detik(lambda: [app_c.tambah_inspeksi(r['aset_id'], r['nama_surveyor'], r['kondisi_sipil'], r['kondisi_me'],
+                                                         r['nilai_fungsi_sipil'], r['nilai_fungsi_me'], r['luas_terdampak_aktual'],
+                                                         None, r['estimasi_biaya']) for r in contoh])
+        t_form *= n / len(contoh)
+
+    print(f"{n:,} record, {m:,} aset")
+    print(f"  sinkron 1 batch            : {t_satu:7.2f} s  ({n / t_satu:,.0f} record/detik)")
+    print(f"  sinkron per 500            : {t_batch:7.2f} s  ({n / t_batch:,.0f} record/detik)")
+    print(f"  tambah_inspeksi per record : {t_form:7.2f} s  (ekstrapolasi dari {len(contoh)} record)")
+    print(f"  kirim ulang (duplikat)     : {t_ulang:7.2f} s")
+    print(f"  revisi lama (konflik)      : {t_konflik:7.2f} s")
+    print(f"  edit revisi terbaru        : {t_edit:7.2f} s")
+    print(f"  tarik delta master         : {t_delta * 1e3:7.1f} ms ({len(delta['master_aset']):,} aset)")
+    print(f"  tarik penuh master         : {t_penuh * 1e3:7.1f} ms ({len(penuh['master_aset']):,} aset)")
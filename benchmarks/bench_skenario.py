@@ -0,0 +1,62 @@
+"""Benchmark analisis sensitivitas: ratusan set parameter dievaluasi sekaligus (analisis_sensitivitas,
+data dimuat sekali, skor skenario x aset di-broadcast) vs cara lama per skenario (atur_parameter ->
+query ulang + hitung_prioritas + hitung_iksi_lengkap). Cara lama diukur pada sebagian skenario lalu
+diekstrapolasi.
+
+Jalankan dari root repo:  python benchmarks/bench_skenario.py [jumlah_aset] [jumlah_skenario]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+from modules.skenario import grid_parameter
+
+
+def isi_data(app, n, seed=16):
+    rng = np.random.default_rng(seed)
+    app.hapus_semua_data()
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset) VALUES (?, ?, ?, 'Bendung')",
+                        [(a, f"BND-{a}", f"Aset {a}") for a in range(1, n + 1)])
+        cur.executemany('''INSERT INTO inspeksi_aset (aset_id, tanggal_inspeksi, kondisi_sipil, kondisi_me,
+            nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual) VALUES (?, '2024-06-01', ?, ?, ?, ?, ?)''',
+                        zip(range(1, n + 1), rng.integers(0, 101, n).tolist(), rng.integers(0, 101, n).tolist(),
+                            rng.choice([40.0, 70.0, 100.0], n).tolist(), rng.choice([0.0, 70.0, 100.0], n).tolist(),
+                            rng.lognormal(4, 1.2, n).tolist()))
+        cur.executemany("INSERT INTO data_tanam (musim, faktor_k) VALUES ('MT1', ?)", [(x,) for x in rng.uniform(0.4, 1.4, 500)])
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    s = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    langkah = int(np.ceil(s ** 0.25))
+    daftar = grid_parameter(bobot_fisik=np.linspace(0.3, 0.6, langkah), koef_kerusakan=np.linspace(0.2, 0.6, langkah),
+                            batas_fk_cukup=np.linspace(0.5, 0.9, langkah), batas_mendesak=np.linspace(80, 120, langkah))[:s]
+    with tempfile.TemporaryDirectory() as tmp:
+        app = IrigasiBackend(os.path.join(tmp, 'bench.db'))
+        isi_data(app, n)
+
+        t0 = time.perf_counter()
+        hasil = app.analisis_sensitivitas(daftar)
+        t_vektor = time.perf_counter() - t0
+
+        contoh = daftar[:: max(len(daftar) // 10, 1)]
+        t0 = time.perf_counter()
+        for p in contoh:
+            app.atur_parameter(p, ringkasan=False)   # yang diukur hanya skor prioritas & IKSI
+            app.hitung_iksi_lengkap()
+            app.get_prioritas_matematis()['aset_id'].head(10).tolist()
+        t_satu = (time.perf_counter() - t0) / len(contoh)
+        app.atur_parameter(None, ringkasan=False)
+
+        print(f"{n:,} aset, {len(daftar):,} skenario")
+        print(f"  vektor (sekali muat)     : {t_vektor:8.2f} s  ({t_vektor / len(daftar) * 1e3:.2f} ms/skenario)")
+        print(f"  per skenario (query ulang): {t_satu * len(daftar):8.2f} s  ({t_satu * 1e3:.0f} ms/skenario, "
+              f"diukur pada {len(contoh)} skenario)")
+        print(f"  IKSI {hasil['IKSI'].min():.2f} - {hasil['IKSI'].max():.2f}, "
+              f"pindah kelas maks {hasil['pindah_kelas'].max():,} aset")
@@ -0,0 +1,91 @@
+"""Benchmark startup & rerun app.py (Streamlit, dijalankan headless lewat streamlit.testing.AppTest):
+- cold start: proses Python baru, run pertama halaman Dashboard (import dependensi + buat backend + render)
+- rerun: tiap halaman dibuka lalu di-rerun tanpa perubahan input (cache hangat), waktu terbaik & median
+- buka backend: IrigasiBackend pada DB yang sudah ada (skema sudah terbaru)
+- import: waktu import tiap library berat di proses baru (streamlit & pandas sudah dimuat)
+
+DB contoh diisi data sintetis (modules/sintetis.py) di folder sementara yang jadi cwd app.
+
+Jalankan dari root repo:  python benchmarks/bench_startup.py [jumlah_aset] [jumlah_rerun]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+HALAMAN = ["Dashboard", "1. Master Aset (Statis)", "2. Inspeksi (Dinamis)", "3. Non-Fisik",
+           "4. Laporan & Prioritas", "5. Rekap Provinsi"]
+LIBRARY = ['altair', 'folium', 'streamlit_folium', 'matplotlib.pyplot', 'xml.etree.ElementTree', 'modules.backend']
+
+# Dijalankan di proses baru (cwd = folder DB): cold start lalu rerun per halaman, hasil JSON ke stdout
+SKRIP_APP = """
+import json, statistics, sys, time
+from streamlit.testing.v1 import AppTest
+app, ulang = sys.argv[1], int(sys.argv[2])
+at = AppTest.from_file(app, default_timeout=600)
+t0 = time.perf_counter(); at.run(); dingin = time.perf_counter() - t0
+assert not at.exception, at.exception
+hasil = {'dingin': dingin, 'rerun': {}}
+for halaman in sys.argv[3:]:
+    next(r for r in at.sidebar.radio if r.label == "Navigasi").set_value(halaman)
+    t0 = time.perf_counter(); at.run(); pertama = time.perf_counter() - t0
+    assert not at.exception, (halaman, at.exception)
+    waktu = []
+    for _ in range(ulang):
+        t0 = time.perf_counter(); at.run(); waktu.append(time.perf_counter() - t0)
+    hasil['rerun'][halaman] = {'pertama': pertama, 'terbaik': min(waktu), 'median': statistics.median(waktu)}
+print(json.dumps(hasil))
+"""
+
+SKRIP_IMPORT = """
+import sys, time
+import streamlit, pandas, numpy
+t0 = time.perf_counter(); __import__(sys.argv[1]); print(time.perf_counter() - t0)
+"""
+
+
+def proses(skrip, *argumen, cwd=None):
+    env = dict(os.environ, PYTHONPATH=AKAR)
+    keluaran = subprocess.run([sys.executable, '-c', skrip, *argumen], cwd=cwd, env=env, check=True,
+                              capture_output=True, text=True).stdout
+    return keluaran.strip().splitlines()[-1]
+
+
+if __name__ == '__main__':
+    from modules.backend import IrigasiBackend
+    from modules.sintetis import isi_sintetis
+    jumlah = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    ulang = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_db = os.path.join(tmp, 'database', 'irigasi_enterprise.db')
+        backend = IrigasiBackend(path_db)
+        isi_sintetis(backend, jumlah, 3)
+        backend.tutup()
+
+        buka = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            b = IrigasiBackend(path_db)
+            buka.append(time.perf_counter() - t0)
+            b.tutup()
+
+        impor = {lib: float(proses(SKRIP_IMPORT, lib)) for lib in LIBRARY}
+        dingin = [json.loads(proses(SKRIP_APP, os.path.join(AKAR, 'app.py'), str(ulang), *HALAMAN, cwd=tmp))
+                  for _ in range(3)]
+
+    print(f"{jumlah:,} aset x 3 inspeksi, CPU {os.cpu_count()}")
+    print("Import di proses baru (streamlit & pandas sudah dimuat):")
+    for lib, detik in impor.items(): print(f"  {lib:<24} {detik * 1e3:8.1f} ms")
+    print(f"Buka IrigasiBackend (DB sudah ada)  : {statistics.median(buka) * 1e3:8.2f} ms (median 20x)")
+    print(f"Cold start Dashboard (proses baru)  : {statistics.median(d['dingin'] for d in dingin) * 1e3:8.1f} ms "
+          f"(median 3 proses)")
+    print(f"Rerun per halaman (rerun x{ulang}, cache hangat):   pindah halaman | rerun terbaik | median")
+    for halaman in HALAMAN:
+        r = dingin[0]['rerun'][halaman]
+        print(f"  {halaman:<28} {r['pertama'] * 1e3:10.1f} ms | {r['terbaik'] * 1e3:9.1f} ms | {r['median'] * 1e3:7.1f} ms")
@@ -0,0 +1,78 @@
+"""Benchmark rekap provinsi multi-DI pada 1, 10, 100 shard (satu file SQLite per DI):
+- gabung baris : cara tanpa agregat parsial, inspeksi terakhir semua shard dibaca & digabung
+                 jadi satu DataFrame lalu dihitung ulang
+- serial       : rekap_provinsi(paralel=False), agregat per shard di proses ini (dingin/hangat)
+- pool         : rekap_provinsi() dengan ProcessPoolExecutor (dingin = termasuk start worker &
+                 buka shard; hangat = panggilan kedua, agregat shard sudah ter-cache di worker)
+
+Jalankan dari root repo:  python benchmarks/bench_wilayah.py [aset_per_shard] [maks_proses]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+from modules.prioritas import hitung_prioritas
+from modules.wilayah import RegistriDI
+
+
+def isi_shard(app, n, seed):
+    rng = np.random.default_rng(seed)
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset) VALUES (?, ?, ?, 'Bendung')",
+                        [(a, f"BND-{a}", f"Aset {a}") for a in range(1, n + 1)])
+        for tahun in (2022, 2024):
+            cur.executemany('''INSERT INTO inspeksi_aset (aset_id, tanggal_inspeksi, kondisi_sipil, kondisi_me,
+                nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual, estimasi_biaya) VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                            zip(range(1, n + 1), [f"{tahun}-06-01"] * n, rng.integers(0, 101, n).tolist(),
+                                rng.integers(0, 101, n).tolist(), rng.choice([40.0, 70.0, 100.0], n).tolist(),
+                                rng.choice([0.0, 70.0, 100.0], n).tolist(), rng.lognormal(4, 1.2, n).tolist(),
+                                np.round(rng.lognormal(19.5, 1, n), -5).tolist()))
+        cur.executemany("INSERT INTO data_tanam (musim, faktor_k) VALUES ('MT1', ?)", [(x,) for x in rng.uniform(0.4, 1.4, 20)])
+
+
+def gabung_baris(registri):
+    bagian = []
+    for path in (os.path.join(registri.folder, f) for f in registri.daftar()['file']):
+        with IrigasiBackend(path, pool_baca=1)._baca() as conn:
+            bagian.append(pd.read_sql("SELECT i.*, m.nama_aset FROM latest_inspeksi i JOIN master_aset m ON m.id = i.aset_id", conn))
+    return hitung_prioritas(pd.concat(bagian, ignore_index=True))
+
+
+def detik(fungsi):
+    t0 = time.perf_counter()
+    fungsi()
+    return time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    proses = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, os.cpu_count() or 1)
+    print(f"{n:,} aset/shard, pool {proses} proses, CPU {os.cpu_count()}")
+    print(f"{'shard':>5} | {'aset':>8} | {'gabung baris s':>14} | {'serial dingin s':>15} | {'serial hangat s':>15} | "
+          f"{'pool dingin s':>13} | {'pool hangat s':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for jumlah in (1, 10, 100):
+            folder = os.path.join(tmp, f"di_{jumlah}")
+            registri = RegistriDI(folder)
+            for k in range(jumlah):
+                registri.tambah(f"DI-{k:03d}", f"DI {k}")
+                isi_shard(registri.backend(f"DI-{k:03d}"), n, k)
+            registri.tutup()
+
+            t_gabung = detik(lambda: gabung_baris(RegistriDI(folder)))
+            registri = RegistriDI(folder, maks_terbuka=jumlah)
+            t_serial = detik(lambda: registri.rekap_provinsi(paralel=False))
+            t_serial_hangat = detik(lambda: registri.rekap_provinsi(paralel=False))
+            registri.tutup()
+            registri = RegistriDI(folder, maks_proses=proses)
+            t_dingin = detik(lambda: registri.rekap_provinsi())
+            t_hangat = detik(lambda: registri.rekap_provinsi())
+            registri.tutup()
+            print(f"{jumlah:>5} | {jumlah * n:>8,} | {t_gabung:>14.2f} | {t_serial:>15.2f} | {t_serial_hangat:>15.2f} | "
+                  f"{t_dingin:>13.2f} | {t_hangat:>13.2f}")
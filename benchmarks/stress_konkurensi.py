@@ -0,0 +1,89 @@
+"""Stress test konkurensi: banyak sesi (thread) membaca & menulis ke SATU backend bersama,
+seperti beberapa petugas lapangan membuka app Streamlit bersamaan.
+
+Jalankan dari root repo:  python benchmarks/stress_konkurensi.py [jumlah_sesi] [aksi_per_sesi]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.backend import IrigasiBackend
+
+N_ASET = 2_000
+
+
+def isi_awal(app):
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset) VALUES (?, ?, ?, ?)",
+                        [(a, f"SAL-{a}", f"Saluran {a}", "Saluran") for a in range(1, N_ASET + 1)])
+        cur.executemany('''INSERT INTO inspeksi_aset
+            (aset_id, tanggal_inspeksi, kondisi_sipil, kondisi_me, nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual, estimasi_biaya)
+            VALUES (?, '2024-01-01', 80, 80, 100, 100, 50, 1e6)''', [(a,) for a in range(1, N_ASET + 1)])
+
+
+def sesi(app, n_aksi, seed, latensi, gagal, tercatat):
+    rng = random.Random(seed)
+    for _ in range(n_aksi):
+        r = rng.random()
+        t0 = time.perf_counter()
+        try:
+            if r < 0.35:
+                app.hitung_iksi_lengkap()
+            elif r < 0.65:
+                app.get_prioritas_matematis().head(5)
+            elif r < 0.80:
+                app.get_table_data('data_tanam')
+            elif r < 0.95:
+                pesan = app.tambah_inspeksi(rng.randint(1, N_ASET), "Stress", rng.randint(0, 100), rng.randint(0, 100),
+                                            rng.choice([100, 70, 40]), rng.choice([100, 70, 0]), rng.uniform(0, 500), "-", 1e6)
+                if not pesan.startswith("✅"): raise RuntimeError(pesan)
+                tercatat.append('inspeksi_aset')
+            else:
+                app.tambah_data_tanam_lengkap("MT-1", 100, 90, rng.uniform(50, 150), 100, 5, 2)
+                tercatat.append('data_tanam')
+        except Exception as e:
+            gagal.append(repr(e))
+        latensi.append(time.perf_counter() - t0)
+
+
+if __name__ == '__main__':
+    n_sesi = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    n_aksi = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'stress.db')
+        app = IrigasiBackend(path)
+        isi_awal(app)
+
+        latensi, gagal = [], []
+        tercatat = []  # list.append aman antar thread
+        threads = [threading.Thread(target=sesi, args=(app, n_aksi, i, latensi, gagal, tercatat))
+                   for i in range(n_sesi)]
+        t0 = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads: t.join()
+        durasi = time.perf_counter() - t0
+
+        lat = np.array(latensi) * 1000
+        print(f"{n_sesi} sesi x {n_aksi} aksi = {len(lat):,} aksi dalam {durasi:.2f} s ({len(lat) / durasi:,.0f} aksi/s)")
+        print(f"latensi ms  p50={np.percentile(lat, 50):.2f}  p95={np.percentile(lat, 95):.2f}  p99={np.percentile(lat, 99):.2f}")
+        print(f"gagal: {len(gagal)}" + (f"  contoh: {gagal[0]}" if gagal else ""))
+
+        jumlah_tulis = {t: tercatat.count(t) for t in ('inspeksi_aset', 'data_tanam')}
+
+        # Konsistensi: jumlah baris & IKSI ter-cache harus sama dengan hitung ulang dari backend baru
+        with app._baca() as conn:
+            n_insp = conn.execute("SELECT COUNT(*) FROM inspeksi_aset").fetchone()[0]
+            n_tanam = conn.execute("SELECT COUNT(*) FROM data_tanam").fetchone()[0]
+        assert n_insp == N_ASET + jumlah_tulis['inspeksi_aset'], (n_insp, jumlah_tulis)
+        assert n_tanam == jumlah_tulis['data_tanam'], (n_tanam, jumlah_tulis)
+        segar = IrigasiBackend(path).hitung_iksi_lengkap()
+        assert np.allclose(app.hitung_iksi_lengkap(), segar), (app.hitung_iksi_lengkap(), segar)
+        assert not gagal
+        print("✅ konsisten:", tuple(round(float(x), 4) for x in segar))
@@ -0,0 +1,20 @@
+import sys
+
+from modules.backend import IrigasiBackend
+
+# Pemakaian: python migrasi_paradox.py [file_paradox.db ...] [--db database/irigasi_enterprise.db]
+argumen = sys.argv[1:]
+db_path = 'database/irigasi_enterprise.db'
+if '--db' in argumen:
+    i = argumen.index('--db')
+    db_path = argumen[i + 1]
+    del argumen[i:i + 2]
+files = argumen or ['data_lama/prioritas.db']
+
+app = IrigasiBackend(db_path)
+for path in files:
+    print(app.migrasi_paradox(path))
+cocok = app.get_perbandingan_prioritas().attrs.get('pencocokan')
+if cocok:
+    print(f"Cocok dengan master_aset: {cocok['kode']:,} lewat kode, {cocok['nama']:,} lewat nama, "
+          f"{cocok['tidak_cocok']:,} tidak cocok")
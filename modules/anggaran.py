@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# Inti knapsack: jumlah kandidat di kiri/kanan item patah (urut manfaat/biaya) yang diputuskan lewat DP;
+# kandidat di luar inti hampir pasti ikut (kiri) atau tidak (kanan) pada solusi optimal
+UKURAN_INTI = 500
+# Resolusi DP: sisa anggaran untuk inti dibagi jadi sekian satuan (biaya dibulatkan ke atas -> selalu muat)
+RESOLUSI_DP = 10_000
+
+
+def manfaat_penanganan(df):
+    """Dampak yang dihindari jika aset ditangani: Skor_Prioritas x luas_terdampak_aktual"""
+    skor = pd.to_numeric(df['Skor_Prioritas'], errors='coerce').to_numpy(dtype=float)
+    luas = pd.to_numeric(df['luas_terdampak_aktual'], errors='coerce').to_numpy(dtype=float)
+    return np.nan_to_num(skor * luas)
+
+
+def _isi_rakus(urut, biaya, sisa, pilih):
+    """Tambahkan kandidat (urutan `urut`) yang belum dipilih selama masih muat; kembalikan sisa"""
+    calon = urut[~pilih[urut] & (biaya[urut] <= sisa)]
+    for i in calon:
+        if biaya[i] <= sisa:
+            pilih[i] = True
+            sisa -= biaya[i]
+    return sisa
+
+
+def _dp_inti(nilai, biaya, kapasitas, resolusi):
+    """Knapsack 0/1 eksak atas biaya berskala (satu operasi vektor per item): mask item terpilih"""
+    skala = kapasitas / resolusi
+    w = np.ceil(biaya / skala - 1e-9).astype(np.int64)
+    terbaik = np.zeros(resolusi + 1)
+    ambil = np.zeros((len(w), resolusi + 1), dtype=bool)
+    for j, (wj, vj) in enumerate(zip(w.tolist(), nilai.tolist())):
+        if wj > resolusi: continue
+        calon = terbaik[:resolusi + 1 - wj] + vj
+        lebih = calon > terbaik[wj:]
+        ambil[j, wj:] = lebih
+        terbaik[wj:] = np.where(lebih, calon, terbaik[wj:])
+    pilih = np.zeros(len(w), dtype=bool)
+    c = resolusi
+    for j in range(len(w) - 1, -1, -1):
+        if ambil[j, c]:
+            pilih[j] = True
+            c -= w[j]
+    return pilih
+
+
+def pilih_paket(nilai, biaya, anggaran, ukuran_inti=UKURAN_INTI, resolusi=RESOLUSI_DP):
+    """Pilih kandidat dengan total manfaat maksimum, total biaya <= anggaran.
+
+    Urut manfaat/biaya; kandidat jauh sebelum item patah (yang pertama tidak muat) langsung diambil,
+    `ukuran_inti` kandidat di sekitarnya diputuskan knapsack DP berskala, sisa anggaran diisi rakus.
+    Kembalikan (mask terpilih, batas atas LP/Dantzig untuk menilai celah ke optimum)."""
+    nilai, biaya = np.asarray(nilai, dtype=float), np.asarray(biaya, dtype=float)
+    pilih = np.zeros(len(nilai), dtype=bool)
+    calon = np.flatnonzero((nilai > 0) & (biaya > 0) & (biaya <= anggaran))
+    if not len(calon): return pilih, 0.0
+
+    urut = calon[np.argsort(-(nilai[calon] / biaya[calon]), kind='stable')]
+    kumulatif = np.cumsum(biaya[urut])
+    patah = int(np.searchsorted(kumulatif, anggaran, side='right'))
+    if patah == len(urut):
+        pilih[urut] = True
+        return pilih, float(nilai[urut].sum())
+    terpakai = kumulatif[patah - 1] if patah else 0.0
+    batas_atas = float(nilai[urut[:patah]].sum() + nilai[urut[patah]] * (anggaran - terpakai) / biaya[urut[patah]])
+
+    awal = max(patah - ukuran_inti, 0)
+    pilih[urut[:awal]] = True
+    sisa = anggaran - (kumulatif[awal - 1] if awal else 0.0)
+    inti = urut[awal:patah + ukuran_inti]
+    inti = inti[biaya[inti] <= sisa]
+    if len(inti):
+        pilih[inti[_dp_inti(nilai[inti], biaya[inti], sisa, resolusi)]] = True
+        sisa -= biaya[inti][pilih[inti]].sum()
+
+    # Pembulatan biaya di DP menyisakan anggaran: isi lagi dengan kandidat yang masih muat
+    _isi_rakus(urut, biaya, sisa, pilih)
+
+    # Pembanding: rakus murni (urut manfaat/biaya, lewati yang tidak muat), ambil yang lebih baik
+    rakus = np.zeros(len(nilai), dtype=bool)
+    _isi_rakus(urut, biaya, anggaran, rakus)
+    if nilai[rakus].sum() > nilai[pilih].sum(): pilih = rakus
+    return pilih, batas_atas
+
+
+def rencana_anggaran(df, daftar_anggaran, bawa_sisa=False, **opsi):
+    """Rencana multi-tahun atas frame prioritas: tahun ke-k dipilih dari aset yang belum tertangani
+    dengan anggaran daftar_anggaran[k] (bawa_sisa: sisa tahun lalu menambah anggaran berikutnya).
+    Kembalikan (baris terpilih + kolom tahun_ke & Manfaat, ringkasan per tahun)."""
+    nilai = manfaat_penanganan(df)
+    biaya = np.nan_to_num(pd.to_numeric(df['estimasi_biaya'], errors='coerce').to_numpy(dtype=float))
+    tahun = np.zeros(len(df), dtype=int)
+    ringkasan, sisa = [], 0.0
+    for k, anggaran in enumerate(daftar_anggaran, 1):
+        pagu = float(anggaran) + (sisa if bawa_sisa else 0.0)
+        pilih, batas_atas = pilih_paket(np.where(tahun == 0, nilai, 0.0), biaya, pagu, **opsi)
+        tahun[pilih] = k
+        terpakai, manfaat = float(biaya[pilih].sum()), float(nilai[pilih].sum())
+        sisa = pagu - terpakai
+        ringkasan.append({'tahun_ke': k, 'anggaran': pagu, 'terpakai': terpakai, 'jumlah_pekerjaan': int(pilih.sum()),
+                          'manfaat': manfaat, 'batas_atas': batas_atas,
+                          'celah_maks': (1 - manfaat / batas_atas) if batas_atas > 0 else 0.0})
+    terpilih = df.assign(Manfaat=nilai, tahun_ke=tahun)[tahun > 0]
+    return terpilih.sort_values(['tahun_ke', 'Manfaat'], ascending=[True, False]), pd.DataFrame(ringkasan)
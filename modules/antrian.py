@@ -0,0 +1,181 @@
+import atexit
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+# Jenis laporan: (method IrigasiBackend yang menulis ke path, ekstensi artefak)
+JENIS_LAPORAN = {'excel': ('buat_laporan_excel', '.xlsx')}
+
+STATUS_AKTIF = ('antri', 'berjalan')
+
+# --- SISI PROSES WORKER ---
+_kemajuan = None        # mp.Queue ke proses utama (diisi initializer)
+_backend_worker = {}    # backend per db_path, dipakai ulang antar pekerjaan (cache prioritas ikut awet)
+
+
+def _siapkan_worker(antrian_kemajuan):
+    global _kemajuan
+    _kemajuan = antrian_kemajuan
+
+
+def _kerjakan(id_pekerjaan, jenis, db_path, path, opsi):
+    """Bangun satu artefak di proses worker: tulis ke file sementara lalu rename (atomik)"""
+    from modules.backend import IrigasiBackend
+    app = _backend_worker.get(db_path)
+    if app is None:
+        app = _backend_worker[db_path] = IrigasiBackend(db_path, pool_baca=1)
+
+    _kemajuan.put((id_pekerjaan, 0.0))
+    terakhir = 0.0
+
+    def kemajuan(fraksi):
+        nonlocal terakhir
+        # Kirim paling sering tiap 1% agar antrian tidak banjir pesan
+        if fraksi - terakhir >= 0.01 or fraksi >= 1:
+            terakhir = fraksi
+            _kemajuan.put((id_pekerjaan, fraksi))
+
+    method, _ = JENIS_LAPORAN[jenis]
+    sementara = f"{path}.{id_pekerjaan}.tmp"
+    try:
+        pesan = getattr(app, method)(sementara, kemajuan=kemajuan, **opsi)
+        if not pesan.startswith("✅"): raise RuntimeError(pesan)
+        os.replace(sementara, path)
+        return pesan
+    finally:
+        if os.path.exists(sementara): os.remove(sementara)
+
+
+# --- SISI PROSES UTAMA (STREAMLIT) ---
+class AntrianLaporan:
+    """Pekerjaan laporan dijalankan di ProcessPoolExecutor; skrip Streamlit hanya mendaftarkan
+    pekerjaan (id) lalu membaca statusnya, jadi rerun tidak membuang hasil yang sedang dibuat.
+
+    Artefak disimpan di `folder` dengan nama dari hash opsi + hash versi data: permintaan yang sama
+    selama data belum berubah langsung dilayani dari disk tanpa membangun ulang. Versi lama dengan
+    opsi yang sama dibuang setelah versi baru jadi; total artefak dibatasi `maks_artefak` (LRU)."""
+
+    def __init__(self, folder, db_path, maks_proses=1, simpan_pekerjaan=100, maks_artefak=20):
+        self.folder = folder
+        self.db_path = db_path
+        os.makedirs(folder, exist_ok=True)
+        self._maks_proses = maks_proses
+        self._simpan = simpan_pekerjaan
+        self._maks_artefak = maks_artefak
+        self._kunci = threading.Lock()
+        self._pekerjaan = {}   # id -> status pekerjaan
+        self._aktif = {}       # kunci artefak -> id pekerjaan yang sedang antri/berjalan
+        self._pool = None
+        self._antrian = None
+
+    def _pool_siap(self):
+        if self._pool is None:
+            # spawn, bukan fork: proses Streamlit punya banyak thread (fork bisa mewarisi lock terkunci)
+            ctx = mp.get_context('spawn')
+            self._antrian = ctx.Queue()
+            self._pool = ProcessPoolExecutor(self._maks_proses, mp_context=ctx,
+                                             initializer=_siapkan_worker, initargs=(self._antrian,))
+            threading.Thread(target=self._dengar_kemajuan, daemon=True).start()
+            atexit.register(self.tutup)
+        return self._pool
+
+    def _dengar_kemajuan(self):
+        while True:
+            id_pekerjaan, fraksi = self._antrian.get()
+            if id_pekerjaan is None: return
+            with self._kunci:
+                info = self._pekerjaan.get(id_pekerjaan)
+                if info and info['status'] in STATUS_AKTIF:
+                    info.update(status='berjalan', kemajuan=fraksi)
+
+    def tutup(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._antrian.put((None, None))
+            self._pool = None
+
+    @staticmethod
+    def kunci_artefak(jenis, versi, opsi):
+        """'{jenis}_{hash opsi}_{hash versi}': artefak dengan opsi sama berbagi awalan nama"""
+        def hash_(x):
+            return hashlib.sha1(json.dumps(x, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+        return f"{jenis}_{hash_(opsi)}_{hash_(versi)}"
+
+    def mulai(self, jenis, versi, opsi=None):
+        """Daftarkan pekerjaan, kembalikan id-nya. Artefak yang sudah ada -> langsung 'selesai';
+        pekerjaan identik yang masih berjalan -> id pekerjaan itu (tidak dibangun dua kali)."""
+        opsi = opsi or {}
+        kunci = self.kunci_artefak(jenis, versi, opsi)
+        path = os.path.join(self.folder, kunci + JENIS_LAPORAN[jenis][1])
+        with self._kunci:
+            if kunci in self._aktif: return self._aktif[kunci]
+            id_pekerjaan = uuid.uuid4().hex[:12]
+            info = {'id': id_pekerjaan, 'jenis': jenis, 'status': 'antri', 'kemajuan': 0.0,
+                    'path': path, 'pesan': '', 'dibuat': time.time()}
+            self._pekerjaan[id_pekerjaan] = info
+            self._rapikan()
+            if os.path.exists(path):
+                os.utime(path)   # tandai baru dipakai (urutan LRU)
+                info.update(status='selesai', kemajuan=1.0, pesan="✅ Data belum berubah, laporan diambil dari arsip")
+                return id_pekerjaan
+            self._aktif[kunci] = id_pekerjaan
+        try:
+            futur = self._pool_siap().submit(_kerjakan, id_pekerjaan, jenis, self.db_path, path, opsi)
+        except Exception as e:
+            self._selesai(id_pekerjaan, kunci, None, e)
+        else:
+            futur.add_done_callback(lambda f: self._selesai(id_pekerjaan, kunci, f))
+        return id_pekerjaan
+
+    def _selesai(self, id_pekerjaan, kunci, futur, galat=None):
+        try:
+            if galat: raise galat
+            info_baru = {'status': 'selesai', 'kemajuan': 1.0, 'pesan': futur.result()}
+        except Exception as e:
+            pesan = str(e) if str(e).startswith("❌") else f"❌ Gagal Membuat Laporan: {e}"
+            info_baru = {'status': 'gagal', 'pesan': pesan}
+        with self._kunci:
+            self._aktif.pop(kunci, None)
+            info = self._pekerjaan.get(id_pekerjaan)
+            if info: info.update(info_baru)
+        if info_baru['status'] == 'selesai' and info: self._buang_artefak_lama(info)
+
+    def _buang_artefak_lama(self, info):
+        # Versi lain dengan opsi sama yang selesai SEBELUM pekerjaan ini didaftarkan = data lebih lama
+        # (tidak akan diminta lagi). Opsi lain & hasil pekerjaan yang lebih baru tidak disentuh.
+        awalan = os.path.basename(info['path']).rsplit('_', 1)[0] + '_'
+        artefak = []
+        for nama in os.listdir(self.folder):
+            path = os.path.join(self.folder, nama)
+            if not nama.endswith(tuple(e for _, e in JENIS_LAPORAN.values())): continue
+            try: waktu = os.path.getmtime(path)
+            except OSError: continue
+            if nama.startswith(awalan) and path != info['path'] and waktu < info['dibuat']: self._hapus_artefak(path)
+            else: artefak.append((waktu, path))
+        # Batas jumlah total: yang paling lama tidak dipakai dibuang lebih dulu
+        for _, path in sorted(artefak)[:max(0, len(artefak) - self._maks_artefak)]:
+            if path != info['path']: self._hapus_artefak(path)
+
+    @staticmethod
+    def _hapus_artefak(path):
+        try: os.remove(path)
+        except OSError: pass
+
+    def _rapikan(self):
+        # Batasi riwayat status di memori: buang pekerjaan selesai/gagal yang paling lama
+        lebih = len(self._pekerjaan) - self._simpan
+        if lebih <= 0: return
+        lama = sorted((p for p in self._pekerjaan.values() if p['status'] not in STATUS_AKTIF), key=lambda p: p['dibuat'])
+        for p in lama[:lebih]:
+            del self._pekerjaan[p['id']]
+
+    def status(self, id_pekerjaan):
+        """Salinan status pekerjaan (id, jenis, status, kemajuan 0-1, path, pesan) atau None"""
+        with self._kunci:
+            info = self._pekerjaan.get(id_pekerjaan)
+            return dict(info) if info else None
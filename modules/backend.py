@@ -1,12 +1,330 @@
 import sqlite3
 import pandas as pd
+import numpy as np
 import os
 import json
-import math
-from datetime import datetime
+import queue
+import re
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime, timedelta
 
+from modules.prioritas import hitung_prioritas, hitung_skor_urgensi, _min_pasangan
+from modules.iksi import ParameterPenilaian, PARAMETER_BAWAAN, nilai_tanam, skor_fisik, gabung_iksi
+from modules.backup import baca_backup
+from modules.impor_pai import urai_arsip
+from modules.paradox import TabelParadox, TIPE_SQLITE
+from modules.laporan import tulis_laporan
+from modules.antrian import AntrianLaporan
+from modules.geometri import urai_kml, level_geometri, level_untuk_zoom, derajat_per_piksel, ke_geojson
+from modules.riwayat import hitung_ringkasan, KOLOM_RINGKASAN
+from modules.anggaran import rencana_anggaran
+from modules.skenario import evaluasi_skenario
+from modules.foto import GudangFoto
+from modules.instrumen import instrumentasi
+
+TABEL_DATA = ['master_aset','inspeksi_aset','data_tanam','data_p3a','data_sdm_sarana','data_dokumentasi']
+TABEL_GEOMETRI = ['geometri_fitur', 'geometri_level', 'geometri_rtree']
+TABEL_RINGKASAN = ['ringkasan_kondisi', 'ringkasan_antri']
+
+# Atribut dimensi_teknis (JSON) yang dibuka jadi kolom generated master_aset.dim_<nama> + index
+# (jenis_aset, dim_<nama>): nama -> (tipe, path JSON berurutan, yang pertama terisi dipakai)
+ATRIBUT_TEKNIS = {
+    'panjang': ('REAL', ['$.panjang']),
+    'lebar': ('REAL', ['$.b', '$.lebar']),
+    'tinggi': ('REAL', ['$.h', '$.tinggi']),
+    'debit': ('REAL', ['$.q', '$.debit']),
+    'tipe': ('TEXT', ['$.tipe']),
+    'bahan': ('TEXT', ['$.bahan', '$.material']),
+}
+KOLOM_MASTER = ['id', 'kode_aset', 'nama_aset', 'jenis_aset', 'satuan', 'tahun_bangun', 'tahun_rehab_terakhir',
+                'luas_layanan_desain', 'nilai_aset_baru']
+OPERATOR_FILTER = {'=', '!=', '<', '<=', '>', '>=', 'like', 'in', 'between'}
+FUNGSI_AGREGAT = {'sum', 'avg', 'min', 'max', 'count'}
+# Kolom frame prioritas (m = master_aset, i = inspeksi terakhir aset itu)
+KOLOM_PRIORITAS = '''i.aset_id, m.nama_aset, m.jenis_aset, m.satuan, m.luas_layanan_desain, m.nilai_aset_baru,
+    i.kondisi_sipil, i.kondisi_me, i.nilai_fungsi_sipil, i.nilai_fungsi_me,
+    i.luas_terdampak_aktual, i.rekomendasi_penanganan, i.estimasi_biaya'''
+KOLOM_NILAI_INSPEKSI = ['kondisi_sipil', 'kondisi_me', 'nilai_fungsi_sipil', 'nilai_fungsi_me', 'luas_terdampak_aktual']
+# Isi inspeksi yang dikirim perangkat lapangan (sinkron offline); sama persis = kiriman ulang
+KOLOM_INSPEKSI_LAPANGAN = ['aset_id', 'tanggal_inspeksi', 'waktu_survei', 'nama_surveyor', *KOLOM_NILAI_INSPEKSI,
+                           'rekomendasi_penanganan', 'estimasi_biaya']
+# Tanggal -> tahun desimal (julianday 2000-01-01 = 2451544.5), tanggal tak valid -> NULL
+TAHUN_DESIMAL = "(2000.0 + (julianday({0}) - 2451544.5) / 365.2425)"
+
+# Tabel yang menjadi sumber tiap hasil yang di-cache
+DEPENDENSI_CACHE = {
+    'prioritas': ('master_aset', 'inspeksi_aset'),
+    'fisik': ('master_aset', 'inspeksi_aset'),
+    'tanam': ('data_tanam',),
+    'laporan': ('master_aset', 'inspeksi_aset'),
+}
+
+def _min_skipna(a, b):
+    nilai = [float(x) for x in (a, b) if x is not None and x == x]
+    return min(nilai) if nilai else np.nan
+
+def _kontribusi_fisik(ks, kme, fs, fme, luas):
+    """(nilai_gabungan x luas, luas) satu aset, NaN diperlakukan sama seperti min/sum pandas"""
+    luas = np.nan if luas is None else float(luas)
+    gl = (_min_skipna(ks, kme) + _min_skipna(fs, fme)) / 2 * luas
+    return (0.0 if np.isnan(gl) else gl, 0.0 if np.isnan(luas) else luas)
+
+def _ke_python(kolom):
+    """Array kolom NumPy -> list nilai Python untuk sqlite3 (NaN/NaT -> None, tanggal -> ISO)"""
+    kolom = np.asarray(kolom)
+    if kolom.dtype.kind == 'M':
+        return [None if t is None else t.isoformat() for t in kolom.astype('datetime64[D]').astype(object)]
+    if kolom.dtype.kind == 'f':
+        return np.where(np.isnan(kolom), None, kolom.astype(object)).tolist()
+    return kolom.tolist()
+
+def _daftar_foto(foto_bukti):
+    """Isi kolom foto_bukti (JSON list hash) -> list; kosong/bukan JSON -> []"""
+    try: isi = json.loads(foto_bukti) if foto_bukti else []
+    except ValueError: return []
+    return isi if isinstance(isi, list) else []
+
+
+def _kunci_nama(nama):
+    """Series nama -> kunci pencocokan: tanpa diakritik, huruf kecil, tanda baca & spasi berulang jadi satu spasi"""
+    return (nama.astype('string').str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+            .str.lower().str.replace(r'[\W_]+', ' ', regex=True).str.strip().replace('', pd.NA))
+
+
+def _urai_kursor(kursor):
+    """Kursor sinkron "epoch:seq" -> (epoch, seq); None/kosong = (None, 0)"""
+    if not kursor: return None, 0
+    epoch, _, seq = str(kursor).partition(':')
+    if not seq.isdigit(): raise ValueError(f"Kursor tidak valid: {kursor}")
+    return epoch, int(seq)
+
+
+def _urai_inspeksi_lapangan(r, surveyor=None):
+    """Record inspeksi dari perangkat -> (uuid kanonik, revisi_dasar, isi urut KOLOM_INSPEKSI_LAPANGAN)"""
+    kode = str(uuid.UUID(str(r['uuid'])))
+    waktu = datetime.fromisoformat(str(r['waktu_survei']))
+    # Tanggal inspeksi = tanggal setempat surveyor (offset zona waktu, jika ada, ikut disimpan)
+    if waktu > datetime.now(waktu.tzinfo) + timedelta(days=1): raise ValueError(f"waktu_survei di masa depan: {waktu}")
+    angka = lambda k: None if r.get(k) is None else float(r[k])
+    isi = (int(r['aset_id']), waktu.strftime("%Y-%m-%d"), waktu.isoformat(timespec='seconds'),
+           r.get('nama_surveyor') or surveyor, *(angka(k) for k in KOLOM_NILAI_INSPEKSI),
+           r.get('rekomendasi_penanganan'), angka('estimasi_biaya'))
+    return kode, int(r.get('revisi_dasar') or 0), isi
+
+def _ekspresi_atribut(tipe, path):
+    """Ekspresi json_extract untuk kolom generated. JSON rusak -> NULL (bukan error saat insert);
+    atribut REAL hanya diambil jika nilainya memang angka di JSON."""
+    d = 'dimensi_teknis'
+    if tipe == 'REAL':
+        bagian = [f"CASE json_type({d}, '{p}') WHEN 'integer' THEN json_extract({d}, '{p}') "
+                  f"WHEN 'real' THEN json_extract({d}, '{p}') END" for p in path]
+    else:
+        bagian = [f"json_extract({d}, '{p}')" for p in path]
+    isi = bagian[0] if len(bagian) == 1 else f"COALESCE({', '.join(bagian)})"
+    return f"CASE WHEN json_valid({d}) THEN {isi} END"
+
+def _jejak_lemah(ref):
+    """Callback trace SQL yang hanya memegang weakref ke backend: koneksi -> callback -> backend tidak jadi
+    siklus, jadi backend yang tidak dipakai lagi langsung dibebaskan (dan ditutup, lihat _tutup_sumber)"""
+    def jejak(teks):
+        app = ref()
+        pelacak = app.pelacak if app is not None else None
+        if pelacak is not None: pelacak.sql(teks)
+    return jejak
+
+
+def _penyegar_ringkasan(ref, sinyal):
+    """Thread latar per backend: kosongkan ringkasan_antri tiap kali diberi sinyal oleh _tulis. Hanya
+    memegang weakref, berhenti setelah backend ditutup atau dibuang (_tutup_sumber ikut memberi sinyal)."""
+    while True:
+        sinyal.wait()
+        sinyal.clear()
+        app = ref()
+        if app is None or not app._tutup.alive: return
+        app._segarkan_latar()
+        del app
+
+
+def _tutup_sumber(keadaan):
+    """Tutup antrian laporan, gudang foto & semua koneksi dari `keadaan` (__dict__ backend). Dipanggil
+    sekali: lewat tutup() atau otomatis (weakref.finalize) saat backend tidak direferensikan lagi."""
+    if keadaan['_sinyal_ringkasan'] is not None: keadaan['_sinyal_ringkasan'].set()
+    if keadaan['_antrian'] is not None: keadaan['_antrian'].tutup()
+    if keadaan['_gudang_foto'] is not None: keadaan['_gudang_foto'].tutup()
+    with keadaan['_kunci_tulis']:
+        while True:
+            try: keadaan['_pool'].get_nowait().close()
+            except queue.Empty: break
+        keadaan['conn'].close()
+
+# --- SKEMA: MIGRASI BERVERSI ---
+# Satu langkah = satu versi skema (PRAGMA user_version). DB dari sebelum ada versi mulai dari 0, jadi tiap
+# langkah idempoten terhadap skema lama itu (IF NOT EXISTS / cek kolom). Perubahan skema baru = langkah baru
+# di akhir MIGRASI, jangan mengubah langkah yang sudah ada.
+def _skema_dasar(cur):
+    # 1. Tabel Master Aset (Data Statis)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS master_aset (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kode_aset TEXT UNIQUE, 
+            nama_aset TEXT,
+            jenis_aset TEXT,
+            satuan TEXT,
+            tahun_bangun INTEGER,
+            tahun_rehab_terakhir INTEGER,
+            dimensi_teknis TEXT, 
+            luas_layanan_desain REAL, 
+            nilai_aset_baru REAL DEFAULT 0,
+            file_kmz TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 2. Tabel Inspeksi (Data Dinamis)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS inspeksi_aset (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            aset_id INTEGER,
+            tanggal_inspeksi DATE,
+            nama_surveyor TEXT,
+            kondisi_sipil REAL, 
+            kondisi_me REAL,
+            nilai_fungsi_sipil REAL, 
+            nilai_fungsi_me REAL,
+            luas_terdampak_aktual REAL,
+            rekomendasi_penanganan TEXT,
+            estimasi_biaya REAL,
+            foto_bukti TEXT,
+            uuid TEXT,
+            waktu_survei TEXT,
+            revisi INTEGER DEFAULT 1,
+            FOREIGN KEY(aset_id) REFERENCES master_aset(id)
+        )
+    ''')
+
+    # 3. Tabel Penunjang
+    cur.execute('CREATE TABLE IF NOT EXISTS data_tanam (id INTEGER PRIMARY KEY, musim TEXT, luas_rencana REAL, luas_realisasi REAL, debit_andalan REAL, kebutuhan_air REAL, faktor_k REAL, prod_padi REAL, prod_palawija REAL)')
+    cur.execute('CREATE TABLE IF NOT EXISTS data_p3a (id INTEGER PRIMARY KEY, nama_p3a TEXT, desa TEXT, status TEXT, keaktifan TEXT, anggota INTEGER)')
+    cur.execute('CREATE TABLE IF NOT EXISTS data_sdm_sarana (id INTEGER PRIMARY KEY, jenis TEXT, nama TEXT, kondisi TEXT, ket TEXT)')
+    cur.execute('CREATE TABLE IF NOT EXISTS data_dokumentasi (id INTEGER PRIMARY KEY, jenis_dokumen TEXT, ada INTEGER)')
+
+    # Auto-Repair Kolom (Jika tabel lama masih ada)
+    ada = {r[1] for r in cur.execute("PRAGMA table_info(master_aset)")}
+    for kolom, tipe in [('nilai_aset_baru', 'REAL DEFAULT 0'), ('tahun_rehab_terakhir', 'INTEGER DEFAULT 0')]:
+        if kolom not in ada: cur.execute(f"ALTER TABLE master_aset ADD COLUMN {kolom} {tipe}")
+
+    # 4. Index & View Inspeksi Terakhir (1 baris per aset_id, tanpa tarik riwayat ke pandas)
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_inspeksi_terakhir ON inspeksi_aset(aset_id, tanggal_inspeksi DESC, id DESC)')
+    cur.execute('''
+        CREATE VIEW IF NOT EXISTS latest_inspeksi AS
+        SELECT i.* FROM master_aset m
+        JOIN inspeksi_aset i ON i.id = (
+            SELECT id FROM inspeksi_aset
+            WHERE aset_id = m.id
+            ORDER BY tanggal_inspeksi DESC, id DESC
+            LIMIT 1
+        )
+    ''')
+
+def _skema_atribut_teknis(cur):
+    # 5. Atribut teknis: kolom generated (VIRTUAL, tidak menambah ukuran tabel) + index
+    ada = {r[1] for r in cur.execute("PRAGMA table_xinfo(master_aset)")}
+    for nama, (tipe, path) in ATRIBUT_TEKNIS.items():
+        if f"dim_{nama}" not in ada:
+            cur.execute(f"ALTER TABLE master_aset ADD COLUMN dim_{nama} {tipe} "
+                        f"GENERATED ALWAYS AS ({_ekspresi_atribut(tipe, path)}) VIRTUAL")
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_dim_{nama} ON master_aset(jenis_aset, dim_{nama})")
+
+def _skema_fts(cur):
+    # 6. Pencarian nama/kode aset (FTS5, external content = master_aset, disinkron trigger)
+    baru_fts = cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'master_aset_fts'").fetchone() is None
+    cur.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS master_aset_fts USING fts5(
+        nama_aset, kode_aset, jenis_aset, content='master_aset', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')''')
+    cur.execute('''CREATE TRIGGER IF NOT EXISTS master_aset_fts_ai AFTER INSERT ON master_aset BEGIN
+        INSERT INTO master_aset_fts(rowid, nama_aset, kode_aset, jenis_aset) VALUES (new.id, new.nama_aset, new.kode_aset, new.jenis_aset);
+    END''')
+    cur.execute('''CREATE TRIGGER IF NOT EXISTS master_aset_fts_ad AFTER DELETE ON master_aset BEGIN
+        INSERT INTO master_aset_fts(master_aset_fts, rowid, nama_aset, kode_aset, jenis_aset) VALUES ('delete', old.id, old.nama_aset, old.kode_aset, old.jenis_aset);
+    END''')
+    cur.execute('''CREATE TRIGGER IF NOT EXISTS master_aset_fts_au AFTER UPDATE OF nama_aset, kode_aset, jenis_aset ON master_aset BEGIN
+        INSERT INTO master_aset_fts(master_aset_fts, rowid, nama_aset, kode_aset, jenis_aset) VALUES ('delete', old.id, old.nama_aset, old.kode_aset, old.jenis_aset);
+        INSERT INTO master_aset_fts(rowid, nama_aset, kode_aset, jenis_aset) VALUES (new.id, new.nama_aset, new.kode_aset, new.jenis_aset);
+    END''')
+    if baru_fts: cur.execute("INSERT INTO master_aset_fts(master_aset_fts) VALUES ('rebuild')")
+
+def _skema_geometri(cur):
+    # 7. Geometri KMZ: fitur, koordinat per level penyederhanaan (blob int32), kotak R*Tree
+    cur.execute('CREATE TABLE IF NOT EXISTS geometri_fitur (id INTEGER PRIMARY KEY, aset_id INTEGER, nama TEXT, tipe TEXT, jumlah_titik INTEGER)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_geometri_aset ON geometri_fitur(aset_id)')
+    cur.execute('CREATE TABLE IF NOT EXISTS geometri_level (fitur_id INTEGER, level INTEGER, koordinat BLOB, PRIMARY KEY (fitur_id, level)) WITHOUT ROWID')
+    cur.execute('CREATE VIRTUAL TABLE IF NOT EXISTS geometri_rtree USING rtree(id, min_x, max_x, min_y, max_y)')
+
+def _skema_ringkasan(cur):
+    # 8. Ringkasan riwayat kondisi per aset (materialized). Trigger mencatat aset yang riwayatnya
+    #    berubah ke ringkasan_antri; segarkan_ringkasan() hanya menghitung ulang aset-aset itu.
+    baru_ringkasan = cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'ringkasan_kondisi'").fetchone() is None
+    cur.execute('''CREATE TABLE IF NOT EXISTS ringkasan_kondisi (
+        aset_id INTEGER PRIMARY KEY, jumlah_inspeksi INTEGER, tahun_acuan REAL, tahun_terakhir REAL,
+        kondisi_terakhir REAL, fungsi_terakhir REAL, laju_kondisi REAL, laju_fungsi REAL, skor_terakhir REAL,
+        tahun_darurat INTEGER, tahun_mendesak INTEGER, tahun_perhatian INTEGER,
+        diperbarui TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    cur.execute('CREATE TABLE IF NOT EXISTS ringkasan_antri (aset_id INTEGER PRIMARY KEY)')
+    antri = "INSERT OR IGNORE INTO ringkasan_antri SELECT {0} WHERE {0} IS NOT NULL;"
+    for nama, kejadian, isi in [
+        ('inspeksi_ai', 'INSERT ON inspeksi_aset', antri.format('new.aset_id')),
+        ('inspeksi_ad', 'DELETE ON inspeksi_aset', antri.format('old.aset_id')),
+        ('inspeksi_au', f"UPDATE OF aset_id, tanggal_inspeksi, {', '.join(KOLOM_NILAI_INSPEKSI)} ON inspeksi_aset",
+         antri.format('old.aset_id') + antri.format('new.aset_id')),
+        ('master_au', 'UPDATE OF tahun_bangun, tahun_rehab_terakhir ON master_aset', antri.format('new.id')),
+        ('master_ad', 'DELETE ON master_aset', antri.format('old.id')),
+    ]:
+        cur.execute(f"CREATE TRIGGER IF NOT EXISTS ringkasan_{nama} AFTER {kejadian} BEGIN {isi} END")
+    if baru_ringkasan:
+        cur.execute("INSERT OR IGNORE INTO ringkasan_antri SELECT DISTINCT aset_id FROM inspeksi_aset WHERE aset_id IS NOT NULL")
+
+def _skema_sinkron(cur):
+    # 9. Sinkron lapangan (offline): inspeksi ber-UUID dari perangkat + revisi untuk deteksi konflik.
+    #    log_sinkron menyimpan seq terakhir tiap baris master_aset (hapus = tombstone) -> kursor delta.
+    ada = {r[1] for r in cur.execute("PRAGMA table_info(inspeksi_aset)")}
+    for kolom, tipe in [('uuid', 'TEXT'), ('waktu_survei', 'TEXT'), ('revisi', 'INTEGER DEFAULT 1')]:
+        if kolom not in ada: cur.execute(f"ALTER TABLE inspeksi_aset ADD COLUMN {kolom} {tipe}")
+    cur.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_inspeksi_uuid ON inspeksi_aset(uuid) WHERE uuid IS NOT NULL')
+    baru_log = cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'log_sinkron'").fetchone() is None
+    cur.execute('''CREATE TABLE IF NOT EXISTS log_sinkron (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabel TEXT, baris_id INTEGER, hapus INTEGER DEFAULT 0, UNIQUE (tabel, baris_id))''')
+    cur.execute('CREATE TABLE IF NOT EXISTS meta_sinkron (kunci TEXT PRIMARY KEY, nilai TEXT)')
+    catat = "DELETE FROM log_sinkron WHERE tabel = 'master_aset' AND baris_id = {0}; " \
+            "INSERT INTO log_sinkron (tabel, baris_id, hapus) VALUES ('master_aset', {0}, {1});"
+    for nama, kejadian, isi in [('master_ai', 'INSERT', catat.format('new.id', 0)),
+                                ('master_au', 'UPDATE', catat.format('new.id', 0)),
+                                ('master_ad', 'DELETE', catat.format('old.id', 1))]:
+        cur.execute(f"CREATE TRIGGER IF NOT EXISTS sinkron_{nama} AFTER {kejadian} ON master_aset BEGIN {isi} END")
+    if baru_log: IrigasiBackend._log_sinkron_ulang(cur)
+
+def _skema_versi_data(cur):
+    # 10. Versi data persisten per tabel (naik di tiap transaksi tulis, lihat _tulis) + identitas acak DB:
+    #     kunci artefak laporan di disk tetap berlaku setelah restart & tidak tertukar antar DB
+    cur.execute('CREATE TABLE IF NOT EXISTS versi_data (tabel TEXT PRIMARY KEY, versi INTEGER NOT NULL)')
+    cur.execute("INSERT OR IGNORE INTO meta_sinkron VALUES ('id_db', lower(hex(randomblob(8))))")
+
+MIGRASI = [_skema_dasar, _skema_atribut_teknis, _skema_fts, _skema_geometri, _skema_ringkasan, _skema_sinkron,
+           _skema_versi_data]
+
+# Semua method publik + perhitungan berat di balik cache dicatat ke self.pelacak (modules/instrumen.py)
+@instrumentasi('_hitung_prioritas', '_hitung_agregat_fisik', '_hitung_agregat_tanam', '_segarkan_ringkasan')
 class IrigasiBackend:
-    def __init__(self, db_path='database/irigasi_enterprise.db'):
+    def __init__(self, db_path='database/irigasi_enterprise.db', pool_baca=8, busy_timeout=30, parameter=None,
+                 pelacak=None):
+        # Pelacak kinerja (None = tidak mencatat); dipasang paling awal agar init_db ikut tercatat
+        self.pelacak = pelacak
+        self._jejak_sql = _jejak_lemah(weakref.ref(self))
         # Pastikan folder database ada
         self.db_folder = os.path.dirname(db_path)
         if self.db_folder and not os.path.exists(self.db_folder):
@@ -14,110 +332,310 @@ class IrigasiBackend:
                 os.makedirs(self.db_folder)
             except OSError: pass
 
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Koneksi penulis tunggal (diserialkan lewat _kunci_tulis) + pool koneksi baca.
+        # WAL: pembaca tidak menunggu penulis; busy_timeout: tunggu lock, bukan langsung error.
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.conn = self._buka_koneksi()
         self.cursor = self.conn.cursor()
+        self._kunci_tulis = threading.RLock()
+        if db_path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
         self.init_db()
 
+        # DB memori tidak bisa dibagi antar koneksi -> baca lewat koneksi penulis
+        self._pool_maks = 0 if db_path == ':memory:' else pool_baca
+        self._menulis = 0
+        self._pool = queue.LifoQueue()
+        self._jumlah_baca = 0
+        self._kunci_pool = threading.Lock()
+
+        # Cache hasil (prioritas & komponen IKSI), dibatalkan lewat versi per tabel
+        self._versi = {t: 0 for t in TABEL_DATA + TABEL_GEOMETRI + TABEL_RINGKASAN}
+        self._cache = {}
+        self._kunci_hitung = {k: threading.Lock() for k in DEPENDENSI_CACHE}
+        self._data_version = None
+        self._antrian = None
+        self._gudang_foto = None
+        self._sinyal_ringkasan = None
+        self._skema = {}
+        self._cache_jumlah = {}
+        # Bobot & konstanta penilaian aktif (modules/iksi.py)
+        self.parameter = parameter or PARAMETER_BAWAAN
+        # Sumber daya ditutup sekali: lewat tutup(), atau saat backend tak direferensikan lagi
+        self._tutup = weakref.finalize(self, _tutup_sumber, self.__dict__)
+
     def init_db(self):
-        # 1. Tabel Master Aset (Data Statis)
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS master_aset (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                kode_aset TEXT UNIQUE, 
-                nama_aset TEXT,
-                jenis_aset TEXT,
-                satuan TEXT,
-                tahun_bangun INTEGER,
-                tahun_rehab_terakhir INTEGER,
-                dimensi_teknis TEXT, 
-                luas_layanan_desain REAL, 
-                nilai_aset_baru REAL DEFAULT 0,
-                file_kmz TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # 2. Tabel Inspeksi (Data Dinamis)
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS inspeksi_aset (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                aset_id INTEGER,
-                tanggal_inspeksi DATE,
-                nama_surveyor TEXT,
-                kondisi_sipil REAL, 
-                kondisi_me REAL,
-                nilai_fungsi_sipil REAL, 
-                nilai_fungsi_me REAL,
-                luas_terdampak_aktual REAL,
-                rekomendasi_penanganan TEXT,
-                estimasi_biaya REAL,
-                foto_bukti TEXT,
-                FOREIGN KEY(aset_id) REFERENCES master_aset(id)
-            )
-        ''')
-
-        # 3. Tabel Penunjang
-        self.cursor.execute('CREATE TABLE IF NOT EXISTS data_tanam (id INTEGER PRIMARY KEY, musim TEXT, luas_rencana REAL, luas_realisasi REAL, debit_andalan REAL, kebutuhan_air REAL, faktor_k REAL, prod_padi REAL, prod_palawija REAL)')
-        self.cursor.execute('CREATE TABLE IF NOT EXISTS data_p3a (id INTEGER PRIMARY KEY, nama_p3a TEXT, desa TEXT, status TEXT, keaktifan TEXT, anggota INTEGER)')
-        self.cursor.execute('CREATE TABLE IF NOT EXISTS data_sdm_sarana (id INTEGER PRIMARY KEY, jenis TEXT, nama TEXT, kondisi TEXT, ket TEXT)')
-        self.cursor.execute('CREATE TABLE IF NOT EXISTS data_dokumentasi (id INTEGER PRIMARY KEY, jenis_dokumen TEXT, ada INTEGER)')
-
-        # Auto-Repair Kolom (Jika tabel lama masih ada)
-        try:
-            self.cursor.execute("ALTER TABLE master_aset ADD COLUMN nilai_aset_baru REAL DEFAULT 0")
-        except: pass
-        try:
-            self.cursor.execute("ALTER TABLE master_aset ADD COLUMN tahun_rehab_terakhir INTEGER DEFAULT 0")
-        except: pass
-        
-        self.conn.commit()
+        """Bawa skema ke versi terbaru lewat MIGRASI. PRAGMA user_version = jumlah langkah yang sudah
+        dijalankan, jadi DB yang sudah terbaru cukup dibaca satu PRAGMA (tanpa CREATE/ALTER tiap
+        backend dibuat). Semua langkah yang kurang dijalankan dalam satu transaksi."""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRASI): return
+        with self._kunci_tulis:
+            # IMMEDIATE: proses lain yang membuka DB bersamaan menunggu, lalu melihat versi yang sudah naik
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                versi = self.conn.execute("PRAGMA user_version").fetchone()[0]
+                for langkah in MIGRASI[versi:]: langkah(self.cursor)
+                self.conn.execute(f"PRAGMA user_version = {max(versi, len(MIGRASI))}")
+                self.conn.commit()
+            except:
+                self.conn.rollback()
+                raise
+
+    @staticmethod
+    def _log_sinkron_ulang(cur):
+        """Isi ulang log_sinkron dari master_aset yang ada + epoch baru: kursor perangkat dari epoch
+        lama tidak berlaku lagi (perangkat memuat ulang seluruh master)"""
+        cur.execute("DELETE FROM log_sinkron")
+        cur.execute("INSERT INTO log_sinkron (tabel, baris_id) SELECT 'master_aset', id FROM master_aset ORDER BY id")
+        cur.execute("INSERT OR REPLACE INTO meta_sinkron VALUES ('epoch', lower(hex(randomblob(8))))")
+
+    # --- KONEKSI (POOL BACA + 1 PENULIS) ---
+    def _buka_koneksi(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.busy_timeout)
+        if self.pelacak is not None: conn.set_trace_callback(self._jejak_sql)
+        return conn
+
+    # --- INSTRUMENTASI ---
+    def _catat_galat(self, e):
+        if self.pelacak is not None: self.pelacak.galat(e)
+
+    def atur_pelacak(self, pelacak=None):
+        """Pasang/lepas Pelacak. Trace SQL dipasang di koneksi penulis & koneksi baca yang sedang
+        menganggur (koneksi yang sedang dipinjam menyusul saat dibuat ulang)."""
+        with self._kunci_tulis:
+            self.pelacak = pelacak
+            callback = self._jejak_sql if pelacak is not None else None
+            self.conn.set_trace_callback(callback)
+            menganggur = []
+            while True:
+                try: menganggur.append(self._pool.get_nowait())
+                except queue.Empty: break
+            for conn in menganggur:
+                conn.set_trace_callback(callback)
+                self._pool.put(conn)
+
+    @contextmanager
+    def _baca(self):
+        """Pinjam koneksi baca dari pool (dibuat saat perlu, maksimal pool_baca)"""
+        if self._pool_maks == 0:
+            with self._kunci_tulis: yield self.conn
+            return
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._kunci_pool:
+                buat_baru = self._jumlah_baca < self._pool_maks
+                if buat_baru: self._jumlah_baca += 1
+            conn = self._buka_koneksi() if buat_baru else self._pool.get(timeout=self.busy_timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _tulis(self, tabel=None, **inkremental):
+        """Transaksi tulis berserial: commit/rollback otomatis, lalu catat perubahan versi
+        `tabel` (None = semua tabel) beserta update cache inkremental."""
+        with self._kunci_tulis:
+            self._menulis += 1
+            awal = self.conn.total_changes
+            try:
+                try:
+                    yield self.cursor
+                    if self.conn.total_changes != awal: self._simpan_versi(tabel)
+                    self.conn.commit()
+                    if self.pelacak is not None: self.pelacak.tulis(self.conn.total_changes - awal)
+                except:
+                    self.conn.rollback()
+                    raise
+                if tabel: self._catat_perubahan(tabel, **inkremental)
+                else: self._naikkan_versi()
+                if tabel in (None, 'master_aset', 'inspeksi_aset'): self._jadwalkan_ringkasan()
+            finally:
+                self._menulis -= 1
+
+    def tutup(self):
+        """Tutup antrian laporan & semua koneksi (penulis + koneksi baca yang sedang tidak dipinjam)"""
+        self._tutup()
+
+    # --- CACHE HASIL (VERSI PER TABEL) ---
+    def _simpan_versi(self, tabel):
+        # Salinan persisten _versi (tabel versi_data) di transaksi yang sama, untuk kunci artefak laporan
+        self.cursor.executemany("INSERT INTO versi_data VALUES (?, 1) ON CONFLICT(tabel) DO UPDATE SET versi = versi + 1",
+                                [(t,) for t in ([tabel] if tabel else TABEL_DATA)])
+
+    def _naikkan_versi(self, *tabel):
+        # Tanpa argumen = semua tabel ber-versi (data, geometri & ringkasan), mis. setelah _tulis(None)
+        for t in (tabel or self._versi): self._versi[t] += 1
+
+    def _snapshot_versi(self, kunci):
+        return tuple(self._versi[t] for t in DEPENDENSI_CACHE[kunci])
+
+    def _cek_perubahan_luar(self):
+        # data_version (di koneksi penulis) hanya berubah jika proses LAIN melakukan commit.
+        # Saat penulis sedang sibuk, cek dilewati agar pembaca tidak ikut menunggu.
+        if not self._kunci_tulis.acquire(blocking=False): return
+        try:
+            dv = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._data_version is not None and dv != self._data_version:
+                self._naikkan_versi()
+            self._data_version = dv
+        finally:
+            self._kunci_tulis.release()
+
+    def _ambil_cache(self, kunci):
+        self._cek_perubahan_luar()
+        isi = self._cache.get(kunci)
+        if isi is not None and isi[0] == self._snapshot_versi(kunci): return isi[1]
+        return None
+
+    def _dari_cache(self, kunci, hitung):
+        """Hasil ter-cache, atau hitung() oleh satu thread per kunci (thread lain menunggu hasilnya)"""
+        nilai = self._ambil_cache(kunci)
+        if nilai is not None: return nilai
+        with self._kunci_hitung[kunci]:
+            nilai = self._ambil_cache(kunci)
+            if nilai is not None: return nilai
+
+            # Snapshot versi diambil SEBELUM membaca data; hasil hanya disimpan jika tidak ada
+            # penulisan selama perhitungan, agar data baru tidak tercatat dengan versi lama
+            versi = None if self._menulis else self._snapshot_versi(kunci)
+            nilai = hitung()
+            if versi is not None and not self._menulis and versi == self._snapshot_versi(kunci):
+                self._cache[kunci] = (versi, nilai)
+            return nilai
+
+    def _catat_perubahan(self, tabel, **inkremental):
+        """Naikkan versi `tabel`. Cache yang diberi fungsi update (kunci=fungsi) diperbarui
+        inkremental alih-alih dihitung ulang; fungsi boleh mengembalikan None (= buang)."""
+        baru = {}
+        for kunci, ubah in inkremental.items():
+            lama = self._ambil_cache(kunci)
+            if lama is not None: baru[kunci] = ubah(lama)
+        self._naikkan_versi(tabel)
+        for kunci, nilai in baru.items():
+            if nilai is not None: self._cache[kunci] = (self._snapshot_versi(kunci), nilai)
 
     # --- FITUR BACKUP & RESTORE (INI YANG TADI ERROR) ---
+    def _potongan_backup(self, format='json', ukuran_batch=5000):
+        """Teks backup per potongan; tiap tabel dibaca `ukuran_batch` baris sekali jalan (fetchmany)"""
+        with self._baca() as conn:
+            cur = conn.cursor()
+            # Satu transaksi baca = snapshot konsisten untuk semua tabel
+            if not conn.in_transaction: cur.execute("BEGIN")
+            try:
+                if format == 'json': yield "{"
+                for n, t in enumerate(TABEL_DATA):
+                    # table_info tidak memuat kolom generated (dim_*): hanya data asli yang dibackup
+                    kolom = [r[1] for r in cur.execute(f"PRAGMA table_info({t})").fetchall()]
+                    cur.execute(f"SELECT {', '.join(kolom)} FROM {t}")
+                    kolom = [d[0] for d in cur.description]
+                    if format == 'json': yield ("," if n else "") + f'\n"{t}": ['
+                    pertama = True
+                    while True:
+                        baris = cur.fetchmany(ukuran_batch)
+                        if not baris: break
+                        if format == 'json':
+                            yield ("\n" if pertama else ",\n") + ",\n".join(json.dumps(dict(zip(kolom, b))) for b in baris)
+                        else:
+                            yield "".join(json.dumps({"tabel": t, "data": dict(zip(kolom, b))}) + "\n" for b in baris)
+                        pertama = False
+                    if format == 'json': yield "\n]"
+                if format == 'json': yield "\n}\n"
+            finally:
+                conn.rollback()
+
+    def export_stream(self, format='json', kompres=False, ukuran_batch=5000):
+        """Backup bertahap (generator), memori tetap kecil berapapun besar tabelnya.
+        format 'json' = satu objek {tabel: [record, ...]} (bisa dibaca import_dari_json),
+        'jsonl' = satu record per baris {"tabel": ..., "data": {...}}.
+        kompres=True -> potongan bytes gzip, selain itu potongan str."""
+        potongan = self._potongan_backup(format, ukuran_batch)
+        if not kompres:
+            yield from potongan
+            return
+        z = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = format gzip
+        for teks in potongan:
+            data = z.compress(teks.encode('utf-8'))
+            if data: yield data
+        yield z.flush()
+
+    def export_ke_file(self, path, format=None, ukuran_batch=5000):
+        """Tulis backup ke file secara streaming. Format & kompresi ditebak dari nama file
+        (.jsonl / .json, akhiran .gz = gzip)"""
+        format = format or ('jsonl' if '.jsonl' in path else 'json')
+        kompres = path.endswith('.gz')
+        try:
+            with open(path, 'wb') as f:
+                for potongan in self.export_stream(format, kompres, ukuran_batch):
+                    f.write(potongan if kompres else potongan.encode('utf-8'))
+            return f"✅ Backup tersimpan ({os.path.getsize(path) / 1e6:.1f} MB)"
+        except Exception as e:
+            return f"❌ Gagal Backup: {e}"
+
     def export_ke_json(self):
-        """Backup SEMUA tabel ke satu JSON"""
-        data = {}
-        try:
-            data['master_aset'] = pd.read_sql("SELECT * FROM master_aset", self.conn).to_dict(orient='records')
-            data['inspeksi_aset'] = pd.read_sql("SELECT * FROM inspeksi_aset", self.conn).to_dict(orient='records')
-            data['data_tanam'] = pd.read_sql("SELECT * FROM data_tanam", self.conn).to_dict(orient='records')
-            data['data_p3a'] = pd.read_sql("SELECT * FROM data_p3a", self.conn).to_dict(orient='records')
-            data['data_sdm_sarana'] = pd.read_sql("SELECT * FROM data_sdm_sarana", self.conn).to_dict(orient='records')
-            data['data_dokumentasi'] = pd.read_sql("SELECT * FROM data_dokumentasi", self.conn).to_dict(orient='records')
-            return json.dumps(data, indent=2)
+        """Backup SEMUA tabel ke satu string JSON (untuk data kecil; data besar pakai export_ke_file)"""
+        try:
+            return "".join(self._potongan_backup('json'))
         except Exception as e:
             return json.dumps({"error": str(e)})
 
-    def import_dari_json(self, json_file):
-        """Restore database dari file JSON lengkap"""
+    def import_dari_json(self, json_file, ukuran_batch=5000):
+        """Restore database dari file backup (JSON/JSONL, polos atau .gz) dalam SATU transaksi:
+        data lama dihapus, record diurai streaming & divalidasi terhadap skema init_db, lalu
+        di-insert per batch (executemany). Index dibuat ulang di akhir. Gagal = rollback penuh."""
+        t0 = time.perf_counter()
+        daftar = ','.join('?' * len(TABEL_DATA))
         try:
-            data = json.load(json_file)
-            
-            # Hapus data lama (Reset)
-            self.hapus_semua_data()
-            
-            # Insert data baru
-            if 'master_aset' in data and data['master_aset']:
-                pd.DataFrame(data['master_aset']).to_sql('master_aset', self.conn, if_exists='append', index=False)
-            
-            if 'inspeksi_aset' in data and data['inspeksi_aset']:
-                pd.DataFrame(data['inspeksi_aset']).to_sql('inspeksi_aset', self.conn, if_exists='append', index=False)
-                
-            if 'data_tanam' in data and data['data_tanam']:
-                pd.DataFrame(data['data_tanam']).to_sql('data_tanam', self.conn, if_exists='append', index=False)
-                
-            if 'data_p3a' in data and data['data_p3a']:
-                pd.DataFrame(data['data_p3a']).to_sql('data_p3a', self.conn, if_exists='append', index=False)
-                
-            if 'data_sdm_sarana' in data and data['data_sdm_sarana']:
-                pd.DataFrame(data['data_sdm_sarana']).to_sql('data_sdm_sarana', self.conn, if_exists='append', index=False)
-                
-            if 'data_dokumentasi' in data and data['data_dokumentasi']:
-                pd.DataFrame(data['data_dokumentasi']).to_sql('data_dokumentasi', self.conn, if_exists='append', index=False)
-                
-            self.conn.commit()
-            return "✅ Restore Berhasil! Semua data kembali."
+            with self._tulis() as cur:
+                if not self.conn.in_transaction: cur.execute("BEGIN")
+                skema = {t: {r[1] for r in cur.execute(f"PRAGMA table_info({t})")} for t in TABEL_DATA}
+                for t in TABEL_DATA: cur.execute(f"DELETE FROM {t}")
+                cur.execute(f"DELETE FROM sqlite_sequence WHERE name IN ({daftar})", TABEL_DATA)
+
+                # Index ditunda: drop dulu, dibuat ulang sekali setelah semua data masuk
+                index = cur.execute(f"""SELECT name, sql FROM sqlite_master
+                    WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({daftar})""", TABEL_DATA).fetchall()
+                for nama, _ in index: cur.execute(f"DROP INDEX {nama}")
+                # Trigger antrian ringkasan & log sinkron juga ditunda: semua aset diantrikan/dicatat sekali di akhir
+                trigger = cur.execute('''SELECT name, sql FROM sqlite_master WHERE type = 'trigger'
+                    AND (name LIKE 'ringkasan~_%' ESCAPE '~' OR name LIKE 'sinkron~_%' ESCAPE '~')''').fetchall()
+                for nama, _ in trigger: cur.execute(f"DROP TRIGGER {nama}")
+
+                # Record berurutan dengan tabel & kolom sama dikumpulkan jadi satu batch
+                jumlah, kunci, batch = 0, None, []
+                for tabel, record in baca_backup(json_file):
+                    if tabel not in skema: raise ValueError(f"Tabel tidak dikenal: {tabel}")
+                    if not isinstance(record, dict): raise ValueError(f"Record {tabel} bukan objek")
+                    if kunci != (tabel, tuple(record)) or len(batch) >= ukuran_batch:
+                        jumlah += self._insert_batch(cur, kunci, batch)
+                        kunci, batch = (tabel, tuple(record)), []
+                        asing = set(record) - skema[tabel]
+                        if asing: raise ValueError(f"Kolom tidak dikenal di {tabel}: {', '.join(sorted(asing))}")
+                    batch.append(tuple(record.values()))
+                jumlah += self._insert_batch(cur, kunci, batch)
+
+                for _, sql in index + trigger: cur.execute(sql)
+                cur.execute("DELETE FROM ringkasan_kondisi")
+                cur.execute("DELETE FROM ringkasan_antri")
+                cur.execute("INSERT INTO ringkasan_antri SELECT DISTINCT aset_id FROM inspeksi_aset WHERE aset_id IS NOT NULL")
+                self._log_sinkron_ulang(cur)
+                self._hapus_geometri_yatim(cur)
+                cur.execute("ANALYZE")
+            laju = jumlah / max(time.perf_counter() - t0, 1e-9)
+            return f"✅ Restore Berhasil! Semua data kembali. ({jumlah:,} baris, {laju:,.0f} baris/detik)"
         except Exception as e:
-            return f"❌ Gagal Restore: {e}"
+            self._naikkan_versi()
+            return f"❌ Gagal Restore (data lama tetap utuh): {e}"
+
+    @staticmethod
+    def _insert_batch(cur, kunci, batch):
+        if not batch: return 0
+        tabel, kolom = kunci
+        cur.executemany(f"INSERT INTO {tabel} ({', '.join(kolom)}) VALUES ({', '.join('?' * len(kolom))})", batch)
+        return len(batch)
 
     # --- CRUD MASTER ASET ---
     def tambah_master_aset(self, nama, jenis, satuan, thn_bangun, thn_rehab, luas, nab, detail, kmz=None):
@@ -126,113 +644,839 @@ class IrigasiBackend:
             kmz_name = kmz.name if kmz else "-"
             detail_json = json.dumps(detail)
             
-            self.cursor.execute('''INSERT INTO master_aset 
-                (kode_aset, nama_aset, jenis_aset, satuan, tahun_bangun, tahun_rehab_terakhir, luas_layanan_desain, nilai_aset_baru, dimensi_teknis, file_kmz)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', 
-                (kode, nama, jenis, satuan, thn_bangun, thn_rehab, luas, nab, detail_json, kmz_name))
-            self.conn.commit()
+            # aset_id diisi di dalam blok; lambda membacanya setelah commit
+            with self._tulis('master_aset', fisik=lambda agg: self._update_fisik(agg, aset_id),
+                             prioritas=lambda df: self._update_prioritas(df, aset_id)) as cur:
+                cur.execute('''INSERT INTO master_aset 
+                    (kode_aset, nama_aset, jenis_aset, satuan, tahun_bangun, tahun_rehab_terakhir, luas_layanan_desain, nilai_aset_baru, dimensi_teknis, file_kmz)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', 
+                    (kode, nama, jenis, satuan, thn_bangun, thn_rehab, luas, nab, detail_json, kmz_name))
+                aset_id = cur.lastrowid
+                if kmz: self._simpan_geometri(cur, kmz, aset_id)
             return "✅ Master Aset Terdaftar!"
         except Exception as e: return f"❌ Gagal: {e}"
 
     # --- CRUD INSPEKSI ---
-    def tambah_inspeksi(self, aset_id, surveyor, ks, kme, fs, fme, luas_impact, rek, biaya):
-        try:
-            tgl = datetime.now().strftime("%Y-%m-%d")
-            self.cursor.execute('''INSERT INTO inspeksi_aset
-                (aset_id, tanggal_inspeksi, nama_surveyor, kondisi_sipil, kondisi_me, nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual, rekomendasi_penanganan, estimasi_biaya)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                (aset_id, tgl, surveyor, ks, kme, fs, fme, luas_impact, rek, biaya))
-            self.conn.commit()
+    def tambah_inspeksi(self, aset_id, surveyor, ks, kme, fs, fme, luas_impact, rek, biaya, waktu=None, foto=None):
+        """Satu inspeksi dari form; `waktu` = waktu survei asli (default sekarang), `foto` = file foto bukti
+        (disimpan di gudang foto sebelum transaksi, baris inspeksi hanya menyimpan hash-nya)"""
+        try:
+            waktu = waktu or datetime.now()
+            hash_foto, _ = self._simpan_foto(foto)
+            with self._tulis('inspeksi_aset', fisik=lambda agg: self._update_fisik(agg, aset_id),
+                             prioritas=lambda df: self._update_prioritas(df, aset_id)) as cur:
+                cur.execute('''INSERT INTO inspeksi_aset
+                    (aset_id, tanggal_inspeksi, nama_surveyor, kondisi_sipil, kondisi_me, nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual, rekomendasi_penanganan, estimasi_biaya, uuid, waktu_survei, foto_bukti)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (aset_id, waktu.strftime("%Y-%m-%d"), surveyor, ks, kme, fs, fme, luas_impact, rek, biaya,
+                     str(uuid.uuid4()), waktu.isoformat(timespec='seconds'), json.dumps(hash_foto) if hash_foto else None))
+                # Ringkasan riwayat aset ini ikut diperbarui di transaksi yang sama (aset lain yang antri
+                # diperbarui thread latar, lihat _segarkan_latar)
+                self._segarkan_ringkasan(cur, int(aset_id))
+            self._naikkan_versi('ringkasan_kondisi')
             return "✅ Laporan Inspeksi Disimpan!"
         except Exception as e: return f"❌ Gagal: {e}"
 
+    # --- SINKRON LAPANGAN (OFFLINE) ---
+    def sinkron_inspeksi(self, records, kursor=None, surveyor=None, batas_tarik=5000):
+        """Terima batch inspeksi yang direkam offline (dict per record: uuid dari perangkat, aset_id,
+        waktu_survei ISO, nilai inspeksi, revisi_dasar = revisi server yang terakhir diketahui perangkat,
+        0/kosong untuk record baru). Semua disimpan dalam SATU transaksi & idempoten per uuid:
+        - uuid baru -> disimpan (revisi 1); isi sama persis dengan server -> duplikat (kiriman ulang)
+        - isi berbeda & revisi_dasar = revisi server -> diperbarui (revisi + 1)
+        - isi berbeda & revisi_dasar lama -> konflik, data server tidak ditimpa & dikembalikan ke perangkat
+        Record tidak valid ditolak satu per satu. Sekaligus menarik perubahan master sejak `kursor`
+        (lihat tarik_perubahan), jadi satu panggilan = satu sesi sinkron perangkat."""
+        _urai_kursor(kursor)
+        hasil = {'diterima': 0, 'diperbarui': 0, 'duplikat': 0, 'konflik': [], 'ditolak': [], 'revisi': {}}
+        valid = []
+        for r in records:
+            try: valid.append(_urai_inspeksi_lapangan(r, surveyor))
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                hasil['ditolak'].append({'uuid': r.get('uuid') if isinstance(r, dict) else None, 'alasan': str(e)})
+        try:
+            with self._tulis('inspeksi_aset') as cur:
+                aset = {r[0] for r in cur.execute("SELECT id FROM master_aset WHERE id IN (SELECT value FROM json_each(?))",
+                                                  (json.dumps(list({v[2][0] for v in valid})),))}
+                # Keadaan server per uuid: (id baris atau None jika baru di batch ini, revisi, isi)
+                server = {u: (i, rev, tuple(isi)) for u, i, rev, *isi in cur.execute(f'''
+                    SELECT uuid, id, revisi, {', '.join(KOLOM_INSPEKSI_LAPANGAN)} FROM inspeksi_aset
+                    WHERE uuid IN (SELECT value FROM json_each(?))''', (json.dumps([v[0] for v in valid]),))}
+                awal = dict(server)
+                for u, revisi_dasar, isi in valid:
+                    lama = server.get(u)
+                    if isi[0] not in aset:
+                        hasil['ditolak'].append({'uuid': u, 'alasan': f"aset_id {isi[0]} tidak ada di master"})
+                    elif lama is None:
+                        server[u] = (None, 1, isi)
+                        hasil['diterima'] += 1
+                    elif lama[2] == isi:
+                        hasil['duplikat'] += 1
+                    elif revisi_dasar == lama[1]:
+                        server[u] = (lama[0], lama[1] + 1, isi)
+                        hasil['diperbarui'] += 1
+                    else:
+                        hasil['konflik'].append({'uuid': u, 'revisi_server': lama[1],
+                                                 'server': dict(zip(KOLOM_INSPEKSI_LAPANGAN, lama[2]))})
+                baru = [(u, rev, *isi) for u, (i, rev, isi) in server.items() if i is None]
+                ubah = [(*isi, rev, i) for u, (i, rev, isi) in server.items() if i is not None and awal[u][1] != rev]
+                cur.executemany(f'''INSERT INTO inspeksi_aset (uuid, revisi, {', '.join(KOLOM_INSPEKSI_LAPANGAN)})
+                    VALUES ({', '.join('?' * (len(KOLOM_INSPEKSI_LAPANGAN) + 2))})''', baru)
+                cur.executemany(f'''UPDATE inspeksi_aset SET {', '.join(f'{k} = ?' for k in KOLOM_INSPEKSI_LAPANGAN)},
+                    revisi = ? WHERE id = ?''', ubah)
+        except Exception as e:
+            hasil.update(diterima=0, diperbarui=0, duplikat=0, konflik=[])
+            hasil['pesan'] = f"❌ Gagal Sinkron (tidak ada yang disimpan, kirim ulang batch ini): {e}"
+            return hasil
+        hasil['revisi'] = {u: server[u][1] for u, _, _ in valid if u in server}
+        hasil['perubahan'] = self.tarik_perubahan(kursor, batas_tarik)
+        hasil['pesan'] = (f"✅ Sinkron: {hasil['diterima']:,} baru, {hasil['diperbarui']:,} diperbarui, "
+                          f"{hasil['duplikat']:,} duplikat, {len(hasil['konflik']):,} konflik, "
+                          f"{len(hasil['ditolak']):,} ditolak")
+        return hasil
+
+    def tarik_perubahan(self, kursor=None, batas=5000):
+        """Perubahan master_aset sejak `kursor` (None = semua), maksimal `batas` baris, untuk perangkat
+        lapangan. Kembalikan dict: kursor (simpan di perangkat untuk sinkron berikutnya), reset (True =
+        kursor dari epoch lama, mis. setelah restore -> buang salinan master lalu muat ulang), master_aset
+        (record yang ditambah/diubah), hapus (id yang dihapus), lagi (masih ada perubahan berikutnya)."""
+        with self._baca() as conn:
+            # Satu transaksi baca: log & isi master dari snapshot yang sama
+            if not conn.in_transaction: conn.execute("BEGIN")
+            try:
+                epoch = conn.execute("SELECT nilai FROM meta_sinkron WHERE kunci = 'epoch'").fetchone()[0]
+                epoch_kursor, seq = _urai_kursor(kursor)
+                reset = epoch_kursor is not None and epoch_kursor != epoch
+                if epoch_kursor != epoch: seq = 0
+                log = conn.execute('''SELECT seq, baris_id, hapus FROM log_sinkron
+                    WHERE seq > ? AND tabel = 'master_aset' ORDER BY seq LIMIT ?''', (seq, batas + 1)).fetchall()
+                lagi, log = len(log) > batas, log[:batas]
+                cur = conn.execute(f'''SELECT {', '.join(KOLOM_MASTER)}, dimensi_teknis FROM master_aset
+                    WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id''', (json.dumps([b for _, b, h in log if not h]),))
+                kolom = [d[0] for d in cur.description]
+                master = [dict(zip(kolom, b)) for b in cur.fetchall()]
+            finally:
+                conn.rollback()
+        return {'kursor': f"{epoch}:{log[-1][0] if log else seq}", 'reset': reset, 'master_aset': master,
+                'hapus': [b for _, b, h in log if h], 'lagi': lagi}
+
+    # --- FOTO BUKTI INSPEKSI (di disk, dialamatkan hash; DB hanya menyimpan hash di foto_bukti) ---
+    def _gudang(self):
+        if self._gudang_foto is None:
+            self._gudang_foto = GudangFoto(os.path.join(self.db_folder or '.', 'foto'))
+        return self._gudang_foto
+
+    def _simpan_foto(self, foto):
+        """Simpan file foto ke gudang -> (daftar hash unik berurutan, jumlah yang benar-benar baru)"""
+        hasil = [self._gudang().simpan(f) for f in foto or []]
+        return list(dict.fromkeys(h for h, _ in hasil)), sum(baru for _, baru in hasil)
+
+    def lampirkan_foto(self, inspeksi_id, foto):
+        """Tambahkan foto ke inspeksi yang sudah ada (foto yang sama tidak tercatat dua kali)"""
+        try:
+            hash_foto, baru = self._simpan_foto(foto)
+            with self._tulis('inspeksi_aset') as cur:
+                lama = cur.execute("SELECT foto_bukti FROM inspeksi_aset WHERE id = ?", (inspeksi_id,)).fetchone()
+                if lama is None: raise ValueError(f"Inspeksi {inspeksi_id} tidak ada")
+                semua = list(dict.fromkeys(_daftar_foto(lama[0]) + hash_foto))
+                cur.execute("UPDATE inspeksi_aset SET foto_bukti = ? WHERE id = ?", (json.dumps(semua), inspeksi_id))
+            return f"✅ {len(hash_foto)} Foto Dilampirkan ({baru} file baru, sisanya sudah ada di gudang)"
+        except Exception as e: return f"❌ Gagal Melampirkan Foto: {e}"
+
+    def get_foto_aset(self, aset_id, batas=24):
+        """Foto bukti inspeksi satu aset, inspeksi terbaru dulu: inspeksi_id, tanggal_inspeksi, hash"""
+        with self._baca() as conn:
+            return pd.read_sql('''SELECT i.id AS inspeksi_id, i.tanggal_inspeksi, f.value AS hash
+                FROM inspeksi_aset i, json_each(i.foto_bukti) f
+                WHERE i.aset_id = ? AND json_valid(i.foto_bukti)
+                  AND f.type = 'text' AND length(f.value) = 64 AND f.value NOT GLOB '*[^0-9a-f]*'
+                ORDER BY i.tanggal_inspeksi DESC, i.id DESC, f.key LIMIT ?''', conn, params=[aset_id, batas])
+
+    def foto_thumbnail(self, hash_foto, tunggu=10):
+        """Bytes JPEG thumbnail (cache LRU -> file thumbnail -> worker), None jika tidak tersedia
+        (tunggu=0: jangan menunggu worker, thumbnail yang masih dibuat -> None)"""
+        return self._gudang().thumbnail(hash_foto, tunggu)
+
+    def buka_foto(self, hash_foto):
+        """Context manager: memoryview mmap foto asli (lihat GudangFoto.buka)"""
+        return self._gudang().buka(hash_foto)
+
+    def bersihkan_foto(self):
+        """Hapus file foto yang tidak dirujuk inspeksi mana pun (mis. inspeksinya sudah dihapus)"""
+        try:
+            with self._baca() as conn:
+                dipakai = {r[0] for r in conn.execute('''SELECT DISTINCT f.value FROM inspeksi_aset i, json_each(i.foto_bukti) f
+                    WHERE json_valid(i.foto_bukti)''')}
+            jumlah, byte = self._gudang().sapu(dipakai)
+            return f"✅ {jumlah:,} foto tak terpakai dihapus ({byte / 1e6:.1f} MB)"
+        except Exception as e: return f"❌ Gagal Membersihkan Foto: {e}"
+
+    # --- IMPOR BLANGKO PAI LAMA (data_lama/*.xls) ---
+    def impor_pai_lama(self, sumber, proses=None, ukuran_batch=2000):
+        """Impor massal blangko aset PAI lama (folder/daftar file .xls/.xlsx terisi) ke master_aset
+        & inspeksi_aset. File diurai paralel (modules/impor_pai.py), aset di-dedupe per kode_aset
+        (upsert), inspeksi per (aset, tanggal); semua masuk dalam satu transaksi."""
+        t0 = time.perf_counter()
+        try:
+            hasil = urai_arsip(sumber, proses)
+            # Dedupe: atribut master dari survei terbaru, satu inspeksi per (kode, tanggal)
+            master, inspeksi = {}, {}
+            for h in sorted((h for h in hasil if 'master' in h),
+                            key=lambda h: (h['inspeksi'] or {}).get('tanggal_inspeksi', '')):
+                kode = h['master']['kode_aset']
+                master[kode] = h['master']
+                if h['inspeksi']: inspeksi[(kode, h['inspeksi']['tanggal_inspeksi'])] = h['inspeksi']
+
+            kolom_m = ['kode_aset', 'nama_aset', 'jenis_aset', 'satuan', 'tahun_bangun', 'tahun_rehab_terakhir',
+                       'dimensi_teknis', 'luas_layanan_desain', 'nilai_aset_baru']
+            kolom_i = ['tanggal_inspeksi', 'kondisi_sipil', 'kondisi_me', 'nilai_fungsi_sipil', 'nilai_fungsi_me',
+                       'luas_terdampak_aktual', 'rekomendasi_penanganan', 'estimasi_biaya']
+            baris_m = [tuple(json.dumps(m[k]) if k == 'dimensi_teknis' else m[k] for k in kolom_m) for m in master.values()]
+
+            with self._tulis() as cur:
+                for i in range(0, len(baris_m), ukuran_batch):
+                    cur.executemany(f'''INSERT INTO master_aset ({', '.join(kolom_m)}, file_kmz)
+                        VALUES ({', '.join('?' * len(kolom_m))}, '-')
+                        ON CONFLICT(kode_aset) DO UPDATE SET
+                        {', '.join(f"{k} = excluded.{k}" for k in kolom_m[1:] if k != 'tahun_rehab_terakhir')}''',
+                        baris_m[i:i + ukuran_batch])
+
+                kode = list(master)
+                aset_id = {}
+                for i in range(0, len(kode), 500):
+                    bagian = kode[i:i + 500]
+                    aset_id.update((k, a) for a, k in cur.execute(
+                        f"SELECT id, kode_aset FROM master_aset WHERE kode_aset IN ({','.join('?' * len(bagian))})", bagian))
+
+                # Impor ulang arsip yang sama tidak menggandakan inspeksi (cek lewat index aset_id+tanggal)
+                baris_i = [(aset_id[k], *(r[c] for c in kolom_i), aset_id[k], tgl) for (k, tgl), r in inspeksi.items()]
+                baru = 0   # rowcount, bukan total_changes: trigger ringkasan ikut menambah total_changes
+                for i in range(0, len(baris_i), ukuran_batch):
+                    cur.executemany(f'''INSERT INTO inspeksi_aset (aset_id, nama_surveyor, {', '.join(kolom_i)})
+                        SELECT ?, 'Impor PAI', {', '.join('?' * len(kolom_i))}
+                        WHERE NOT EXISTS (SELECT 1 FROM inspeksi_aset
+                            WHERE aset_id = ? AND tanggal_inspeksi = ? AND nama_surveyor = 'Impor PAI')''',
+                        baris_i[i:i + ukuran_batch])
+                    baru += cur.rowcount
+
+            dilewati = sum('lewati' in h for h in hasil)
+            return (f"✅ Impor PAI: {len(master):,} aset, {baru:,} inspeksi baru dari {len(hasil):,} file "
+                    f"({dilewati:,} dilewati) dalam {time.perf_counter() - t0:.1f} s")
+        except Exception as e:
+            return f"❌ Gagal Impor PAI: {e}"
+
+    # --- RIWAYAT PRIORITAS PARADOX (data_lama/prioritas.db) ---
+    def migrasi_paradox(self, path, tabel='riwayat_prioritas', ukuran_potongan=100_000):
+        """Muat tabel Paradox PAI lama ke SQLite. Kolom didekode per potongan langsung dari mmap
+        (modules/paradox.py) lalu di-insert dengan executemany; migrasi ulang file yang sama
+        mengganti baris lamanya (kolom `sumber`)."""
+        t0 = time.perf_counter()
+        try:
+            with TabelParadox(path) as px, self._tulis() as cur:
+                kolom = [(n.lower(), TIPE_SQLITE.get(tipe, 'BLOB')) for n, tipe, _, _ in px.field]
+                cur.execute(f'''CREATE TABLE IF NOT EXISTS {tabel} (id INTEGER PRIMARY KEY AUTOINCREMENT, sumber TEXT,
+                    {', '.join(f'"{n}" {t}' for n, t in kolom)})''')
+                ada = {r[1] for r in cur.execute(f"PRAGMA table_info({tabel})")}
+                for n, t in kolom:
+                    if n not in ada: cur.execute(f'ALTER TABLE {tabel} ADD COLUMN "{n}" {t}')
+                cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabel}_sumber ON {tabel}(sumber)")
+
+                sumber = os.path.basename(path)
+                cur.execute(f"DELETE FROM {tabel} WHERE sumber = ?", (sumber,))
+                sql = f'''INSERT INTO {tabel} (sumber, {', '.join(f'"{n}"' for n, _ in kolom)})
+                          VALUES (?, {', '.join('?' * len(kolom))})'''
+                jumlah = 0
+                for bagian in px.potongan(ukuran_potongan):
+                    nilai = [_ke_python(bagian[n]) for n, _, _, _ in px.field]
+                    cur.executemany(sql, zip([sumber] * len(nilai[0]), *nilai))
+                    jumlah += len(nilai[0])
+            return f"✅ Migrasi {sumber}: {jumlah:,} record ke {tabel} dalam {time.perf_counter() - t0:.2f} s"
+        except Exception as e:
+            return f"❌ Gagal Migrasi: {e}"
+
+    def get_perbandingan_prioritas(self, tabel='riwayat_prioritas'):
+        """Skor prioritas historis (Paradox) berdampingan dengan Skor_Prioritas saat ini. Aset dicocokkan
+        lewat kode aset, atau nama aset bila kode lama kosong/tidak dikenal (huruf besar/kecil, spasi,
+        tanda baca & diakritik diabaikan; nama yang dipakai lebih dari satu aset tidak dicocokkan).
+        Jumlah baris per cara pencocokan ada di `hasil.attrs['pencocokan']`."""
+        try:
+            with self._baca() as conn:
+                riwayat = pd.read_sql(f'''
+                    SELECT m.id AS aset_id, r.sumber, r.n_aset AS nama_lama, r.kode AS kode_lama,
+                           r.thn_survey, r.kondisi, r.fungsi, r.skor AS skor_lama, r.urgensi AS urgensi_lama, r.biaya AS biaya_lama
+                    FROM {tabel} r
+                    LEFT JOIN master_aset m ON m.kode_aset = r.kode
+                    ORDER BY r.sumber, r.urut''', conn)
+                master = pd.read_sql("SELECT id, nama_aset FROM master_aset", conn)
+        except Exception as e:
+            self._catat_galat(e)
+            return pd.DataFrame()
+        kunci = _kunci_nama(master['nama_aset'])
+        unik = ~kunci.duplicated(keep=False) & kunci.notna()
+        per_nama = pd.Series(master['id'][unik].to_numpy(), index=kunci[unik].to_numpy())
+        lewat_kode = riwayat['aset_id'].notna()
+        cari = ~lewat_kode
+        riwayat.loc[cari, 'aset_id'] = _kunci_nama(riwayat.loc[cari, 'nama_lama']).map(per_nama).to_numpy()
+        lewat_nama = cari & riwayat['aset_id'].notna()
+        pencocokan = {'kode': int(lewat_kode.sum()), 'nama': int(lewat_nama.sum()),
+                      'tidak_cocok': int(len(riwayat) - lewat_kode.sum() - lewat_nama.sum())}
+
+        kini = self.get_prioritas_matematis()
+        if kini.empty:
+            riwayat['Skor_Prioritas'] = np.nan
+            riwayat.attrs['pencocokan'] = pencocokan
+            return riwayat
+        hasil = riwayat.merge(kini[['aset_id', 'nama_aset', 'Skor_Prioritas', 'Kelas_Prioritas']], on='aset_id', how='left')
+        hasil['Selisih_Skor'] = hasil['Skor_Prioritas'] - hasil['skor_lama']
+        hasil.attrs['pencocokan'] = pencocokan
+        return hasil
+
+    # --- LAPORAN EXCEL ---
+    def _potongan_tabel(self, tabel, ukuran_batch):
+        """(kolom, generator potongan baris) satu tabel via fetchmany, koneksi baca dipegang selama iterasi"""
+        with self._baca() as conn:
+            cur = conn.execute(f"SELECT * FROM {tabel}")
+            yield [d[0] for d in cur.description]
+            while True:
+                baris = cur.fetchmany(ukuran_batch)
+                if not baris: break
+                yield baris
+
+    def buat_laporan_excel(self, output, ukuran_batch=10_000, daerah_irigasi=None, kabupaten=None, kemajuan=None,
+                           parameter=None):
+        """Laporan resmi (Blangko 1-P Fisik + Prioritas + Master Data) ke `output` (path file atau
+        BytesIO). Ditulis streaming per `ukuran_batch` baris dalam mode constant_memory xlsxwriter.
+        `parameter` (dict field ParameterPenilaian) dikirim mulai_laporan ke proses worker."""
+        t0 = time.perf_counter()
+        try:
+            if parameter is not None and ParameterPenilaian(**parameter) != self.parameter:
+                self.atur_parameter(ParameterPenilaian(**parameter), ringkasan=False)
+            df_p = self.get_prioritas_matematis()
+            with self._baca() as conn:
+                jumlah_master = conn.execute("SELECT COUNT(*) FROM master_aset").fetchone()[0]
+            master = self._potongan_tabel('master_aset', ukuran_batch)
+            try:
+                tulis_laporan(output, df_p, (next(master), master), ukuran_batch, daerah_irigasi, kabupaten,
+                              kemajuan, jumlah_master)
+            finally:
+                master.close()
+            return f"✅ Laporan siap ({len(df_p):,} aset, {time.perf_counter() - t0:.2f} s)"
+        except Exception as e:
+            return f"❌ Gagal Membuat Laporan: {e}"
+
+    def _antrian_laporan(self):
+        if self._antrian is None:
+            if self._pool_maks == 0: raise ValueError("DB memori tidak bisa dibaca proses worker laporan")
+            self._antrian = AntrianLaporan(os.path.join(self.db_folder or '.', 'laporan'), self.db_path)
+        return self._antrian
+
+    def mulai_laporan(self, jenis='excel', **opsi):
+        """Antrekan pembuatan laporan di proses worker, kembalikan id pekerjaan (lihat status_laporan).
+        Selama master/inspeksi tidak berubah, laporan yang sama diambil dari arsip di disk (juga setelah restart)."""
+        with self._baca() as conn:
+            id_db = conn.execute("SELECT nilai FROM meta_sinkron WHERE kunci = 'id_db'").fetchone()[0]
+            tersimpan = dict(conn.execute("SELECT tabel, versi FROM versi_data"))
+        versi = [id_db] + [tersimpan.get(t, 0) for t in DEPENDENSI_CACHE['laporan']]
+        return self._antrian_laporan().mulai(jenis, versi, {**opsi, 'parameter': asdict(self.parameter)})
+
+    def status_laporan(self, id_pekerjaan):
+        """dict status pekerjaan: status ('antri'/'berjalan'/'selesai'/'gagal'), kemajuan 0-1, path, pesan"""
+        return self._antrian_laporan().status(id_pekerjaan)
+
+    # --- GEOMETRI ASET (KMZ) ---
+    def _simpan_geometri(self, cur, sumber, aset_id=None, ukuran_batch=2000):
+        """Urai KML/KMZ streaming, simpan per batch (executemany) di transaksi `cur`. Return jumlah fitur."""
+        fid = cur.execute("SELECT COALESCE(MAX(id), 0) FROM geometri_fitur").fetchone()[0]
+        jumlah = 0
+        fitur, level, kotak = [], [], []
+
+        def simpan():
+            cur.executemany("INSERT INTO geometri_fitur VALUES (?, ?, ?, ?, ?)", fitur)
+            cur.executemany("INSERT INTO geometri_level VALUES (?, ?, ?)", level)
+            cur.executemany("INSERT INTO geometri_rtree VALUES (?, ?, ?, ?, ?)", kotak)
+            fitur.clear(); level.clear(); kotak.clear()
+
+        for nama, tipe, xy in urai_kml(sumber):
+            fid += 1
+            jumlah += 1
+            (x0, y0), (x1, y1) = xy.min(axis=0), xy.max(axis=0)
+            fitur.append((fid, aset_id, nama, tipe, len(xy)))
+            level.extend((fid, lv, blob) for lv, blob in level_geometri(tipe, xy))
+            kotak.append((fid, float(x0), float(x1), float(y0), float(y1)))
+            if len(fitur) >= ukuran_batch: simpan()
+        simpan()
+        return jumlah
+
+    @staticmethod
+    def _hapus_geometri_yatim(cur):
+        # Geometri tidak ikut backup: setelah restore, fitur yang aset_id-nya tidak ada lagi di master dibuang
+        yatim = "SELECT id FROM geometri_fitur WHERE aset_id IS NOT NULL AND aset_id NOT IN (SELECT id FROM master_aset)"
+        cur.execute(f"DELETE FROM geometri_level WHERE fitur_id IN ({yatim})")
+        cur.execute(f"DELETE FROM geometri_rtree WHERE id IN ({yatim})")
+        cur.execute(f"DELETE FROM geometri_fitur WHERE id IN ({yatim})")
+
+    def impor_geometri_kmz(self, sumber, aset_id=None):
+        """Simpan geometri semua Placemark di file KMZ/KML (path atau upload Streamlit)"""
+        t0 = time.perf_counter()
+        try:
+            with self._tulis('geometri_fitur') as cur:
+                jumlah = self._simpan_geometri(cur, sumber, aset_id)
+            return f"✅ {jumlah:,} fitur geometri tersimpan ({time.perf_counter() - t0:.2f} s)"
+        except Exception as e:
+            return f"❌ Gagal Membaca KMZ: {e}"
+
+    def get_geometri_viewport(self, min_x, min_y, max_x, max_y, zoom, batas=5000):
+        """GeoJSON fitur yang kotaknya beririsan dengan viewport (seek R*Tree). Koordinat diambil dari
+        level penyederhanaan yang sesuai zoom; garis/poligon yang lebih kecil dari 1 piksel dilewati."""
+        with self._baca() as conn:
+            baris = conn.execute('''
+                SELECT f.id, f.aset_id, f.nama, f.tipe, g.koordinat
+                FROM geometri_rtree r
+                JOIN geometri_fitur f ON f.id = r.id
+                JOIN geometri_level g ON g.fitur_id = f.id AND g.level = (
+                    SELECT MAX(level) FROM geometri_level WHERE fitur_id = f.id AND level <= ?)
+                WHERE r.max_x >= ? AND r.min_x <= ? AND r.max_y >= ? AND r.min_y <= ?
+                  AND (f.tipe = 'Point' OR (r.max_x - r.min_x) + (r.max_y - r.min_y) >= ?)
+                LIMIT ?''', (level_untuk_zoom(zoom), min_x, max_x, min_y, max_y, derajat_per_piksel(zoom), batas)).fetchall()
+        return ke_geojson(baris)
+
+    def get_batas_geometri(self):
+        """(min_x, min_y, max_x, max_y) semua geometri, atau None jika belum ada"""
+        with self._baca() as conn:
+            batas = conn.execute("SELECT MIN(min_x), MIN(min_y), MAX(max_x), MAX(max_y) FROM geometri_rtree").fetchone()
+        return None if batas[0] is None else batas
+
+    # --- QUERY ATRIBUT TEKNIS (dimensi_teknis) ---
+    @staticmethod
+    def _kolom_teknis(nama):
+        """Nama atribut/kolom -> kolom SQL (dari daftar putih, aman disisipkan ke query)"""
+        if nama in ATRIBUT_TEKNIS: return f"dim_{nama}"
+        if nama in KOLOM_MASTER: return nama
+        raise ValueError(f"Atribut tidak dikenal: {nama} (pilihan: {', '.join(list(ATRIBUT_TEKNIS) + KOLOM_MASTER)})")
+
+    def _where_teknis(self, jenis=None, filter=None):
+        """WHERE + parameter dari jenis (str/list) dan filter [(atribut, operator, nilai), ...]"""
+        syarat, param = [], []
+        if jenis is not None:
+            jenis = [jenis] if isinstance(jenis, str) else list(jenis)
+            syarat.append(f"jenis_aset IN ({', '.join('?' * len(jenis))})")
+            param += jenis
+        self._syarat_filter(filter, self._kolom_teknis, syarat, param)
+        return (" WHERE " + " AND ".join(syarat)) if syarat else "", param
+
+    @staticmethod
+    def _syarat_filter(filter, kolom_sql, syarat, param):
+        """Tambahkan [(kolom, operator, nilai), ...] ke syarat/param; kolom_sql memvalidasi nama kolom"""
+        for atribut, op, nilai in filter or []:
+            kolom, op = kolom_sql(atribut), op.lower()
+            if op not in OPERATOR_FILTER: raise ValueError(f"Operator tidak dikenal: {op}")
+            if op == 'in':
+                syarat.append(f"{kolom} IN ({', '.join('?' * len(nilai))})")
+                param += list(nilai)
+            elif op == 'between':
+                syarat.append(f"{kolom} BETWEEN ? AND ?")
+                param += list(nilai)
+            else:
+                syarat.append(f"{kolom} {op.upper()} ?")
+                param.append(nilai)
+
+    def cari_aset_teknis(self, jenis=None, filter=None, kolom=None, urut=None, batas=None):
+        """Aset menurut atribut teknis, difilter di SQL lewat index (jenis_aset, dim_*).
+        Contoh: cari_aset_teknis('Bendung', [('lebar', '>', 20)], urut='-lebar')"""
+        kolom = kolom or ['id', 'kode_aset', 'nama_aset', 'jenis_aset'] + list(ATRIBUT_TEKNIS)
+        pilih = ", ".join(f"{self._kolom_teknis(k)} AS {k}" for k in kolom)
+        where, param = self._where_teknis(jenis, filter)
+        sql = f"SELECT {pilih} FROM master_aset{where}"
+        if urut:
+            sql += f" ORDER BY {self._kolom_teknis(urut.lstrip('-'))}{' DESC' if urut.startswith('-') else ''}"
+        if batas:
+            sql += " LIMIT ?"
+            param.append(int(batas))
+        with self._baca() as conn:
+            return pd.read_sql(sql, conn, params=param)
+
+    def agregat_teknis(self, atribut, fungsi='sum', per='jenis_aset', jenis=None, filter=None):
+        """Agregat atribut teknis per kelompok dihitung SQLite dari index (jenis_aset, dim_<atribut>).
+        Contoh: agregat_teknis('panjang', 'sum') -> total panjang saluran/tanggul per jenis"""
+        fungsi = fungsi.lower()
+        if fungsi not in FUNGSI_AGREGAT: raise ValueError(f"Fungsi agregat tidak dikenal: {fungsi}")
+        kolom, kelompok = self._kolom_teknis(atribut), self._kolom_teknis(per) if per else None
+        where, param = self._where_teknis(jenis, filter)
+        pilih = f"COUNT(*) AS jumlah_aset, {fungsi.upper()}({kolom}) AS {fungsi}_{atribut}"
+        # Planner (SQLite 3.40) bisa memilih index dim_* lain lalu menghitung ulang json_extract tiap
+        # baris; index (jenis_aset, dim_<atribut>) sudah memuat semua yang dibutuhkan -> dipaksa
+        sumber = f"master_aset INDEXED BY idx_dim_{atribut}" if atribut in ATRIBUT_TEKNIS and per in ('jenis_aset', None) \
+            else "master_aset"
+        if kelompok:
+            sql = f"SELECT {kelompok} AS {per}, {pilih} FROM {sumber}{where} GROUP BY {kelompok} ORDER BY {kelompok}"
+        else:
+            sql = f"SELECT {pilih} FROM {sumber}{where}"
+        with self._baca() as conn:
+            return pd.read_sql(sql, conn, params=param)
+
+    # --- HALAMAN DATA (GRID) ---
+    def _kolom_tabel(self, tabel):
+        """Daftar kolom (termasuk generated) tabel data, di-cache per objek; tabel di luar TABEL_DATA ditolak"""
+        if tabel not in TABEL_DATA: raise ValueError(f"Tabel tidak dikenal: {tabel}")
+        if tabel not in self._skema:
+            with self._baca() as conn:
+                self._skema[tabel] = [r[1] for r in conn.execute(f"PRAGMA table_xinfo({tabel})")]
+        return self._skema[tabel]
+
+    def _kolom_valid(self, tabel):
+        kolom = self._kolom_tabel(tabel)
+        def cek(nama):
+            if nama not in kolom: raise ValueError(f"Kolom tidak dikenal di {tabel}: {nama}")
+            return nama
+        return cek
+
+    def hitung_baris(self, tabel, filter=None):
+        """COUNT(*) tabel + filter, di-cache sampai versi tabel berubah"""
+        syarat, param = [], []
+        self._syarat_filter(filter, self._kolom_valid(tabel), syarat, param)
+        kunci = (tabel, repr(filter))
+        self._cek_perubahan_luar()
+        versi = self._versi[tabel]
+        isi = self._cache_jumlah.get(kunci)
+        if isi and isi[0] == versi: return isi[1]
+        where = (" WHERE " + " AND ".join(syarat)) if syarat else ""
+        menulis = self._menulis
+        with self._baca() as conn:
+            jumlah = conn.execute(f"SELECT COUNT(*) FROM {tabel}{where}", param).fetchone()[0]
+        if len(self._cache_jumlah) > 256: self._cache_jumlah.clear()
+        if not menulis and not self._menulis and versi == self._versi[tabel]:
+            self._cache_jumlah[kunci] = (versi, jumlah)
+        return jumlah
+
+    def get_halaman(self, tabel, kolom=None, filter=None, urut='id', turun=False, setelah=None, batas=50):
+        """Satu halaman tabel dengan keyset pagination (bukan OFFSET): urut (kolom, id), `setelah` =
+        kursor (nilai_urut, id) baris terakhir halaman sebelumnya. Return dict data (DataFrame),
+        berikut (kursor halaman berikut / None) dan total (COUNT ter-cache)."""
+        cek = self._kolom_valid(tabel)
+        kolom = [cek(k) for k in (kolom or self._kolom_tabel(tabel))]
+        urut = cek(urut)
+        syarat, param = [], []
+        self._syarat_filter(filter, cek, syarat, param)
+        if setelah is not None:
+            nilai, id_terakhir = setelah
+            b = '<' if turun else '>'
+            if urut == 'id':
+                syarat.append(f"id {b} ?")
+                param.append(id_terakhir)
+            elif nilai is None:
+                # NULL berada paling awal saat naik, paling akhir saat turun
+                syarat.append(f"(({urut} IS NULL AND id {b} ?)" + ("" if turun else f" OR {urut} IS NOT NULL") + ")")
+                param.append(id_terakhir)
+            else:
+                syarat.append(f"({urut} {b} ? OR ({urut} = ? AND id {b} ?)" + (f" OR {urut} IS NULL" if turun else "") + ")")
+                param += [nilai, nilai, id_terakhir]
+        arah = " DESC" if turun else ""
+        pilih = list(dict.fromkeys(kolom + [urut, 'id']))
+        sql = (f"SELECT {', '.join(pilih)} FROM {tabel}" + ((" WHERE " + " AND ".join(syarat)) if syarat else "") +
+               f" ORDER BY {urut}{arah}" + (f", id{arah}" if urut != 'id' else "") + " LIMIT ?")
+        with self._baca() as conn:
+            df = pd.read_sql(sql, conn, params=param + [batas + 1])
+        berikut = None
+        if len(df) > batas:
+            df = df.iloc[:batas]
+            nilai = df[urut].iloc[-1]
+            berikut = (None if pd.isna(nilai) else getattr(nilai, 'item', lambda: nilai)(), int(df['id'].iloc[-1]))
+        return {'data': df[kolom], 'berikut': berikut, 'total': self.hitung_baris(tabel, filter)}
+
+    def cari_aset(self, teks, batas=20):
+        """Cari aset per awalan kata di nama/kode/jenis (FTS5, urut bm25). Teks kosong -> aset pertama."""
+        token = re.findall(r"\w+", teks or "")
+        if not token:
+            return self.get_halaman('master_aset', ['id', 'kode_aset', 'nama_aset', 'jenis_aset'], batas=batas)['data']
+        with self._baca() as conn:
+            return pd.read_sql('''
+                SELECT m.id, m.kode_aset, m.nama_aset, m.jenis_aset FROM master_aset_fts f
+                JOIN master_aset m ON m.id = f.rowid
+                WHERE master_aset_fts MATCH ? ORDER BY f.rank LIMIT ?''', conn,
+                params=[" ".join(f'"{t}"*' for t in token), batas])
+
+    # --- RIWAYAT KONDISI & PREDIKSI KEMEROSOTAN ---
+    def _segarkan_ringkasan(self, cur, aset_id=None, ukuran_batch=20_000, maks_potongan=None):
+        """Hitung ulang ringkasan aset di ringkasan_antri (atau hanya `aset_id` jika antri) per potongan
+        aset_id (paling banyak `maks_potongan` potongan), di transaksi `cur`"""
+        jumlah = potongan = 0
+        setelah, sampai = (-1, 2 ** 63 - 1) if aset_id is None else (aset_id - 1, aset_id)
+        while maks_potongan is None or potongan < maks_potongan:
+            potongan += 1
+            batas = cur.execute('''SELECT MAX(aset_id), COUNT(*) FROM (SELECT aset_id FROM ringkasan_antri
+                WHERE aset_id > ? AND aset_id <= ? ORDER BY aset_id LIMIT ?)''', (setelah, sampai, ukuran_batch)).fetchone()
+            if not batas[1]: return jumlah
+            df = pd.read_sql(f'''
+                SELECT i.aset_id, {TAHUN_DESIMAL.format('i.tanggal_inspeksi')} AS tahun,
+                       {', '.join(f'i.{k}' for k in KOLOM_NILAI_INSPEKSI)}, m.tahun_bangun, m.tahun_rehab_terakhir
+                FROM ringkasan_antri q
+                JOIN master_aset m ON m.id = q.aset_id
+                JOIN inspeksi_aset i ON i.aset_id = q.aset_id
+                WHERE q.aset_id > ? AND q.aset_id <= ? AND julianday(i.tanggal_inspeksi) IS NOT NULL
+                ORDER BY i.aset_id, i.tanggal_inspeksi, i.id''', self.conn, params=[setelah, batas[0]])
+            ringkasan = hitung_ringkasan(df, self.parameter)
+
+            # Aset antri yang tidak lagi punya inspeksi (atau sudah dihapus) ikut terbuang dari ringkasan
+            cur.execute('''DELETE FROM ringkasan_kondisi WHERE aset_id IN
+                (SELECT aset_id FROM ringkasan_antri WHERE aset_id > ? AND aset_id <= ?)''', (setelah, batas[0]))
+            cur.executemany(f'''INSERT INTO ringkasan_kondisi ({', '.join(KOLOM_RINGKASAN)})
+                VALUES ({', '.join('?' * len(KOLOM_RINGKASAN))})''',
+                zip(*(_ke_python(ringkasan[k].to_numpy(dtype=float, na_value=np.nan)) for k in KOLOM_RINGKASAN)))
+            cur.execute("DELETE FROM ringkasan_antri WHERE aset_id > ? AND aset_id <= ?", (setelah, batas[0]))
+            jumlah += len(ringkasan)
+            setelah = batas[0]
+        return jumlah
+
+    def segarkan_ringkasan(self, semua=False):
+        """Perbarui ringkasan_kondisi untuk aset yang riwayatnya berubah (semua=True: hitung ulang semua)"""
+        try:
+            t0 = time.perf_counter()
+            with self._tulis('ringkasan_kondisi') as cur:
+                if semua:
+                    cur.execute("DELETE FROM ringkasan_kondisi")
+                    cur.execute("INSERT OR IGNORE INTO ringkasan_antri SELECT DISTINCT aset_id FROM inspeksi_aset WHERE aset_id IS NOT NULL")
+                jumlah = self._segarkan_ringkasan(cur)
+            return f"✅ Ringkasan Kondisi: {jumlah:,} aset dihitung ulang dalam {time.perf_counter() - t0:.1f} s"
+        except Exception as e: return f"❌ Gagal Menyegarkan Ringkasan: {e}"
+
+    def _jadwalkan_ringkasan(self):
+        # Dipanggil _tulis (di bawah _kunci_tulis) setelah master/inspeksi berubah; thread dibuat saat perlu
+        if self._sinyal_ringkasan is None:
+            self._sinyal_ringkasan = threading.Event()
+            threading.Thread(target=_penyegar_ringkasan, args=(weakref.ref(self), self._sinyal_ringkasan),
+                             daemon=True).start()
+        self._sinyal_ringkasan.set()
+
+    def _segarkan_latar(self):
+        """Kosongkan ringkasan_antri, satu potongan aset per transaksi: penulisan lain (mis. form inspeksi)
+        tidak menunggu seluruh antrian selesai setelah impor massal"""
+        try:
+            while self._tutup.alive:
+                with self._baca() as conn:
+                    if not conn.execute("SELECT EXISTS (SELECT 1 FROM ringkasan_antri)").fetchone()[0]: return
+                with self._tulis('ringkasan_kondisi') as cur: self._segarkan_ringkasan(cur, maks_potongan=1)
+        except Exception as e:
+            if self._tutup.alive: self._catat_galat(e)
+
+    def get_ringkasan_kondisi(self, urut='tahun_mendesak', batas=None):
+        """Ringkasan kondisi per aset + nama/jenis, diurutkan menurut `urut` (tahun prediksi kosong di
+        belakang). Hanya membaca: aset yang baru berubah lewat impor/sinkron massal menyusul setelah thread
+        latar selesai (segarkan_ringkasan() untuk menunggu)."""
+        if urut not in KOLOM_RINGKASAN: raise ValueError(f"Kolom tidak dikenal: {urut}")
+        with self._baca() as conn:
+            return pd.read_sql(f'''
+                SELECT r.aset_id, m.kode_aset, m.nama_aset, m.jenis_aset, {', '.join(f'r.{k}' for k in KOLOM_RINGKASAN[1:])}
+                FROM ringkasan_kondisi r JOIN master_aset m ON m.id = r.aset_id
+                ORDER BY r.{urut} IS NULL, r.{urut}, r.skor_terakhir DESC LIMIT ?''', conn,
+                params=[-1 if batas is None else batas])
+
+    def get_riwayat_aset(self, aset_id):
+        """(riwayat inspeksi satu aset: tahun, kondisi, fungsi, skor; baris ringkasannya atau None).
+        Hanya membaca, ringkasan diperbarui oleh penulisan (lihat get_ringkasan_kondisi)."""
+        with self._baca() as conn:
+            df = pd.read_sql(f'''SELECT tanggal_inspeksi, {TAHUN_DESIMAL.format('tanggal_inspeksi')} AS tahun,
+                    {', '.join(KOLOM_NILAI_INSPEKSI)} FROM inspeksi_aset
+                WHERE aset_id = ? ORDER BY tanggal_inspeksi, id''', conn, params=[aset_id])
+            ringkasan = pd.read_sql("SELECT * FROM ringkasan_kondisi WHERE aset_id = ?", conn, params=[aset_id])
+        if not df.empty:
+            df['Skor_Prioritas'] = hitung_skor_urgensi(df)
+        return df, (ringkasan.iloc[0] if len(ringkasan) else None)
+
     # --- MESIN PRIORITAS ---
     def get_prioritas_matematis(self):
-        query = '''
-            SELECT m.nama_aset, m.jenis_aset, m.luas_layanan_desain, m.nilai_aset_baru,
-                   i.kondisi_sipil, i.kondisi_me, i.nilai_fungsi_sipil, i.nilai_fungsi_me, 
-                   i.luas_terdampak_aktual, i.estimasi_biaya
+        """Frame prioritas (di-cache sampai master/inspeksi berubah, jangan diubah in-place)"""
+        try:
+            return self._dari_cache('prioritas', self._hitung_prioritas)
+        except Exception as e:
+            self._catat_galat(e)
+            return pd.DataFrame() # Return kosong jika error (galat tetap tercatat di pelacak)
+
+    def _hitung_prioritas(self):
+        # Hanya inspeksi terakhir per aset_id (view latest_inspeksi + index komposit)
+        query = f'''
+            SELECT {KOLOM_PRIORITAS}
             FROM master_aset m
-            JOIN inspeksi_aset i ON m.id = i.aset_id
-            ORDER BY i.tanggal_inspeksi DESC
+            JOIN latest_inspeksi i ON m.id = i.aset_id
         '''
-        try:
-            df = pd.read_sql(query, self.conn)
-            df = df.drop_duplicates(subset=['nama_aset'])
-            
-            if df.empty: return df
-
-            def hitung_skor_urgensi(row):
-                K = min(row['kondisi_sipil'], row['kondisi_me']) 
-                F = min(row['nilai_fungsi_sipil'], row['nilai_fungsi_me'])
-                A_as = row['luas_terdampak_aktual']
-                Impact_Factor = math.log10(A_as + 1) if A_as > 0 else 0
-                
-                Kerusakan_Fisik = (100 - K) * 0.4
-                Kegagalan_Fungsi = (100 - F) * 1.5 * 0.6
-                
-                return (Kerusakan_Fisik + Kegagalan_Fungsi) * Impact_Factor
-
-            df['Skor_Prioritas'] = df.apply(hitung_skor_urgensi, axis=1)
-            
-            def label_prioritas(skor):
-                if skor > 200: return "1. DARURAT (Segera)"
-                if skor > 100: return "2. MENDESAK (Thn Depan)"
-                if skor > 50: return "3. PERLU PERHATIAN"
-                return "4. RUTIN"
-                
-            df['Kelas_Prioritas'] = df['Skor_Prioritas'].apply(label_prioritas)
-            return df.sort_values(by='Skor_Prioritas', ascending=False)
-        except:
-            return pd.DataFrame() # Return kosong jika error
+        with self._baca() as conn:
+            df = pd.read_sql(query, conn)
+        
+        if df.empty: return df
+
+        # Skor & kelas dihitung per kolom (NumPy), lihat modules/prioritas.py
+        return hitung_prioritas(df, self.parameter)
+
+    def _update_prioritas(self, df, aset_id):
+        # Hitung ulang baris 1 aset (seek index) lalu sisipkan di posisi urut skornya. Frame lama tidak
+        # diubah (masih bisa dipegang pembaca); None = buang cache, hitung ulang penuh
+        if df.empty: return None
+        aset_id = int(aset_id)
+        baris = pd.read_sql(f'''
+            SELECT {KOLOM_PRIORITAS}
+            FROM master_aset m JOIN inspeksi_aset i ON i.aset_id = m.id
+            WHERE m.id = ?
+            ORDER BY i.tanggal_inspeksi DESC, i.id DESC LIMIT 1''', self.conn, params=[aset_id])
+        sama = df['aset_id'].to_numpy() == aset_id
+        lain = df[~sama]
+        if baris.empty: return lain
+        try: baris = hitung_prioritas(baris, self.parameter).astype(df.dtypes.to_dict())
+        except (TypeError, ValueError): return None
+        # Skor urut menurun, NaN di belakang (sama dengan sort_values) -> -skor urut naik
+        posisi = int(np.searchsorted(-lain['Skor_Prioritas'].to_numpy(), -baris['Skor_Prioritas'].iloc[0], side='right'))
+        baris.index = df.index[sama][:1] if sama.any() else [df.index.max() + 1]
+        return pd.concat([lain.iloc[:posisi], baris, lain.iloc[posisi:]])
+
+    def rencana_penanganan(self, anggaran, bawa_sisa=False):
+        """Paket penanganan dengan manfaat (skor x luas terdampak) maksimum di bawah pagu tahunan.
+        `anggaran` = satu pagu atau daftar pagu per tahun; lihat modules/anggaran.py.
+        Kembalikan (aset terpilih + tahun_ke, ringkasan per tahun)."""
+        daftar = [anggaran] if np.isscalar(anggaran) else list(anggaran)
+        if not daftar or any(not a > 0 for a in daftar): raise ValueError("Anggaran harus > 0")
+        prioritas = self.get_prioritas_matematis()
+        if prioritas.empty: return prioritas, pd.DataFrame()
+        return rencana_anggaran(prioritas, daftar, bawa_sisa=bawa_sisa)
 
     # --- HITUNG IKSI ---
-    def hitung_iksi_lengkap(self):
+    def _agregat_fisik(self):
+        return self._dari_cache('fisik', self._hitung_agregat_fisik)
+
+    def _hitung_agregat_fisik(self):
+        """Kontribusi (nilai_gabungan x luas, luas) per aset_id + jumlahnya, dari inspeksi terakhir"""
         prioritas = self.get_prioritas_matematis()
-        skor_fisik = 0
+        kontribusi = {}
         if not prioritas.empty:
-            total_area = prioritas['luas_terdampak_aktual'].sum()
-            if total_area > 0:
-                prioritas['nilai_gabungan'] = (prioritas[['kondisi_sipil', 'kondisi_me']].min(axis=1) + 
-                                             prioritas[['nilai_fungsi_sipil', 'nilai_fungsi_me']].min(axis=1)) / 2
-                skor_fisik = (prioritas['nilai_gabungan'] * prioritas['luas_terdampak_aktual']).sum() / total_area
-            else:
-                skor_fisik = 60
+            nilai_gabungan = (prioritas[['kondisi_sipil', 'kondisi_me']].min(axis=1) +
+                              prioritas[['nilai_fungsi_sipil', 'nilai_fungsi_me']].min(axis=1)) / 2
+            luas = prioritas['luas_terdampak_aktual']
+            kontribusi = dict(zip(prioritas['aset_id'].tolist(),
+                                  zip((nilai_gabungan * luas).fillna(0).tolist(), luas.fillna(0).tolist())))
+        return {
+            'kontribusi': kontribusi,
+            'total_gl': sum(gl for gl, _ in kontribusi.values()),
+            'total_area': sum(l for _, l in kontribusi.values()),
+        }
+
+    def _update_fisik(self, agg, aset_id):
+        # Baca ulang inspeksi terakhir 1 aset (seek index) dan ganti kontribusinya saja
+        terakhir = self.conn.execute('''
+            SELECT i.kondisi_sipil, i.kondisi_me, i.nilai_fungsi_sipil, i.nilai_fungsi_me, i.luas_terdampak_aktual
+            FROM master_aset m JOIN inspeksi_aset i ON i.aset_id = m.id
+            WHERE m.id = ?
+            ORDER BY i.tanggal_inspeksi DESC, i.id DESC LIMIT 1''', (aset_id,)).fetchone()
+        if terakhir is None: return agg
+
+        kontribusi = _kontribusi_fisik(*terakhir)
+        gl_lama, l_lama = agg['kontribusi'].get(aset_id, (0.0, 0.0))
+        # Semua dict baru: agregat lama tetap utuh untuk pembaca yang masih memegangnya
+        return {
+            'kontribusi': {**agg['kontribusi'], aset_id: kontribusi},
+            'total_gl': agg['total_gl'] + kontribusi[0] - gl_lama,
+            'total_area': agg['total_area'] + kontribusi[1] - l_lama,
+        }
+
+    def _agregat_tanam(self):
+        return self._dari_cache('tanam', self._hitung_agregat_tanam)
+
+    def _hitung_agregat_tanam(self):
+        with self._baca() as conn:
+            fk = pd.read_sql("SELECT faktor_k FROM data_tanam", conn)['faktor_k']
+        return {'total_nk': float(nilai_tanam(fk, self.parameter).sum()), 'jumlah': len(fk)}
 
-        df_tanam = pd.read_sql("SELECT * FROM data_tanam", self.conn)
+    def atur_parameter(self, parameter=None, ringkasan=True):
+        """Ganti parameter penilaian aktif (None = bawaan). Cache prioritas & IKSI dibatalkan lewat versi tabel.
+        Jika parameter berganti & ringkasan=True, ringkasan_kondisi (skor & tahun prediksi) semua aset diantrikan
+        ulang lalu dihitung thread latar; proses worker yang hanya membaca memakai ringkasan=False."""
+        parameter = parameter or PARAMETER_BAWAAN
+        with self._kunci_tulis:
+            berubah = parameter is not self.parameter
+            self.parameter = parameter
+            self._naikkan_versi('master_aset', 'inspeksi_aset', 'data_tanam')
+            if not (ringkasan and berubah): return
+            with self._tulis('ringkasan_kondisi') as cur:
+                cur.execute("INSERT OR IGNORE INTO ringkasan_antri SELECT DISTINCT aset_id FROM inspeksi_aset WHERE aset_id IS NOT NULL")
+            self._jadwalkan_ringkasan()
+
+    def hitung_iksi_lengkap(self):
+        # Komponen dibaca dari agregat ter-cache -> O(1) jika data tidak berubah
+        fisik = self._agregat_fisik()
+        skor_f = skor_fisik(fisik['total_gl'], fisik['total_area'], bool(fisik['kontribusi']), self.parameter)
+
+        tanam = self._agregat_tanam()
         skor_tanam = 0
-        if not df_tanam.empty:
-            def calc_tanam(r):
-                nk = 100 if r['faktor_k'] >= 1 else (80 if r['faktor_k']>=0.7 else 60)
-                return nk
-            skor_tanam = df_tanam.apply(calc_tanam, axis=1).mean()
-
-        skor_sarana = 60 
-        skor_sdm = 60
-        skor_dok = 60
-        skor_p3a = 60
-        
-        total_iksi = (skor_fisik * 0.45) + (skor_tanam * 0.15) + (skor_sarana * 0.10) + \
-                     (skor_sdm * 0.15) + (skor_dok * 0.05) + (skor_p3a * 0.10)
-        
-        return total_iksi, skor_fisik, skor_tanam
+        if tanam['jumlah']:
+            skor_tanam = tanam['total_nk'] / tanam['jumlah']
+
+        total_iksi = gabung_iksi(skor_f, skor_tanam, self.parameter)
+        return total_iksi, skor_f, skor_tanam
+
+    def agregat_iksi(self, top=20):
+        """Agregat parsial DI ini yang bisa dijumlahkan antar DI (rekap provinsi, modules/wilayah.py):
+        jumlah nilai x luas & luas (fisik), jumlah nilai tanam, jumlah aset & biaya per kelas prioritas,
+        dan `top` aset prioritas teratas. Tidak membawa baris mentah."""
+        fisik, tanam = self._agregat_fisik(), self._agregat_tanam()
+        prioritas = self.get_prioritas_matematis()
+        kelas, biaya, teratas = {}, {}, []
+        if not prioritas.empty:
+            per_kelas = prioritas.groupby('Kelas_Prioritas')['estimasi_biaya']
+            kelas, biaya = per_kelas.size().to_dict(), per_kelas.sum().to_dict()
+            teratas = prioritas.head(top)[['aset_id', 'nama_aset', 'jenis_aset', 'Skor_Prioritas', 'Kelas_Prioritas',
+                                           'estimasi_biaya']].to_dict('records')
+        return {'total_gl': fisik['total_gl'], 'total_area': fisik['total_area'], 'jumlah_fisik': len(fisik['kontribusi']),
+                'total_nk': tanam['total_nk'], 'jumlah_tanam': tanam['jumlah'],
+                'kelas': kelas, 'biaya_kelas': biaya, 'top': teratas}
+
+    # --- ANALISIS SKENARIO PARAMETER ---
+    def data_skenario(self):
+        """Data yang dipakai semua skenario, dimuat sekali: K, F, A per aset (inspeksi terakhir),
+        agregat fisik, faktor K tanam (lihat modules/skenario.py)"""
+        prioritas = self.get_prioritas_matematis()
+        fisik = self._agregat_fisik()
+        with self._baca() as conn:
+            fk = pd.read_sql("SELECT faktor_k FROM data_tanam", conn)['faktor_k']
+        data = {'aset_id': np.zeros(0, dtype=np.int64), 'K': np.zeros(0), 'F': np.zeros(0), 'A': np.zeros(0)}
+        if not prioritas.empty:
+            kolom = lambda k: pd.to_numeric(prioritas[k], errors='coerce').to_numpy(dtype=float)
+            data = {'aset_id': prioritas['aset_id'].to_numpy(),
+                    'K': _min_pasangan(kolom('kondisi_sipil'), kolom('kondisi_me')),
+                    'F': _min_pasangan(kolom('nilai_fungsi_sipil'), kolom('nilai_fungsi_me')),
+                    'A': kolom('luas_terdampak_aktual')}
+        return {**data, 'total_gl': fisik['total_gl'], 'total_area': fisik['total_area'],
+                'ada_fisik': bool(fisik['kontribusi']), 'faktor_k': pd.to_numeric(fk, errors='coerce').to_numpy(dtype=float)}
+
+    def analisis_sensitivitas(self, daftar_parameter, top=10):
+        """IKSI & peringkat prioritas untuk banyak set parameter dalam satu lintasan vektor (tanpa query
+        ulang per skenario), dibandingkan dengan parameter aktif. Lihat grid_parameter untuk membuat daftar."""
+        return evaluasi_skenario(self.data_skenario(), daftar_parameter, acuan=self.parameter, top=top)
 
     # --- UTILS LAINNYA ---
     def hapus_semua_data(self):
-        for t in ['master_aset','inspeksi_aset','data_tanam','data_p3a','data_sdm_sarana','data_dokumentasi']:
-            try:
-                self.cursor.execute(f"DELETE FROM {t}")
-                self.cursor.execute(f"DELETE FROM sqlite_sequence WHERE name='{t}'")
-            except: pass
-        self.conn.commit()
-        return "✅ Database Bersih"
+        # Semua tabel dijamin ada oleh MIGRASI: DELETE yang gagal = galat sungguhan -> rollback semua
+        try:
+            with self._tulis() as cur:
+                for t in TABEL_DATA + TABEL_GEOMETRI + TABEL_RINGKASAN: cur.execute(f"DELETE FROM {t}")
+                cur.execute(f"DELETE FROM sqlite_sequence WHERE name IN ({','.join('?' * len(TABEL_DATA))})", TABEL_DATA)
+                self._log_sinkron_ulang(cur)
+            return "✅ Database Bersih"
+        except Exception as e: return f"❌ Gagal Reset: {e}"
         
-    def get_master_aset(self): return pd.read_sql("SELECT * FROM master_aset", self.conn)
-    def get_table_data(self, t): return pd.read_sql(f"SELECT * FROM {t}", self.conn)
+    def get_master_aset(self):
+        with self._baca() as conn: return pd.read_sql("SELECT * FROM master_aset", conn)
+    def get_table_data(self, t):
+        if t not in TABEL_DATA: raise ValueError(f"Tabel tidak dikenal: {t}")
+        with self._baca() as conn: return pd.read_sql(f"SELECT * FROM {t}", conn)
     def tambah_data_tanam_lengkap(self, m, lr, lrl, qa, qb, pd, pl):
         fk = qa/qb if qb>0 else 0
-        self.cursor.execute("INSERT INTO data_tanam VALUES (NULL,?,?,?,?,?,?,?,?)", (m,lr,lrl,qa,qb,round(fk,2),pd,pl)); self.conn.commit(); return "✅ OK"
-    def tambah_data_p3a(self, nm, ds, st, akt, ang): self.cursor.execute("INSERT INTO data_p3a VALUES (NULL,?,?,?,?,?)", (nm,ds,st,akt,ang)); self.conn.commit(); return "✅ OK"
-    def tambah_sdm_sarana(self, jns, nm, cond, ket): self.cursor.execute("INSERT INTO data_sdm_sarana VALUES (NULL,?,?,?,?)", (jns,nm,cond,ket)); self.conn.commit(); return "✅ OK"
+        nk = float(nilai_tanam(round(fk,2), self.parameter))
+        with self._tulis('data_tanam', tanam=lambda agg: {'total_nk': agg['total_nk'] + nk, 'jumlah': agg['jumlah'] + 1}) as cur:
+            cur.execute("INSERT INTO data_tanam VALUES (NULL,?,?,?,?,?,?,?,?)", (m,lr,lrl,qa,qb,round(fk,2),pd,pl))
+        return "✅ OK"
+    def tambah_data_p3a(self, nm, ds, st, akt, ang):
+        with self._tulis('data_p3a') as cur: cur.execute("INSERT INTO data_p3a VALUES (NULL,?,?,?,?,?)", (nm,ds,st,akt,ang))
+        return "✅ OK"
+    def tambah_sdm_sarana(self, jns, nm, cond, ket):
+        with self._tulis('data_sdm_sarana') as cur: cur.execute("INSERT INTO data_sdm_sarana VALUES (NULL,?,?,?,?)", (jns,nm,cond,ket))
+        return "✅ OK"
     def update_dokumentasi(self, d):
-        self.cursor.execute("DELETE FROM data_dokumentasi"); [self.cursor.execute("INSERT INTO data_dokumentasi VALUES (?,?)", (k,1 if v else 0)) for k,v in d.items()]; self.conn.commit(); return "✅ OK"
+        with self._tulis('data_dokumentasi') as cur:
+            cur.execute("DELETE FROM data_dokumentasi"); [cur.execute("INSERT INTO data_dokumentasi VALUES (?,?)", (k,1 if v else 0)) for k,v in d.items()]
+        return "✅ OK"
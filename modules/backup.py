@@ -0,0 +1,107 @@
+import codecs
+import gzip
+import json
+
+UKURAN_BACA = 1 << 16
+_SPASI = ' \t\r\n'
+_DEKODER = json.JSONDecoder()
+
+
+class _Teks:
+    """Buffer teks yang diisi bertahap dari file backup (biner/teks, polos/gzip)"""
+    def __init__(self, f):
+        f.seek(0)
+        awal = f.read(2)
+        f.seek(0)
+        if isinstance(awal, str):
+            self._baca = f.read
+        else:
+            if awal == b'\x1f\x8b':  # magic byte gzip (.json.gz dari export_ke_file)
+                f = gzip.GzipFile(fileobj=f)
+            dekoder = codecs.getincrementaldecoder('utf-8-sig')()
+            def baca(n):
+                while True:
+                    data = f.read(n)
+                    teks = dekoder.decode(data, final=not data)
+                    if teks or not data: return teks
+            self._baca = baca
+        self.buf = ''
+        self.pos = 0
+
+    def isi(self):
+        """Tambah isi buffer; False jika file sudah habis"""
+        potongan = self._baca(UKURAN_BACA)
+        if not potongan: return False
+        self.buf = self.buf[self.pos:] + potongan
+        self.pos = 0
+        return True
+
+    def lihat(self):
+        """Karakter non-spasi berikutnya (tidak dikonsumsi), '' jika habis"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _SPASI: self.pos += 1
+            if self.pos < len(self.buf): return self.buf[self.pos]
+            if not self.isi(): return ''
+
+    def harap(self, karakter):
+        c = self.lihat()
+        if c != karakter:
+            raise ValueError(f"Format backup tidak dikenal: harap '{karakter}', dapat '{c or 'akhir file'}'")
+        self.pos += 1
+
+    def nilai(self):
+        """Satu objek/string JSON utuh; buffer ditambah sampai nilainya lengkap"""
+        self.lihat()
+        while True:
+            try:
+                nilai, self.pos = _DEKODER.raw_decode(self.buf, self.pos)
+                return nilai
+            except json.JSONDecodeError:
+                if not self.isi(): raise
+
+    def baris(self):
+        while True:
+            ujung = self.buf.find('\n', self.pos)
+            if ujung < 0:
+                if self.isi(): continue
+                if self.buf[self.pos:].strip(): yield self.buf[self.pos:]
+                return
+            yield self.buf[self.pos:ujung]
+            self.pos = ujung + 1
+
+
+def baca_backup(f):
+    """Urai backup secara streaming: hasil (tabel, record) satu per satu, memori tetap kecil.
+    Menerima kedua format export_stream: JSON {tabel: [record, ...]} dan JSON Lines
+    {"tabel": ..., "data": {...}}, polos maupun gzip. File harus bisa di-seek."""
+    teks = _Teks(f)
+    teks.harap('{')
+    if teks.lihat() == '}': return
+    kunci = teks.nilai()
+    teks.harap(':')
+
+    # JSON Lines: kunci pertama "tabel" berisi string (bukan daftar record)
+    if kunci == 'tabel' and teks.lihat() != '[':
+        for baris in _Teks(f).baris():
+            if not baris.strip(): continue
+            r = json.loads(baris)
+            yield r['tabel'], r['data']
+        return
+
+    while True:
+        if not isinstance(kunci, str) or teks.lihat() != '[':
+            raise ValueError(f"Format backup tidak dikenal: isi '{kunci}' bukan daftar record")
+        teks.harap('[')
+        if teks.lihat() == ']':
+            teks.pos += 1
+        else:
+            while True:
+                yield kunci, teks.nilai()
+                if teks.lihat() != ',': break
+                teks.pos += 1
+            teks.harap(']')
+        if teks.lihat() != ',': break
+        teks.pos += 1
+        kunci = teks.nilai()
+        teks.harap(':')
+    teks.harap('}')
@@ -0,0 +1,231 @@
+import atexit
+import hashlib
+import mmap
+import multiprocessing as mp
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+# Tanda awal file -> MIME; selain ini bukan foto dan ditolak
+TANDA_FOTO = [(b'\xff\xd8\xff', 'image/jpeg'), (b'\x89PNG\r\n\x1a\n', 'image/png'), (b'RIFF', 'image/webp'),
+              (b'GIF8', 'image/gif')]
+UKURAN_POTONGAN = 1 << 20
+
+
+def jenis_foto(kepala):
+    for tanda, mime in TANDA_FOTO:
+        if kepala.startswith(tanda) and (mime != 'image/webp' or kepala[8:12] == b'WEBP'): return mime
+    return None
+
+
+# --- SISI PROSES WORKER ---
+def buat_thumbnail(asli, tujuan, sisi=320, kualitas=80):
+    """Thumbnail JPEG (sisi terpanjang `sisi` px) dari file foto `asli`, ditulis atomik ke `tujuan`.
+    JPEG didekode langsung di skala kecil (draft), orientasi EXIF diterapkan."""
+    from PIL import Image, ImageOps
+    with Image.open(asli) as im:
+        im.draft('RGB', (sisi, sisi))
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((sisi, sisi))
+        if im.mode != 'RGB': im = im.convert('RGB')
+        sementara = f"{tujuan}.{os.getpid()}.tmp"
+        im.save(sementara, 'JPEG', quality=kualitas, optimize=True)
+    os.replace(sementara, tujuan)
+    return tujuan
+
+
+# --- SISI PROSES UTAMA ---
+class GudangFoto:
+    """Foto bukti inspeksi di disk, dialamatkan dengan hash isi (SHA-256): foto yang sama diunggah
+    berkali-kali hanya disimpan sekali, database cukup menyimpan hash-nya (inspeksi_aset.foto_bukti).
+
+    File ada di `folder`/objek/ab/<hash>, thumbnail di `folder`/thumb/ab/<hash>_<sisi>.jpg dibuat di
+    ProcessPoolExecutor begitu foto baru disimpan. Thumbnail yang diminta disimpan di cache LRU memori
+    (maksimal `maks_cache_byte`); foto asli dibaca lewat mmap, bukan dimuat ulang ke memori tiap rerun."""
+
+    def __init__(self, folder, sisi_thumb=320, maks_proses=None, maks_cache_byte=32 << 20):
+        self.folder = folder
+        for sub in ('objek', 'thumb', 'tmp'): os.makedirs(os.path.join(folder, sub), exist_ok=True)
+        self.sisi_thumb = sisi_thumb
+        self._maks_proses = maks_proses or min(4, os.cpu_count() or 1)
+        self._maks_cache = maks_cache_byte
+        self._cache = OrderedDict()   # hash -> bytes thumbnail
+        self._ukuran_cache = 0
+        self._proses = {}             # hash -> future thumbnail yang sedang dibuat
+        self._kunci = threading.Lock()
+        self._pool = None
+
+    def _path(self, h):
+        return os.path.join(self.folder, 'objek', h[:2], h)
+
+    def _path_thumb(self, h):
+        return os.path.join(self.folder, 'thumb', h[:2], f"{h}_{self.sisi_thumb}.jpg")
+
+    @staticmethod
+    def _cek_hash(h):
+        if not (isinstance(h, str) and len(h) == 64 and all(c in '0123456789abcdef' for c in h)):
+            raise ValueError(f"Hash foto tidak valid: {h}")
+
+    def ada(self, h):
+        return os.path.exists(self._path(h))
+
+    def _sentuh(self, h):
+        """Foto yang sudah ada dipakai lagi: mtime diperbarui agar sapu() tidak menghapusnya sebelum
+        baris yang merujuknya di-commit. False jika file ternyata sudah tidak ada."""
+        try:
+            os.utime(self._path(h))
+            return True
+        except FileNotFoundError:
+            return False
+
+    # --- SIMPAN ---
+    def simpan(self, sumber):
+        """Simpan foto (bytes, path, atau file-like seperti UploadedFile) -> (hash, baru). Isi
+        di-hash sambil ditulis ke file sementara; jika hash sudah ada, file sementara dibuang."""
+        if isinstance(sumber, (bytes, bytearray, memoryview)):
+            data = bytes(sumber)
+            if not jenis_foto(data[:16]): raise ValueError("File bukan foto (JPEG/PNG/WEBP/GIF)")
+            h = hashlib.sha256(data).hexdigest()
+            if self._sentuh(h): return h, False
+            return h, self._pasang(h, lambda f: f.write(data))
+
+        f = open(sumber, 'rb') if isinstance(sumber, (str, os.PathLike)) else sumber
+        try:
+            if hasattr(f, 'seek'): f.seek(0)
+            kepala = f.read(16)
+            if not jenis_foto(kepala): raise ValueError("File bukan foto (JPEG/PNG/WEBP/GIF)")
+            hasher = hashlib.sha256(kepala)
+
+            def tulis(tujuan):
+                tujuan.write(kepala)
+                while potongan := f.read(UKURAN_POTONGAN):
+                    hasher.update(potongan)
+                    tujuan.write(potongan)
+            fd, sementara = tempfile.mkstemp(dir=os.path.join(self.folder, 'tmp'))
+            try:
+                with os.fdopen(fd, 'wb') as tujuan: tulis(tujuan)
+                h = hasher.hexdigest()
+                if self._sentuh(h): return h, False
+                return h, self._pasang(h, sementara=sementara)
+            finally:
+                if os.path.exists(sementara): os.remove(sementara)
+        finally:
+            if f is not sumber: f.close()
+
+    def _pasang(self, h, tulis=None, sementara=None):
+        """Pindahkan isi ke path objek (atomik) lalu antrikan thumbnail-nya. Return True jika baru."""
+        path = self._path(h)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if sementara is None:
+            fd, sementara = tempfile.mkstemp(dir=os.path.join(self.folder, 'tmp'))
+            try:
+                with os.fdopen(fd, 'wb') as f: tulis(f)
+            except BaseException:
+                os.remove(sementara)
+                raise
+        os.replace(sementara, path)
+        self._antrikan_thumbnail(h)
+        return True
+
+    # --- THUMBNAIL ---
+    def _pool_siap(self):
+        if self._pool is None:
+            # spawn, sama seperti antrian laporan (proses Streamlit punya banyak thread)
+            self._pool = ProcessPoolExecutor(self._maks_proses, mp_context=mp.get_context('spawn'))
+            atexit.register(self.tutup)
+        return self._pool
+
+    def _antrikan_thumbnail(self, h):
+        tujuan = self._path_thumb(h)
+        if os.path.exists(tujuan): return None
+        with self._kunci:
+            futur = self._proses.get(h)
+            if futur is None:
+                os.makedirs(os.path.dirname(tujuan), exist_ok=True)
+                futur = self._proses[h] = self._pool_siap().submit(buat_thumbnail, self._path(h), tujuan, self.sisi_thumb)
+                futur.add_done_callback(lambda _: self._proses.pop(h, None))
+        return futur
+
+    def thumbnail(self, h, tunggu=10):
+        """Bytes JPEG thumbnail foto `h`: dari cache LRU, file thumbnail, atau menunggu worker
+        (maksimal `tunggu` detik). None jika foto tidak ada atau gagal didekode."""
+        self._cek_hash(h)
+        with self._kunci:
+            data = self._cache.get(h)
+            if data is not None:
+                self._cache.move_to_end(h)
+                return data
+        if not self.ada(h): return None
+        tujuan = self._path_thumb(h)
+        if not os.path.exists(tujuan):
+            try:
+                futur = self._antrikan_thumbnail(h)
+                if futur is not None: futur.result(timeout=tunggu)
+            except Exception:
+                return None
+        with open(tujuan, 'rb') as f: data = f.read()
+        with self._kunci:
+            if h not in self._cache:
+                self._cache[h] = data
+                self._ukuran_cache += len(data)
+            while self._ukuran_cache > self._maks_cache and len(self._cache) > 1:
+                self._ukuran_cache -= len(self._cache.popitem(last=False)[1])
+        return data
+
+    # --- BACA ASLI ---
+    @contextmanager
+    def buka(self, h):
+        """memoryview (read-only, mmap) atas file foto asli: halaman file dibaca OS saat disentuh &
+        dibagi antar sesi lewat page cache, tanpa salinan di heap Python"""
+        self._cek_hash(h)
+        with open(self._path(h), 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            view = memoryview(m)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def stream(self, h, ukuran=UKURAN_POTONGAN):
+        """Generator potongan bytes foto asli (dari mmap), untuk dikirim bertahap"""
+        with self.buka(h) as view:
+            for i in range(0, len(view), ukuran): yield bytes(view[i:i + ukuran])
+
+    def mime(self, h):
+        with self.buka(h) as view: return jenis_foto(bytes(view[:16]))
+
+    # --- PERAWATAN ---
+    def semua_hash(self):
+        akar = os.path.join(self.folder, 'objek')
+        return {nama for sub in os.listdir(akar) for nama in os.listdir(os.path.join(akar, sub))}
+
+    def sapu(self, dipakai, tenggang=3600):
+        """Hapus foto (dan thumbnail-nya) yang hash-nya tidak ada di `dipakai`. Return (jumlah, byte).
+        Foto yang disimpan/dipakai ulang dalam `tenggang` detik terakhir dilewati: foto disimpan sebelum
+        transaksi inspeksinya commit, jadi bisa belum tercatat di `dipakai`."""
+        jumlah = byte = 0
+        batas = time.time() - tenggang
+        for h in self.semua_hash() - set(dipakai):
+            path, folder_thumb = self._path(h), os.path.dirname(self._path_thumb(h))
+            try: info = os.stat(path)
+            except FileNotFoundError: continue
+            if info.st_mtime > batas: continue
+            byte += info.st_size
+            thumb = [os.path.join(folder_thumb, n) for n in os.listdir(folder_thumb) if n.startswith(h)] \
+                if os.path.isdir(folder_thumb) else []
+            for p in [path] + thumb:
+                try: os.remove(p)
+                except OSError: pass
+            with self._kunci:
+                data = self._cache.pop(h, None)
+                if data is not None: self._ukuran_cache -= len(data)
+            jumlah += 1
+        return jumlah, byte
+
+    def tutup(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,147 @@
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+
+# Koordinat disimpan sebagai int32 mikro-derajat (x, y berselang): 8 byte/titik, presisi ~0.1 m
+SKALA = 1_000_000
+
+# Toleransi penyederhanaan (derajat) per level; level 0 = geometri asli
+TOLERANSI_LEVEL = [0.0, 5e-5, 5e-4, 5e-3, 5e-2]
+
+TIPE_GEOMETRI = ('Point', 'LineString', 'Polygon')
+
+
+def _tag(elem):
+    return elem.tag.rsplit('}', 1)[-1]
+
+
+def _koordinat(teks):
+    """'lon,lat[,alt] lon,lat[,alt] ...' -> array (n, 2) float"""
+    token = (teks or '').split()
+    if not token: return np.empty((0, 2))
+    dim = token[0].count(',') + 1
+    return np.array(' '.join(token).replace(',', ' ').split(), dtype=float).reshape(-1, dim)[:, :2]
+
+
+@contextmanager
+def _buka_kml(sumber):
+    """File KML atau KMZ (zip berisi .kml): path, isi bytes, atau file-like -> stream bytes KML.
+    File & arsip yang dibuka di sini ditutup saat keluar blok with (file-like milik pemanggil tidak)."""
+    with ExitStack() as tutup:
+        if isinstance(sumber, (bytes, bytearray, memoryview)):
+            f = io.BytesIO(sumber)
+        elif isinstance(sumber, str) or hasattr(sumber, '__fspath__'):
+            f = tutup.enter_context(open(sumber, 'rb'))
+        else:
+            f = sumber
+            f.seek(0)
+        if zipfile.is_zipfile(f):
+            f.seek(0)
+            arsip = tutup.enter_context(zipfile.ZipFile(f))
+            nama = [n for n in arsip.namelist() if n.lower().endswith('.kml')]
+            if not nama: raise ValueError("KMZ tidak berisi file .kml")
+            # doc.kml adalah dokumen utama menurut spesifikasi KMZ
+            yield tutup.enter_context(arsip.open('doc.kml' if 'doc.kml' in nama else nama[0]))
+        else:
+            f.seek(0)
+            yield f
+
+
+def urai_kml(sumber):
+    """Placemark dari KML/KMZ secara streaming (iterparse): yield (nama, tipe, array (n, 2) lon/lat).
+    Placemark yang sudah diproses dilepas dari pohon XML, jadi memori tidak ikut membesar
+    dengan ukuran file. MultiGeometry menghasilkan satu fitur per bagian."""
+    tumpukan = []
+    with _buka_kml(sumber) as kml:
+        for event, elem in ET.iterparse(kml, events=('start', 'end')):
+            if event == 'start':
+                tumpukan.append(elem)
+                continue
+            tumpukan.pop()
+            if _tag(elem) != 'Placemark': continue
+
+            nama = None
+            for anak in elem:
+                if _tag(anak) == 'name': nama = (anak.text or '').strip() or None
+            for g in elem.iter():
+                tipe = _tag(g)
+                if tipe not in TIPE_GEOMETRI: continue
+                # Polygon: hanya batas luar (coordinates pertama = outerBoundaryIs)
+                koordinat = next((c for c in g.iter() if _tag(c) == 'coordinates'), None)
+                xy = _koordinat(koordinat.text if koordinat is not None else '')
+                if len(xy): yield nama, tipe, xy
+
+            elem.clear()
+            if tumpukan: tumpukan[-1].remove(elem)
+
+
+def sederhanakan(xy, toleransi):
+    """Douglas-Peucker: indeks titik yang dipertahankan. Semua segmen yang masih terbuka diproses
+    sekaligus per iterasi (NumPy), bukan rekursi per segmen; hasil sama dengan versi rekursif."""
+    n = len(xy)
+    if n <= 2 or toleransi <= 0: return np.arange(n)
+    simpan = np.zeros(n, dtype=bool)
+    simpan[[0, -1]] = True
+    semua = np.arange(n)
+    while True:
+        k = np.flatnonzero(simpan)
+        seg = np.minimum(np.searchsorted(k, semua, side='right') - 1, len(k) - 2)
+        p, q = xy[k[seg]], xy[k[seg + 1]]
+        d = q - p
+        panjang = np.hypot(d[:, 0], d[:, 1])
+        silang = np.abs(d[:, 0] * (xy[:, 1] - p[:, 1]) - d[:, 1] * (xy[:, 0] - p[:, 0]))
+        jarak = np.where(panjang > 0, silang / np.where(panjang > 0, panjang, 1), np.hypot(*(xy - p).T))
+        jarak[simpan] = -1
+        # Titik terjauh per segmen (lexsort stabil: seri -> indeks terkecil, sama seperti argmax)
+        urut = np.lexsort((-jarak, seg))
+        terjauh = urut[np.r_[True, seg[urut][1:] != seg[urut][:-1]]]
+        baru = terjauh[jarak[terjauh] > toleransi]
+        if not len(baru): return k
+        simpan[baru] = True
+
+
+def level_geometri(tipe, xy):
+    """[(level, blob int32)] : level 0 selalu ada, level berikutnya hanya jika titiknya berkurang"""
+    mikro = np.round(xy * SKALA).astype('<i4')
+    hasil = [(0, mikro.tobytes())]
+    if tipe == 'Point': return hasil
+    minimal = 4 if tipe == 'Polygon' else 2
+    jumlah = len(mikro)
+    for level, tol in enumerate(TOLERANSI_LEVEL[1:], 1):
+        if jumlah <= minimal: break
+        idx = sederhanakan(xy, tol)
+        if len(idx) < minimal: idx = np.linspace(0, len(xy) - 1, minimal).round().astype(int)
+        if len(idx) < jumlah:
+            jumlah = len(idx)
+            hasil.append((level, mikro[idx].tobytes()))
+    return hasil
+
+
+def dekode(blob):
+    return (np.frombuffer(blob, dtype='<i4').reshape(-1, 2) / SKALA)
+
+
+def derajat_per_piksel(zoom):
+    """Lebar satu piksel (derajat bujur) pada tile Web Mercator 256 px"""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def level_untuk_zoom(zoom):
+    """Level paling kasar yang galatnya masih di bawah satu piksel"""
+    dpp = derajat_per_piksel(zoom)
+    return max(i for i, tol in enumerate(TOLERANSI_LEVEL) if tol <= dpp)
+
+
+def ke_geojson(baris):
+    """Baris (id, aset_id, nama, tipe, blob) -> FeatureCollection GeoJSON"""
+    fitur = []
+    for fid, aset_id, nama, tipe, blob in baris:
+        xy = dekode(blob).tolist()
+        koordinat = xy[0] if tipe == 'Point' else ([xy] if tipe == 'Polygon' else xy)
+        fitur.append({'type': 'Feature', 'id': fid,
+                      'properties': {'nama': nama, 'aset_id': aset_id},
+                      'geometry': {'type': tipe, 'coordinates': koordinat}})
+    return {'type': 'FeatureCollection', 'features': fitur}
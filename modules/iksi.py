@@ -0,0 +1,62 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ParameterPenilaian:
+    """Bobot & konstanta penilaian IKSI dan skor urgensi. Tiap field boleh skalar atau array
+    berbentuk (skenario, 1) agar rumus di-broadcast ke banyak skenario sekaligus (modules/skenario.py)."""
+    # Bobot komponen IKSI
+    bobot_fisik: float = 0.45
+    bobot_tanam: float = 0.15
+    bobot_sarana: float = 0.10
+    bobot_sdm: float = 0.15
+    bobot_dok: float = 0.05
+    bobot_p3a: float = 0.10
+    # Skor komponen yang belum dihitung dari data (sementara)
+    skor_sarana: float = 60
+    skor_sdm: float = 60
+    skor_dok: float = 60
+    skor_p3a: float = 60
+    skor_fisik_tanpa_luas: float = 60
+    # Nilai tanam dari faktor K (debit andalan / kebutuhan air)
+    batas_fk_baik: float = 1.0
+    batas_fk_cukup: float = 0.7
+    nilai_fk_baik: float = 100
+    nilai_fk_cukup: float = 80
+    nilai_fk_kurang: float = 60
+    # Skor urgensi (rumus Permen PUPR)
+    koef_kerusakan: float = 0.4
+    koef_fungsi: float = 1.5
+    bobot_fungsi: float = 0.6
+    # Ambang kelas prioritas (Skor_Prioritas > batas)
+    batas_darurat: float = 200
+    batas_mendesak: float = 100
+    batas_perhatian: float = 50
+
+    @property
+    def batas_kelas(self):
+        return [self.batas_darurat, self.batas_mendesak, self.batas_perhatian]
+
+
+PARAMETER_BAWAAN = ParameterPenilaian()
+NAMA_PARAMETER = [f.name for f in fields(ParameterPenilaian)]
+
+
+def nilai_tanam(faktor_k, p=PARAMETER_BAWAAN):
+    fk = np.asarray(faktor_k, dtype=float)
+    return np.select([fk >= p.batas_fk_baik, fk >= p.batas_fk_cukup], [p.nilai_fk_baik, p.nilai_fk_cukup],
+                     default=p.nilai_fk_kurang)
+
+
+def skor_fisik(total_gl, total_area, ada_data, p=PARAMETER_BAWAAN):
+    """Rata-rata nilai gabungan tertimbang luas; tanpa luas terdampak -> skor sementara"""
+    if not ada_data: return 0
+    if total_area > 0: return total_gl / total_area
+    return p.skor_fisik_tanpa_luas
+
+
+def gabung_iksi(skor_fisik, skor_tanam, p=PARAMETER_BAWAAN):
+    return (skor_fisik * p.bobot_fisik) + (skor_tanam * p.bobot_tanam) + (p.skor_sarana * p.bobot_sarana) + \
+           (p.skor_sdm * p.bobot_sdm) + (p.skor_dok * p.bobot_dok) + (p.skor_p3a * p.bobot_p3a)
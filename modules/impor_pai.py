@@ -0,0 +1,234 @@
+import glob
+import hashlib
+import multiprocessing as mp
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+FOLDER_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data_lama')
+
+# Blangko aset aplikasi PAI lama: nama file -> (jenis_aset, satuan)
+JENIS_PAI = {
+    'bendung': ('Bendung', 'bh'), 'bendungan': ('Bendungan', 'bh'),
+    'bagi': ('Bangunan Bagi', 'bh'), 'bagisadap': ('Bangunan Bagi Sadap', 'bh'),
+    'sadap': ('Bangunan Sadap', 'bh'), 'sadaplangsung': ('Sadap Langsung', 'bh'),
+    'freeintake': ('Free Intake', 'bh'), 'bang_ukur': ('Bangunan Ukur', 'bh'),
+    'kantonglumpur': ('Kantong Lumpur', 'bh'), 'pinpem': ('Pintu Pembuang', 'bh'),
+    'klep': ('Pintu Klep', 'bh'), 'pompa': ('Rumah Pompa', 'bh'), 'pompa1': ('Pompa', 'bh'),
+    'gorong2': ('Gorong-Gorong', 'bh'), 'gorong2s': ('Gorong-Gorong Silang', 'bh'),
+    'siphon': ('Siphon', 'bh'), 'talang': ('Talang', 'bh'), 'terjunan': ('Terjunan', 'bh'),
+    'got_miring': ('Got Miring', 'bh'), 'terowongan': ('Terowongan', 'bh'),
+    'pelimpah_corong': ('Pelimpah Corong', 'bh'), 'pelimpah_samping': ('Pelimpah Samping', 'bh'),
+    'outlet': ('Outlet', 'bh'), 'pertemuan': ('Bangunan Pertemuan', 'bh'),
+    'oncoran': ('Oncoran', 'bh'), 'jembatan': ('Jembatan', 'bh'), 'cuci': ('Tempat Cuci', 'bh'),
+    'hewan': ('Kubangan Hewan', 'bh'), 'krib': ('Krib', 'bh'),
+    'saluran': ('Saluran', 'm'), 'tanggul': ('Tanggul', 'm'), 'jalan': ('Jalan Inspeksi', 'm'),
+}
+
+# Isian blangko: #.pub_x#. (pilihan/teks), ##b##x (data teknis), ##b_dyn##x (data survei),
+# ##lining##x (tabel ruas berulang)
+_TOKEN = re.compile(r'^(?:#\.pub_(\w+)#\.?|##(b|b_dyn|lining|gambar)##(\w+))$')
+
+# Isian umum yang punya kolom sendiri di master_aset / inspeksi_aset (bukan dimensi_teknis)
+_UMUM = {'judul', 'aset', 'nama', 'tahun_dibangun', 'luas_layanan', 'taksiran_sipil', 'taksiran_me',
+         'tahun', 'kondisi_sipil', 'kondisi_me', 'fungsi_sipil', 'fungsi_me', 'luas_pengaruh',
+         'pek_sipil', 'pek_me', 'biaya_sipil', 'biaya_me', 'usulan_tahun', 'urgensi', 'tujuan', 'catatan',
+         'keterangan'}
+
+# Rincian kerusakan per survei (s1_v .. m7_k: volume/satuan/harga/ket) -> sudah terwakili estimasi_biaya
+_KERUSAKAN = re.compile(r'^[sm]\d+_[vshk]$')
+
+# Nilai teks kondisi/fungsi -> angka (skala sama dengan halaman Inspeksi)
+NILAI_TEKS = {'baik': 100, 'kurang': 70, 'rusak ringan': 70, 'sedang': 70, 'rusak sedang': 55,
+              'rusak': 40, 'rusak berat': 40, 'macet': 0, 'tidak berfungsi': 0}
+
+
+def _baca_grid(path):
+    """Isi sheet pertama sebagai list baris (nilai mentah)"""
+    if path.lower().endswith('.xls'):
+        import xlrd
+        sh = xlrd.open_workbook(path, on_demand=True).sheet_by_index(0)
+        return [sh.row_values(r) for r in range(sh.nrows)]
+    import openpyxl
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        return [['' if v is None else v for v in baris] for baris in wb.worksheets[0].iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def _seksi(grid):
+    """Posisi (no_seksi, offset_baris) tiap baris; no_seksi = nomor urut berikutnya di kolom A (1., 2., ...)"""
+    no, awal, posisi = 0, 0, []
+    for r, baris in enumerate(grid):
+        a = baris[0] if baris else ''
+        if isinstance(a, (int, float)) and not isinstance(a, bool) and a == no + 1:
+            no, awal = no + 1, r
+        posisi.append((no, r - awal))
+    return posisi
+
+
+def baca_template(path):
+    """Peta isian blangko: {nama: (seksi, offset, kolom)}, kolom tabel ruas, dan label statis.
+    Posisi relatif terhadap nomor seksi supaya tetap cocok bila tabel berulang bertambah baris."""
+    grid = _baca_grid(path)
+    peta, ruas, label = {}, {}, set()
+    for (seksi, off), baris in zip(_seksi(grid), grid):
+        for k, v in enumerate(baris):
+            if not isinstance(v, str) or not v.strip(): continue
+            m = _TOKEN.match(v.strip())
+            if not m:
+                label.add((seksi, off, k, v.strip().lower()))
+            elif m.group(2) == 'lining':
+                ruas[m.group(3)] = (seksi, off, k)
+            elif m.group(2) != 'gambar':
+                peta[m.group(1) or m.group(3)] = (seksi, off, k)
+    return {'peta': peta, 'ruas': ruas, 'label': frozenset(label)}
+
+
+def muat_template(folder=FOLDER_TEMPLATE):
+    return {stem: baca_template(os.path.join(folder, f'{stem}.xls'))
+            for stem in JENIS_PAI if os.path.exists(os.path.join(folder, f'{stem}.xls'))}
+
+
+def _cocokkan(stem, label, template):
+    """Jenis blangko file terisi: petunjuk nama file dulu, lalu kemiripan label statis"""
+    def skor(jenis):
+        lt = template[jenis]['label']
+        return len(lt & label) / len(lt) if lt else 0
+    petunjuk = sorted((j for j in template if stem.startswith(j)), key=len, reverse=True)
+    for jenis in petunjuk:
+        if skor(jenis) >= 0.9: return jenis
+    terbaik = max(template, key=skor, default=None)
+    return terbaik if terbaik and skor(terbaik) >= 0.9 else None
+
+
+def _nilai(v):
+    if isinstance(v, str):
+        v = v.strip()
+        if not v or v.startswith('#'): return None  # kosong / placeholder blangko belum terisi
+    return v
+
+
+def _teks(v):
+    # Sel angka dari .xls selalu float: kode 123 terbaca 123.0 -> "123"
+    if isinstance(v, float) and v.is_integer(): v = int(v)
+    return str(v).strip()
+
+
+def _angka(v):
+    v = _nilai(v)
+    if v is None or isinstance(v, (int, float)): return v
+    # Format angka Indonesia: 1.250.000,5
+    if ',' in v or v.count('.') > 1: v = v.replace('.', '').replace(',', '.')
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+def _angka_kondisi(v):
+    v = _nilai(v)
+    if isinstance(v, str):
+        return NILAI_TEKS.get(v.lower(), _angka(v.rstrip('% ')))
+    return v
+
+
+def _jumlah(*nilai):
+    angka = [x for x in map(_angka, nilai) if x is not None]
+    return sum(angka) if angka else None
+
+
+def urai_file(path, template):
+    """Satu blangko terisi -> dict {'master': {...}, 'inspeksi': {...}}, atau {'lewati': alasan}"""
+    try:
+        grid = _baca_grid(path)
+    except Exception as e:
+        return {'file': path, 'lewati': f"gagal dibaca: {e}"}
+    posisi = _seksi(grid)
+    label = {(s, o, k, v.strip().lower()) for (s, o), baris in zip(posisi, grid)
+             for k, v in enumerate(baris) if isinstance(v, str) and v.strip() and not _TOKEN.match(v.strip())}
+    jenis = _cocokkan(os.path.splitext(os.path.basename(path))[0].lower(), label, template)
+    if jenis is None: return {'file': path, 'lewati': "bukan blangko aset PAI"}
+
+    # Baris awal & akhir (eksklusif) tiap seksi di file terisi
+    awal = {}
+    for r, (s, o) in enumerate(posisi):
+        if o == 0: awal[s] = r
+    urut = sorted(awal.values()) + [len(grid)]
+    akhir = {s: urut[urut.index(r) + 1] for s, r in awal.items()}
+
+    def sel(s, o, k):
+        if s not in awal or awal[s] + o >= akhir[s]: return None
+        baris = grid[awal[s] + o]
+        return _nilai(baris[k]) if k < len(baris) else None
+
+    t = template[jenis]
+    isi = {nama: sel(*pos) for nama, pos in t['peta'].items()}
+    if not isi.get('aset') and not isi.get('nama'): return {'file': path, 'lewati': "blangko kosong"}
+
+    detail = {k: v for k, v in isi.items() if k not in _UMUM and not _KERUSAKAN.match(k) and v is not None}
+    if isi.get('luas_layanan') is None and _jumlah(isi.get('iki_5'), isi.get('ika_5')) is not None:
+        isi['luas_layanan'] = _jumlah(isi.get('iki_5'), isi.get('ika_5'))  # bendung/free intake: kiri + kanan
+    if t['ruas']:
+        s, o, _ = next(iter(t['ruas'].values()))
+        detail['ruas'] = []
+        for b in range(awal[s] + o, akhir[s]) if s in awal else ():
+            r = {k: _nilai(grid[b][pos[2]]) if pos[2] < len(grid[b]) else None for k, pos in t['ruas'].items()}
+            if any(v is not None for v in r.values()): detail['ruas'].append(r)
+
+    nama_jenis, satuan = JENIS_PAI[jenis]
+    # Kode aset stabil: kode di blangko, atau hash DI + jenis + nama bila kosong
+    kode = _teks(isi['aset']) if isi.get('aset') else \
+        f"{jenis.upper()}-" + hashlib.sha1(f"{isi.get('di')}|{jenis}|{isi.get('nama')}".encode()).hexdigest()[:10]
+    tahun = _angka(isi.get('tahun'))
+    rekomendasi = "; ".join(str(isi[k]) for k in ('pek_sipil', 'pek_me') if isi.get(k))
+    return {
+        'file': path,
+        'master': {
+            'kode_aset': kode, 'nama_aset': _teks(isi['nama']) if isi.get('nama') else kode,
+            'jenis_aset': nama_jenis, 'satuan': satuan,
+            'tahun_bangun': _angka(isi.get('tahun_dibangun')), 'tahun_rehab_terakhir': 0,
+            'dimensi_teknis': detail, 'luas_layanan_desain': _angka(isi.get('luas_layanan')),
+            'nilai_aset_baru': _jumlah(isi.get('taksiran_sipil'), isi.get('taksiran_me')) or 0,
+        },
+        'inspeksi': None if tahun is None else {
+            'tanggal_inspeksi': f"{int(tahun):04d}-01-01",
+            'kondisi_sipil': _angka_kondisi(isi.get('kondisi_sipil')), 'kondisi_me': _angka_kondisi(isi.get('kondisi_me')),
+            'nilai_fungsi_sipil': _angka_kondisi(isi.get('fungsi_sipil')), 'nilai_fungsi_me': _angka_kondisi(isi.get('fungsi_me')),
+            'luas_terdampak_aktual': _angka(isi.get('luas_pengaruh')),
+            'rekomendasi_penanganan': rekomendasi or None,
+            'estimasi_biaya': _jumlah(isi.get('biaya_sipil'), isi.get('biaya_me')),
+        },
+    }
+
+
+# --- POOL PROSES (template dimuat sekali per worker) ---
+_TEMPLATE = None
+
+def _init_worker(folder):
+    global _TEMPLATE
+    _TEMPLATE = muat_template(folder)
+
+def _urai_worker(path):
+    return urai_file(path, _TEMPLATE)
+
+
+def daftar_file(sumber):
+    """Folder (rekursif) atau daftar path -> path .xls/.xlsx terurut"""
+    if isinstance(sumber, str) and os.path.isdir(sumber):
+        return sorted(p for ext in ('xls', 'xlsx') for p in glob.glob(os.path.join(sumber, '**', f'*.{ext}'), recursive=True))
+    return sorted([sumber] if isinstance(sumber, str) else sumber)
+
+
+def urai_arsip(sumber, proses=None, folder_template=FOLDER_TEMPLATE):
+    """Urai semua blangko di `sumber` secara paralel (ProcessPool). proses=1 -> tanpa pool."""
+    paths = daftar_file(sumber)
+    if proses == 1 or len(paths) < 8:
+        template = muat_template(folder_template)
+        return [urai_file(p, template) for p in paths]
+    proses = proses or os.cpu_count() or 1
+    # spawn, bukan fork: dipanggil dari proses Streamlit yang punya banyak thread
+    with ProcessPoolExecutor(proses, mp_context=mp.get_context('spawn'), initializer=_init_worker,
+                             initargs=(folder_template,)) as pool:
+        return list(pool.map(_urai_worker, paths, chunksize=max(1, len(paths) // (4 * proses))))
@@ -0,0 +1,156 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+class Pelacak:
+    """Catatan kinerja panggilan IrigasiBackend: durasi, baris hasil, baris yang ditulis, SQL yang
+    dijalankan (teks + berapa kali) dan galat, termasuk galat yang ditelan method (pesan "❌" atau
+    hasil kosong). Statistik per metode & `simpan` panggilan terakhir disimpan di memori; jika
+    `path_jejak` diisi, tiap panggilan juga ditulis satu baris JSON ke file itu (JSONL)."""
+
+    def __init__(self, path_jejak=None, simpan=500, maks_sql=20, sampel=200):
+        self._kunci = threading.Lock()
+        self._lokal = threading.local()
+        self._terakhir = deque(maxlen=simpan)
+        self._maks_sql = maks_sql
+        self._sampel = sampel
+        self._statistik = {}
+        self._file = None
+        self.path_jejak = None
+        self.atur_jejak(path_jejak)
+
+    def atur_jejak(self, path_jejak=None):
+        """Mulai (path) / hentikan (None) penulisan jejak JSONL"""
+        with self._kunci:
+            if self._file is not None: self._file.close()
+            self._file = open(path_jejak, 'a', encoding='utf-8', buffering=1) if path_jejak else None
+            self.path_jejak = path_jejak
+
+    def tutup(self):
+        self.atur_jejak(None)
+
+    def _tumpukan(self):
+        tumpukan = getattr(self._lokal, 'tumpukan', None)
+        if tumpukan is None: tumpukan = self._lokal.tumpukan = []
+        return tumpukan
+
+    # --- PENCATATAN (dipanggil backend) ---
+    def mulai(self, metode):
+        tumpukan = self._tumpukan()
+        catatan = {'waktu': datetime.now().isoformat(timespec='milliseconds'), 'metode': metode,
+                   'kedalaman': len(tumpukan), 'thread': threading.current_thread().name, 'durasi_ms': None,
+                   'baris': None, 'baris_ditulis': 0, 'jumlah_sql': 0, 'sql': {}, 'galat': None,
+                   '_t0': time.perf_counter()}
+        tumpukan.append(catatan)
+        return catatan
+
+    def selesai(self, catatan, hasil=None, galat=None):
+        catatan['durasi_ms'] = (time.perf_counter() - catatan.pop('_t0')) * 1e3
+        if galat is not None: catatan['galat'] = f"{type(galat).__name__}: {galat}"
+        elif isinstance(hasil, str) and hasil.startswith("❌"): catatan['galat'] = hasil
+        elif isinstance(hasil, dict) and str(hasil.get('pesan', '')).startswith("❌"): catatan['galat'] = hasil['pesan']
+        baris = hasil[0] if isinstance(hasil, tuple) and hasil and isinstance(hasil[0], pd.DataFrame) else hasil
+        if isinstance(baris, (pd.DataFrame, pd.Series, list)): catatan['baris'] = len(baris)
+        tumpukan = self._tumpukan()
+        tumpukan.pop()
+        # Tulis & SQL panggilan dalam ikut terhitung di pemanggilnya
+        if tumpukan:
+            tumpukan[-1]['baris_ditulis'] += catatan['baris_ditulis']
+            tumpukan[-1]['jumlah_sql'] += catatan['jumlah_sql']
+        catatan['sql'] = sorted(catatan['sql'].items(), key=lambda x: -x[1])
+        with self._kunci:
+            self._terakhir.append(catatan)
+            s = self._statistik.get(catatan['metode'])
+            if s is None:
+                s = self._statistik[catatan['metode']] = {'jumlah': 0, 'total_ms': 0.0, 'maks_ms': 0.0, 'galat': 0,
+                                                           'baris': 0, 'baris_ditulis': 0, 'jumlah_sql': 0,
+                                                           'durasi': deque(maxlen=self._sampel)}
+            s['jumlah'] += 1
+            s['total_ms'] += catatan['durasi_ms']
+            s['maks_ms'] = max(s['maks_ms'], catatan['durasi_ms'])
+            s['galat'] += catatan['galat'] is not None
+            s['baris'] += catatan['baris'] or 0
+            s['baris_ditulis'] += catatan['baris_ditulis']
+            s['jumlah_sql'] += catatan['jumlah_sql']
+            s['durasi'].append(catatan['durasi_ms'])
+            if self._file is not None: self._file.write(json.dumps(catatan, default=str) + "\n")
+
+    def sql(self, teks):
+        """Callback trace sqlite3: SQL dicatat pada panggilan backend yang sedang aktif di thread ini"""
+        tumpukan = getattr(self._lokal, 'tumpukan', None)
+        if not tumpukan or teks.startswith('--'): return   # '--' = statement di dalam trigger
+        catatan = tumpukan[-1]
+        catatan['jumlah_sql'] += 1
+        teks = ' '.join(teks[:300].split())
+        if teks in catatan['sql'] or len(catatan['sql']) < self._maks_sql:
+            catatan['sql'][teks] = catatan['sql'].get(teks, 0) + 1
+
+    def tulis(self, jumlah):
+        """Baris yang diubah transaksi tulis (termasuk oleh trigger)"""
+        tumpukan = getattr(self._lokal, 'tumpukan', None)
+        if tumpukan: tumpukan[-1]['baris_ditulis'] += jumlah
+
+    def galat(self, e):
+        """Galat yang ditangkap method (hasilnya tetap dikembalikan kosong) tetap tercatat"""
+        tumpukan = getattr(self._lokal, 'tumpukan', None)
+        if tumpukan: tumpukan[-1]['galat'] = f"{type(e).__name__}: {e}"
+
+    # --- LAPORAN ---
+    def statistik(self):
+        """Satu baris per metode: jumlah panggilan, total/rata/p50/p95/maks ms, galat, baris, SQL"""
+        with self._kunci:
+            baris = [{'metode': m, 'jumlah': s['jumlah'], 'total_ms': s['total_ms'],
+                      'rata_ms': s['total_ms'] / s['jumlah'], 'p50_ms': float(np.percentile(s['durasi'], 50)),
+                      'p95_ms': float(np.percentile(s['durasi'], 95)), 'maks_ms': s['maks_ms'], 'galat': s['galat'],
+                      'baris': s['baris'], 'baris_ditulis': s['baris_ditulis'], 'jumlah_sql': s['jumlah_sql']}
+                     for m, s in self._statistik.items()]
+        if not baris: return pd.DataFrame()
+        return pd.DataFrame(baris).sort_values('total_ms', ascending=False, ignore_index=True)
+
+    def terakhir(self, n=50, galat_saja=False):
+        """`n` panggilan terakhir (terbaru dulu)"""
+        with self._kunci:
+            daftar = [c for c in self._terakhir if c['galat'] or not galat_saja]
+        return pd.DataFrame(daftar[::-1][:n])
+
+    def reset(self):
+        with self._kunci:
+            self._terakhir.clear()
+            self._statistik.clear()
+
+
+def terukur(fungsi):
+    """Catat panggilan method ke self.pelacak (jika ada)"""
+    @functools.wraps(fungsi)
+    def bungkus(self, *args, **kwargs):
+        pelacak = self.__dict__.get('pelacak')
+        if pelacak is None: return fungsi(self, *args, **kwargs)
+        catatan = pelacak.mulai(fungsi.__name__)
+        try:
+            hasil = fungsi(self, *args, **kwargs)
+        except BaseException as e:
+            pelacak.selesai(catatan, galat=e)
+            raise
+        pelacak.selesai(catatan, hasil)
+        return hasil
+    return bungkus
+
+
+def instrumentasi(*internal):
+    """Dekorator kelas: semua method publik (kecuali generator) + method `internal` dibungkus terukur"""
+    def pasang(cls):
+        for nama, fungsi in list(vars(cls).items()):
+            if (nama.startswith('_') and nama not in internal) or not inspect.isfunction(fungsi) \
+                    or inspect.isgeneratorfunction(fungsi):
+                continue
+            setattr(cls, nama, terukur(fungsi))
+        return cls
+    return pasang
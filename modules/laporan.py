@@ -0,0 +1,168 @@
+import numpy as np
+import xlsxwriter
+
+# Blangko 1-P Fisik (Permen PUPR): judul di baris 1-3, kepala tabel baris 5-6, data mulai baris 7
+BARIS_DATA_1P = 6
+LEBAR_KOLOM_1P = [('A:A', 5), ('B:B', 30), ('C:C', 15), ('D:D', 10), ('E:E', 10), ('F:H', 12), ('I:I', 15), ('J:J', 25)]
+
+# Batas kondisi (min sipil/ME, %) untuk kolom B / RR / RB
+BATAS_BAIK, BATAS_RUSAK_RINGAN = 80, 60
+
+KOLOM_PRIORITAS = ['Nama Aset', 'Jenis', 'Kondisi Sipil', 'Kondisi ME', 'Skor Bahaya', 'Kelas Prioritas', 'Biaya Rehab']
+
+
+def buat_format(workbook):
+    """Semua format dibuat sekali per workbook lalu dipakai ulang"""
+    return {
+        'header': workbook.add_format({
+            'bold': True, 'align': 'center', 'valign': 'vcenter',
+            'font_size': 12, 'font_name': 'Arial'}),
+        'table_header': workbook.add_format({
+            'bold': True, 'align': 'center', 'valign': 'vcenter', 'text_wrap': True,
+            'border': 1, 'bg_color': '#FFC000', 'font_size': 10}),
+        'cell': workbook.add_format({'border': 1, 'font_size': 10, 'font_name': 'Arial'}),
+        'center': workbook.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter', 'font_size': 10}),
+        'angka': workbook.add_format({'border': 1, 'font_size': 10, 'num_format': '0.00'}),
+        'rupiah': workbook.add_format({'border': 1, 'font_size': 10, 'num_format': '#,##0'}),
+        'abu': workbook.add_format({'bold': True, 'align': 'center', 'bg_color': '#D9D9D9', 'border': 1}),
+    }
+
+
+def siapkan_blangko_1p(worksheet, fmt, daerah_irigasi='...........................................',
+                       kabupaten='...........................................'):
+    """Kop surat & kepala tabel Blangko 1-P Fisik. Ditulis urut baris (aman untuk constant_memory)."""
+    # --- 2. SET LEBAR KOLOM ---
+    for kolom, lebar in LEBAR_KOLOM_1P:
+        worksheet.set_column(kolom, lebar)
+
+    # --- 3. MEMBUAT KOP SURAT (HEADER) ---
+    # Ini meniru kop surat standar laporan PU
+    worksheet.merge_range('A1:J1', 'LAPORAN KINERJA SISTEM IRIGASI (ASPEK PRASARANA FISIK)', fmt['header'])
+    worksheet.merge_range('A2:J2', f'DAERAH IRIGASI: {daerah_irigasi}', fmt['header'])
+    worksheet.merge_range('A3:J3', f'KABUPATEN/KOTA: {kabupaten}', fmt['header'])
+
+    # --- 4. MEMBUAT JUDUL TABEL (HEADER TABLE) ---
+    # Baris 5 (Header Utama)
+    th = fmt['table_header']
+    worksheet.merge_range('A5:A6', 'NO', th)
+    worksheet.merge_range('B5:B6', 'NAMA BANGUNAN / RUAS SALURAN', th)
+    worksheet.merge_range('C5:C6', 'JENIS ASET', th)
+    worksheet.merge_range('D5:E5', 'DIMENSI / VOLUME', th)
+    worksheet.merge_range('F5:H5', 'KONDISI FISIK (Bobot %)', th)
+    worksheet.merge_range('I5:I6', 'NILAI KINERJA', th)
+    worksheet.merge_range('J5:J6', 'KETERANGAN / REKOMENDASI', th)
+
+    # Baris 6 (Sub-Header)
+    worksheet.write('D6', 'Jml', th)
+    worksheet.write('E6', 'Sat', th)
+    worksheet.write('F6', 'B', th)   # Baik
+    worksheet.write('G6', 'RR', th)  # Rusak Ringan
+    worksheet.write('H6', 'RB', th)  # Rusak Berat
+
+
+def _kolom(df, nama):
+    return df[nama].to_numpy(dtype=float) if nama in df else np.full(len(df), np.nan)
+
+
+def baris_1p(df, nomor_awal=1):
+    """Isi tabel 1-P untuk satu potongan frame prioritas, dihitung per kolom (NumPy)"""
+    K = np.fmin(_kolom(df, 'kondisi_sipil'), _kolom(df, 'kondisi_me'))
+    F = np.fmin(_kolom(df, 'nilai_fungsi_sipil'), _kolom(df, 'nilai_fungsi_me'))
+    kelas = np.select([K >= BATAS_BAIK, K >= BATAS_RUSAK_RINGAN], [0, 1], default=2)
+    kelas[np.isnan(K)] = -1
+    kondisi = [np.where(kelas == i, K, np.nan) for i in range(3)]
+    kinerja = (K + F) / 2
+
+    rekomendasi = df['rekomendasi_penanganan'] if 'rekomendasi_penanganan' in df else None
+    keterangan = df['Kelas_Prioritas'].astype(str)
+    if rekomendasi is not None:
+        ada = rekomendasi.notna() & (rekomendasi.astype(str).str.strip() != '')
+        keterangan = keterangan.where(~ada, keterangan + '; ' + rekomendasi.astype(str))
+
+    kolom = [
+        np.arange(nomor_awal, nomor_awal + len(df)).tolist(),
+        _teks(df['nama_aset']),
+        _teks(df['jenis_aset']),
+        [1] * len(df),
+        _teks(df['satuan']) if 'satuan' in df else [None] * len(df),
+        *[_kosongkan_nan(k) for k in kondisi],
+        _kosongkan_nan(kinerja),
+        keterangan.tolist(),
+    ]
+    return zip(*kolom)
+
+
+def _teks(seri):
+    return seri.astype(object).where(seri.notna(), None).map(lambda x: x if x is None else str(x)).tolist()
+
+
+def _kosongkan_nan(a):
+    return np.where(np.isnan(a), None, np.round(a, 2).astype(object)).tolist()
+
+
+def tulis_laporan(output, df_prioritas, master=None, ukuran_batch=10_000, daerah_irigasi=None, kabupaten=None,
+                  kemajuan=None, jumlah_master=0):
+    """Laporan Excel resmi: sheet Blangko 1-P Fisik, Prioritas Penanganan, dan Master Data.
+
+    Workbook ditulis dalam mode constant_memory (baris dibuang ke disk setelah ditulis), frame
+    prioritas diproses per potongan `ukuran_batch` baris, dan `master` berupa (kolom, iterator
+    potongan baris) dari cursor fetchmany -> memori tetap datar berapapun jumlah aset.
+    `kemajuan(fraksi)` (opsional) dipanggil setiap satu potongan selesai ditulis."""
+    total = max(2 * len(df_prioritas) + jumlah_master, 1)
+    selesai = 0
+
+    def maju(n):
+        nonlocal selesai
+        selesai += n
+        if kemajuan: kemajuan(min(selesai / total, 1.0))
+
+    # strings_to_urls=False: teks tidak diperiksa regex URL satu per satu
+    wb = xlsxwriter.Workbook(output, {'constant_memory': True, 'nan_inf_to_errors': True, 'strings_to_urls': False})
+    fmt = buat_format(wb)
+    try:
+        # 1. BLANGKO 1-P FISIK
+        ws = wb.add_worksheet('Blangko 1-P Fisik')
+        kop = {k: v for k, v in (('daerah_irigasi', daerah_irigasi), ('kabupaten', kabupaten)) if v}
+        siapkan_blangko_1p(ws, fmt, **kop)
+        # Tipe tiap kolom sudah pasti -> panggil write_number/write_string langsung (tanpa deteksi tipe
+        # oleh write()); sel kosong tetap ditulis blank agar garis tabel blangko tidak putus
+        format_1p = [fmt['center'], fmt['cell'], fmt['cell'], fmt['center'], fmt['center'],
+                     fmt['angka'], fmt['angka'], fmt['angka'], fmt['angka'], fmt['cell']]
+        penulis = [ws.write_number, ws.write_string, ws.write_string, ws.write_number, ws.write_string,
+                   ws.write_number, ws.write_number, ws.write_number, ws.write_number, ws.write_string]
+        kolom_1p = list(enumerate(zip(penulis, format_1p)))
+        r = BARIS_DATA_1P
+        for i in range(0, len(df_prioritas), ukuran_batch):
+            for baris in baris_1p(df_prioritas.iloc[i:i + ukuran_batch], nomor_awal=i + 1):
+                for (c, (tulis, f)), nilai in zip(kolom_1p, baris):
+                    if nilai is None: ws.write_blank(r, c, None, f)
+                    else: tulis(r, c, nilai, f)
+                r += 1
+            maju(min(ukuran_batch, len(df_prioritas) - i))
+
+        # 2. SHEET PRIORITAS
+        ws = wb.add_worksheet('Prioritas Penanganan')
+        ws.write_row(0, 0, KOLOM_PRIORITAS, fmt['abu'])
+        kolom = ['nama_aset', 'jenis_aset', 'kondisi_sipil', 'kondisi_me', 'Skor_Prioritas', 'Kelas_Prioritas', 'estimasi_biaya']
+        r = 1
+        for i in range(0, len(df_prioritas), ukuran_batch):
+            potongan = df_prioritas.iloc[i:i + ukuran_batch][kolom]
+            for baris in potongan.astype(object).where(potongan.notna(), None).itertuples(index=False, name=None):
+                ws.write_row(r, 0, baris)
+                r += 1
+            maju(len(potongan))
+
+        # 3. SHEET MASTER
+        if master is not None:
+            nama_kolom, potongan_master = master
+            ws = wb.add_worksheet('Master Data')
+            ws.write_row(0, 0, nama_kolom, fmt['abu'])
+            r = 1
+            for potongan in potongan_master:
+                for baris in potongan:
+                    ws.write_row(r, 0, baris)
+                    r += 1
+                maju(len(potongan))
+    finally:
+        wb.close()
+    return output
@@ -0,0 +1,147 @@
+import mmap
+import struct
+
+import numpy as np
+
+# Kode tipe field Paradox (PXFORMAT): nama, dipakai juga untuk tipe kolom SQLite
+TIPE_ALPHA, TIPE_DATE, TIPE_SHORT, TIPE_LONG, TIPE_MONEY, TIPE_NUMBER = 0x01, 0x02, 0x03, 0x04, 0x05, 0x06
+TIPE_LOGICAL, TIPE_TIME, TIPE_TIMESTAMP, TIPE_AUTOINC = 0x09, 0x14, 0x15, 0x16
+TIPE_SQLITE = {TIPE_ALPHA: 'TEXT', TIPE_DATE: 'DATE', TIPE_SHORT: 'INTEGER', TIPE_LONG: 'INTEGER',
+               TIPE_MONEY: 'REAL', TIPE_NUMBER: 'REAL', TIPE_LOGICAL: 'INTEGER', TIPE_TIME: 'INTEGER',
+               TIPE_TIMESTAMP: 'REAL', TIPE_AUTOINC: 'INTEGER'}
+
+_HARI_EPOCH = 719163  # date(1970, 1, 1).toordinal(); tanggal Paradox = ordinal hari sejak 01-01-0001
+
+
+class TabelParadox:
+    """Pembaca tabel Paradox (.db) tanpa dependensi: file di-mmap, record lebar-tetap di setiap
+    blok data didekode per kolom sekaligus (NumPy), bukan per baris.
+
+    File index (.PX/.XG0/.YG0) tidak diperlukan: urutan data mengikuti rantai blok .db."""
+
+    def __init__(self, path, encoding='cp1252'):
+        self.path = path
+        self.encoding = encoding
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = np.frombuffer(self._mm, dtype=np.uint8)
+        self._baca_header()
+
+    def close(self):
+        self._data = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # masih ada array yang menunjuk ke mmap; ditutup GC setelah array dilepas
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def _baca_header(self):
+        mm = self._mm
+        (self.ukuran_record, self.ukuran_header, self.tipe_file, ukuran_blok_kb,
+         self.jumlah_record) = struct.unpack_from('<HHBBI', mm, 0x00)
+        self.blok_pertama = struct.unpack_from('<H', mm, 0x0E)[0]
+        jumlah_field = struct.unpack_from('<H', mm, 0x21)[0]
+        self.versi = mm[0x39]
+        if self.tipe_file not in (0, 2):
+            raise ValueError(f"{self.path}: bukan tabel data Paradox (tipe file {self.tipe_file})")
+        self.ukuran_blok = ukuran_blok_kb * 1024
+
+        # Header versi 4+ punya 0x20 byte tambahan sebelum daftar field
+        pos = 0x78 if self.versi >= 5 else 0x58
+        spek = [struct.unpack_from('<BB', mm, pos + 2 * i) for i in range(jumlah_field)]
+        # Setelah daftar field: blok pointer (nama tabel, nama-nama field, kadang 1 pointer
+        # tambahan) lalu nama tabel (261 byte di versi 7, 79 byte sebelumnya) & nama field.
+        # Akhir blok pointer = slot pertama yang nilainya di luar rentang pointer nama.
+        pos += 2 * jumlah_field
+        panjang_nama = 261 if self.versi >= 0x0C else 79
+        ptr_awal = struct.unpack_from('<I', mm, pos)[0]
+        rentang = panjang_nama + 256 * (jumlah_field + 1)
+        while (struct.unpack_from('<I', mm, pos)[0] - ptr_awal) % (1 << 32) < rentang:
+            pos += 4
+        self.nama_tabel = mm[pos:pos + panjang_nama].split(b'\0')[0].decode(self.encoding)
+        pos += panjang_nama
+        nama = []
+        for _ in range(jumlah_field):
+            akhir = mm.find(b'\0', pos)
+            nama.append(mm[pos:akhir].decode(self.encoding))
+            pos = akhir + 1
+
+        self.field = []
+        offset = 0
+        for n, (tipe, ukuran) in zip(nama, spek):
+            self.field.append((n, tipe, ukuran, offset))
+            offset += ukuran
+        if offset != self.ukuran_record:
+            raise ValueError(f"{self.path}: ukuran field ({offset}) != ukuran record ({self.ukuran_record})")
+
+    def _rantai_blok(self):
+        """(indeks blok 0-based, jumlah record) mengikuti rantai blok data (next block)"""
+        blok_list, jumlah = [], []
+        blok, dikunjungi = self.blok_pertama, set()
+        while blok and blok not in dikunjungi:
+            dikunjungi.add(blok)
+            berikut, _, tambahan = struct.unpack_from('<HHh', self._mm, self.ukuran_header + (blok - 1) * self.ukuran_blok)
+            if tambahan >= 0:
+                blok_list.append(blok - 1)
+                jumlah.append(tambahan // self.ukuran_record + 1)
+            blok = berikut
+        return np.asarray(blok_list, dtype=np.int64), np.asarray(jumlah, dtype=np.int64)
+
+    def _record(self):
+        """View (blok, slot, byte) atas seluruh blok data, tanpa salinan"""
+        n_blok = (len(self._mm) - self.ukuran_header) // self.ukuran_blok
+        per_blok = (self.ukuran_blok - 6) // self.ukuran_record
+        blok = self._data[self.ukuran_header:self.ukuran_header + n_blok * self.ukuran_blok].reshape(n_blok, self.ukuran_blok)
+        return blok[:, 6:6 + per_blok * self.ukuran_record].reshape(n_blok, per_blok, self.ukuran_record)
+
+    def _bytes_kolom(self, record, blok, jumlah, offset, ukuran):
+        # Hanya byte field ini yang disalin: (blok terpakai x slot, ukuran), lalu slot kosong dibuang
+        b = record[blok, :, offset:offset + ukuran]
+        terisi = np.arange(b.shape[1]) < jumlah[:, None]
+        return b[terisi]
+
+    def _dekode(self, b, tipe, ukuran):
+        kosong = ~b.any(axis=1)
+        if tipe == TIPE_ALPHA:
+            teks = np.ascontiguousarray(b).view(f'S{ukuran}').ravel().tolist()
+            return np.array([t.decode(self.encoding, 'replace') if t else None for t in teks], dtype=object)
+        if tipe in (TIPE_NUMBER, TIPE_MONEY, TIPE_TIMESTAMP):
+            # Double big-endian: positif -> bit tanda dibalik, negatif -> semua bit dibalik
+            b = b.copy()
+            positif = b[:, 0] >= 0x80
+            b[positif, 0] ^= 0x80
+            b[~positif] = ~b[~positif]
+            nilai = b.view('>f8').ravel().astype(float)
+            nilai[kosong] = np.nan
+            return nilai
+        if tipe in (TIPE_SHORT, TIPE_LONG, TIPE_AUTOINC, TIPE_DATE, TIPE_TIME, TIPE_LOGICAL):
+            # Integer big-endian dengan bit tanda dibalik
+            b = b.copy()
+            b[:, 0] ^= 0x80
+            nilai = b.view({1: '>i1', 2: '>i2', 4: '>i4'}[ukuran]).ravel().astype(float)
+            nilai[kosong] = np.nan
+            if tipe == TIPE_DATE:
+                tanggal = np.full(len(nilai), np.datetime64('NaT'), dtype='datetime64[D]')
+                ada = ~kosong
+                tanggal[ada] = (nilai[ada] - _HARI_EPOCH).astype('int64').astype('datetime64[D]')
+                return tanggal
+            return nilai
+        return [bytes(x) if not k else None for x, k in zip(b, kosong)]  # BCD/memo/blob: mentah
+
+    def kolom(self, nama=None):
+        """{nama_field: array} untuk field terpilih (default semua), didekode langsung dari mmap"""
+        return next(self.potongan(None, nama), None) or {n: self._dekode(np.zeros((0, uk), np.uint8), tipe, uk)
+                                                          for n, tipe, uk, _ in self.field if nama is None or n in nama}
+
+    def potongan(self, ukuran=100_000, nama=None):
+        """Kolom per potongan ~`ukuran` record (dibulatkan ke blok), untuk tabel yang terlalu besar
+        dimuat sekaligus. ukuran=None -> satu potongan berisi semua record."""
+        record = self._record()
+        blok, jumlah = self._rantai_blok()
+        langkah = len(blok) if ukuran is None else max(1, ukuran // record.shape[1])
+        for i in range(0, len(blok), max(langkah, 1)):
+            b, j = blok[i:i + langkah], jumlah[i:i + langkah]
+            yield {n: self._dekode(self._bytes_kolom(record, b, j, off, uk), tipe, uk)
+                   for n, tipe, uk, off in self.field if nama is None or n in nama}
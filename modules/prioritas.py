@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from modules.iksi import PARAMETER_BAWAAN
+
+# Ambang kelas prioritas bawaan (Skor_Prioritas > batas), urut dari yang paling berat
+BATAS_KELAS = PARAMETER_BAWAAN.batas_kelas
+LABEL_KELAS = ["1. DARURAT (Segera)", "2. MENDESAK (Thn Depan)", "3. PERLU PERHATIAN", "4. RUTIN"]
+
+
+def _kolom(df, nama):
+    return pd.to_numeric(df[nama], errors='coerce').to_numpy(dtype=float)
+
+
+def _min_pasangan(a, b):
+    # Sama dengan min(a, b) bawaan Python: ambil b hanya jika b < a (NaN ikut a)
+    return np.where(b < a, b, a)
+
+
+def hitung_skor_urgensi(df, p=PARAMETER_BAWAAN):
+    """Skor urgensi (rumus Permen PUPR) untuk semua baris sekaligus, hasil array float."""
+    K = _min_pasangan(_kolom(df, 'kondisi_sipil'), _kolom(df, 'kondisi_me'))
+    F = _min_pasangan(_kolom(df, 'nilai_fungsi_sipil'), _kolom(df, 'nilai_fungsi_me'))
+    return skor_urgensi(K, F, _kolom(df, 'luas_terdampak_aktual'), p)
+
+
+def skor_urgensi(K, F, A_as, p=PARAMETER_BAWAAN):
+    """Rumus skor dari array kondisi K, fungsi F, luas terdampak A (bisa di-broadcast, mis. matriks aset x tahun
+    atau skenario x aset dengan koefisien p berbentuk (skenario, 1))."""
+    # log10(A + 1) hanya untuk A > 0, selain itu (termasuk NaN) faktor = 0
+    Impact_Factor = np.log10(np.where(A_as > 0, A_as, 0.0) + 1)
+
+    Kerusakan_Fisik = (100 - K) * p.koef_kerusakan
+    Kegagalan_Fungsi = (100 - F) * p.koef_fungsi * p.bobot_fungsi
+
+    return (Kerusakan_Fisik + Kegagalan_Fungsi) * Impact_Factor
+
+
+def label_prioritas(skor, p=PARAMETER_BAWAAN):
+    """Kelas prioritas untuk array skor (np.select, bukan apply per baris)."""
+    skor = np.asarray(skor, dtype=float)
+    kondisi = [skor > b for b in p.batas_kelas]
+    return np.select(kondisi, LABEL_KELAS[:-1], default=LABEL_KELAS[-1])
+
+
+def hitung_prioritas(df, p=PARAMETER_BAWAAN):
+    """Tambahkan kolom Skor_Prioritas & Kelas_Prioritas lalu urutkan (satu lintasan kolom)."""
+    df = df.copy()
+    df['Skor_Prioritas'] = hitung_skor_urgensi(df, p)
+    df['Kelas_Prioritas'] = label_prioritas(df['Skor_Prioritas'].to_numpy(), p)
+    return df.sort_values(by='Skor_Prioritas', ascending=False)
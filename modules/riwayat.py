@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from modules.iksi import PARAMETER_BAWAAN
+from modules.prioritas import skor_urgensi, _min_pasangan
+
+# Kolom tahun prediksi per ambang p.batas_kelas (urutan sama: darurat, mendesak, perhatian)
+KOLOM_TAHUN_KELAS = ['tahun_darurat', 'tahun_mendesak', 'tahun_perhatian']
+
+# Prediksi di luar horizon ini (tahun sejak inspeksi terakhir) dianggap tidak diketahui
+HORIZON_TAHUN = 50
+
+KOLOM_RINGKASAN = ['aset_id', 'jumlah_inspeksi', 'tahun_acuan', 'tahun_terakhir', 'kondisi_terakhir', 'fungsi_terakhir',
+                   'laju_kondisi', 'laju_fungsi', 'skor_terakhir'] + KOLOM_TAHUN_KELAS
+
+
+def _per_grup(grup, nilai, G):
+    return np.bincount(grup, weights=nilai, minlength=G)
+
+
+def _terakhir(grup):
+    """Posisi baris terakhir tiap grup (data sudah urut grup, waktu)"""
+    return np.flatnonzero(np.r_[grup[1:] != grup[:-1], True]) if len(grup) else np.empty(0, dtype=int)
+
+
+def laju_kemerosotan(grup, t, y, acuan, G):
+    """Laju turun nilai (poin/tahun, >= 0) per grup sekaligus: kemiringan kuadrat terkecil y terhadap t
+    dari jumlah per grup (bincount). Grup yang hanya punya satu waktu inspeksi memakai titik acuan
+    (tahun bangun/rehab, nilai dianggap 100). Tidak ada data -> NaN."""
+    ok = ~np.isnan(y) & ~np.isnan(t)
+    g, tt, yy = grup[ok], t[ok], y[ok]
+    n = _per_grup(g, None, G)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Dipusatkan ke rata-rata grup agar jumlah kuadrat tahun (~2000^2) tidak kehilangan presisi
+        rt, ry = _per_grup(g, tt, G) / n, _per_grup(g, yy, G) / n
+        dt, dy = tt - rt[g], yy - ry[g]
+        stt, sty = _per_grup(g, dt * dt, G), _per_grup(g, dt * dy, G)
+        laju = np.where(stt > 0, -sty / stt, np.nan)
+
+        akhir = _terakhir(g)
+        t_akhir, y_akhir = np.full(G, np.nan), np.full(G, np.nan)
+        t_akhir[g[akhir]], y_akhir[g[akhir]] = tt[akhir], yy[akhir]
+        dari_acuan = (100 - y_akhir) / (t_akhir - acuan)
+    laju = np.where(np.isnan(laju) & (t_akhir > acuan), dari_acuan, laju)
+    return np.where(np.isnan(laju), np.nan, np.maximum(laju, 0))
+
+
+def proyeksi(K0, F0, A, laju_k, laju_f, dt, p=PARAMETER_BAWAAN):
+    """Kondisi, fungsi & skor urgensi (koefisien `p`) setelah dt tahun (turun linear, dibatasi 0-100).
+    Semua argumen di-broadcast, laju NaN dianggap 0 (tidak ada tren)."""
+    K = np.clip(K0 - np.nan_to_num(laju_k) * dt, 0, 100)
+    F = np.clip(F0 - np.nan_to_num(laju_f) * dt, 0, 100)
+    return K, F, skor_urgensi(K, F, A, p)
+
+
+def _waktu_lewat(K0, F0, A, laju_k, laju_f, p=PARAMETER_BAWAAN):
+    """Tahun (sejak inspeksi terakhir) sampai skor > tiap ambang p.batas_kelas, per aset (kolom = ambang).
+    Skor naik linear per bagian dengan titik patah saat K atau F menyentuh 0, jadi cukup dihitung
+    di 3 titik patah lalu diinterpolasi; setelah titik patah terakhir skor konstan."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        patah_k = np.where(laju_k > 0, np.clip(K0, 0, 100) / laju_k, 0)
+        patah_f = np.where(laju_f > 0, np.clip(F0, 0, 100) / laju_f, 0)
+    d = np.sort(np.c_[np.zeros(len(K0)), np.nan_to_num(patah_k), np.nan_to_num(patah_f)], axis=1)
+    _, _, S = proyeksi(K0[:, None], F0[:, None], A[:, None], laju_k[:, None], laju_f[:, None], d, p)
+
+    hasil = np.full((len(K0), len(p.batas_kelas)), np.nan)
+    for k, batas in enumerate(p.batas_kelas):
+        h = hasil[:, k]
+        h[S[:, 0] > batas] = 0
+        for j in range(2):
+            s0, s1 = S[:, j], S[:, j + 1]
+            kena = np.isnan(h) & (s0 <= batas) & (s1 > batas)
+            h[kena] = d[kena, j] + (batas - s0[kena]) / (s1[kena] - s0[kena]) * (d[kena, j + 1] - d[kena, j])
+    return hasil
+
+
+def hitung_ringkasan(df, p=PARAMETER_BAWAAN):
+    """Riwayat inspeksi (satu baris per inspeksi, urut aset_id lalu waktu) -> satu baris per aset:
+    kondisi & fungsi terakhir, laju kemerosotan, skor saat ini dan tahun prediksi melewati tiap
+    ambang prioritas (koefisien & ambang dari `p`, sama dengan label_prioritas). Kolom: aset_id, tahun (desimal), kondisi_sipil, kondisi_me, nilai_fungsi_sipil,
+    nilai_fungsi_me, luas_terdampak_aktual, tahun_bangun, tahun_rehab_terakhir."""
+    if df.empty: return pd.DataFrame(columns=KOLOM_RINGKASAN)
+    kolom = {k: pd.to_numeric(df[k], errors='coerce').to_numpy(dtype=float) for k in df.columns if k != 'aset_id'}
+    aset, grup = np.unique(df['aset_id'].to_numpy(), return_inverse=True)
+    G, t = len(aset), kolom['tahun']
+
+    # Titik acuan = rehab terakhir (jika ada) atau tahun bangun; inspeksi sebelum rehab tidak dipakai
+    acuan_baris = np.fmax(*(np.where(kolom[k] > 0, kolom[k], np.nan)
+                            for k in ('tahun_bangun', 'tahun_rehab_terakhir')))
+    akhir = _terakhir(grup)
+    acuan = acuan_baris[akhir]
+    sesudah = np.isnan(acuan_baris) | ~(t < acuan_baris)
+
+    K = np.where(sesudah, _min_pasangan(kolom['kondisi_sipil'], kolom['kondisi_me']), np.nan)
+    F = np.where(sesudah, _min_pasangan(kolom['nilai_fungsi_sipil'], kolom['nilai_fungsi_me']), np.nan)
+    laju_k = laju_kemerosotan(grup, t, K, acuan, G)
+    laju_f = laju_kemerosotan(grup, t, F, acuan, G)
+
+    # Titik awal proyeksi = inspeksi terakhir apa adanya (sama dengan yang dipakai label_prioritas)
+    K0 = _min_pasangan(kolom['kondisi_sipil'], kolom['kondisi_me'])[akhir]
+    F0 = _min_pasangan(kolom['nilai_fungsi_sipil'], kolom['nilai_fungsi_me'])[akhir]
+    A0, t0 = kolom['luas_terdampak_aktual'][akhir], t[akhir]
+    lewat = _waktu_lewat(K0, F0, A0, laju_k, laju_f, p)
+    tahun = np.where(lewat <= HORIZON_TAHUN, np.floor(t0[:, None] + lewat), np.nan)
+
+    hasil = pd.DataFrame({
+        'aset_id': aset, 'jumlah_inspeksi': np.bincount(grup, minlength=G), 'tahun_acuan': acuan,
+        'tahun_terakhir': t0, 'kondisi_terakhir': K0, 'fungsi_terakhir': F0,
+        'laju_kondisi': laju_k, 'laju_fungsi': laju_f, 'skor_terakhir': skor_urgensi(K0, F0, A0, p),
+    })
+    for k, nama in enumerate(KOLOM_TAHUN_KELAS):
+        hasil[nama] = pd.array(tahun[:, k], dtype='Int64')
+    return hasil
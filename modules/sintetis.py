@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+
+from modules.impor_pai import JENIS_PAI
+
+# Peluang jenis aset: saluran & bangunan bagi/sadap paling banyak, seperti DI sungguhan
+_JENIS = sorted(set(JENIS_PAI.values()))
+_BOBOT_JENIS = np.array([6.0 if n in ('Saluran', 'Bangunan Sadap', 'Bangunan Bagi') else
+                         3.0 if n in ('Gorong-Gorong', 'Jembatan', 'Tanggul', 'Jalan Inspeksi') else 1.0
+                         for n, _ in _JENIS])
+_BAHAN = ['beton', 'pasangan batu', 'tanah', 'baja']
+
+
+def _master(rng, awal, n):
+    idx = rng.choice(len(_JENIS), n, p=_BOBOT_JENIS / _BOBOT_JENIS.sum())
+    tahun_bangun = rng.integers(1970, 2021, n)
+    rehab = np.where(rng.random(n) < 0.4, tahun_bangun + rng.integers(5, 30, n), 0).clip(max=2024)
+    panjang, b, h = rng.lognormal(4, 1, n).round(1), rng.uniform(0.5, 8, n).round(2), rng.uniform(0.5, 4, n).round(2)
+    q, bahan = rng.lognormal(0, 1.2, n).round(3), rng.choice(_BAHAN, n)
+    luas, nilai = rng.lognormal(4, 1, n).round(1), np.round(rng.lognormal(20, 1, n), -5)
+    for k, (j, t, r, p, lb, tg, d, bh, l, v) in enumerate(zip(*(x.tolist() for x in (
+            idx, tahun_bangun, rehab, panjang, b, h, q, bahan, luas, nilai)))):
+        nama, satuan = _JENIS[j]
+        a = awal + k
+        detail = json.dumps({'panjang': p, 'b': lb, 'h': tg, 'q': d, 'bahan': bh})
+        yield (a, f"SIN-{a:07d}", f"{nama} {a}", nama, satuan, t, r, detail, l, v)
+
+
+def _inspeksi(rng, aset, per_aset):
+    """Riwayat per aset: kondisi awal + laju kemerosotan acak, satu inspeksi tiap 1-3 tahun"""
+    n = len(aset) * per_aset
+    aset_id = np.repeat(aset, per_aset)
+    tahun = 2024 - np.cumsum(rng.integers(1, 4, (len(aset), per_aset)), axis=1)[:, ::-1].ravel() + 1
+    laju = np.repeat(rng.gamma(2, 1.5, len(aset)), per_aset)
+    dasar = np.repeat(rng.uniform(70, 100, len(aset)), per_aset)
+    umur = (tahun.reshape(len(aset), per_aset) - tahun.reshape(len(aset), per_aset)[:, :1]).ravel()
+    ks = (dasar - laju * umur + rng.normal(0, 4, n)).clip(0, 100).round()
+    kme = (dasar - 1.3 * laju * umur + rng.normal(0, 6, n)).clip(0, 100).round()
+    fs = np.select([ks >= 70, ks >= 45], [100.0, 70.0], 40.0)
+    fme = np.select([kme >= 60, kme >= 30], [100.0, 70.0], 0.0)
+    bulan, hari = rng.integers(1, 13, n), rng.integers(1, 29, n)
+    tanggal = [f"{t}-{b:02d}-{d:02d}" for t, b, d in zip(tahun.tolist(), bulan.tolist(), hari.tolist())]
+    return zip(aset_id.tolist(), tanggal, ks.tolist(), kme.tolist(), fs.tolist(), fme.tolist(),
+               rng.lognormal(4, 1.2, n).round(1).tolist(), np.round(rng.lognormal(19.5, 1, n), -5).tolist())
+
+
+def isi_sintetis(app, jumlah_aset, inspeksi_per_aset=2, jumlah_tanam=40, seed=0, ukuran_batch=50_000):
+    """Isi `app` (IrigasiBackend) dengan data sintetis untuk uji beban & benchmark: `jumlah_aset` master
+    (jenis, tahun, dimensi teknis JSON) + `inspeksi_per_aset` inspeksi berurutan waktu dengan kemerosotan
+    acak per aset + data tanam. Ditambahkan setelah id master terbesar, per batch `ukuran_batch` aset
+    (satu transaksi per batch). Return (jumlah master, jumlah inspeksi)."""
+    rng = np.random.default_rng(seed)
+    with app._baca() as conn:
+        awal = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM master_aset").fetchone()[0]
+    for mulai in range(0, jumlah_aset, ukuran_batch):
+        n = min(ukuran_batch, jumlah_aset - mulai)
+        with app._tulis() as cur:
+            cur.executemany('''INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset, satuan, tahun_bangun,
+                tahun_rehab_terakhir, dimensi_teknis, luas_layanan_desain, nilai_aset_baru)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', _master(rng, awal + mulai, n))
+            if inspeksi_per_aset:
+                cur.executemany('''INSERT INTO inspeksi_aset (aset_id, tanggal_inspeksi, kondisi_sipil, kondisi_me,
+                    nilai_fungsi_sipil, nilai_fungsi_me, luas_terdampak_aktual, estimasi_biaya)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', _inspeksi(rng, np.arange(awal + mulai, awal + mulai + n), inspeksi_per_aset))
+    if jumlah_tanam:
+        debit, butuh = rng.uniform(200, 1500, jumlah_tanam), rng.uniform(400, 1200, jumlah_tanam)
+        with app._tulis('data_tanam') as cur:
+            cur.executemany("INSERT INTO data_tanam (musim, luas_rencana, luas_realisasi, debit_andalan, kebutuhan_air, faktor_k) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            zip(rng.choice(['MT1', 'MT2', 'MT3'], jumlah_tanam).tolist(), rng.uniform(500, 5000, jumlah_tanam).tolist(),
+                                rng.uniform(300, 5000, jumlah_tanam).tolist(), debit.tolist(), butuh.tolist(),
+                                (debit / butuh).round(2).tolist()))
+    return jumlah_aset, jumlah_aset * inspeksi_per_aset
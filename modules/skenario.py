@@ -0,0 +1,106 @@
+import itertools
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from modules.iksi import ParameterPenilaian, PARAMETER_BAWAAN, NAMA_PARAMETER, skor_fisik, gabung_iksi
+from modules.prioritas import skor_urgensi
+
+KOLOM_KELAS = ['darurat', 'mendesak', 'perhatian', 'rutin']
+
+
+def grid_parameter(dasar=PARAMETER_BAWAAN, **rentang):
+    """Semua kombinasi nilai `rentang` (nama field -> daftar nilai) di atas parameter `dasar`"""
+    asing = set(rentang) - set(NAMA_PARAMETER)
+    if asing: raise ValueError(f"Parameter tidak dikenal: {', '.join(sorted(asing))}")
+    return [replace(dasar, **dict(zip(rentang, nilai))) for nilai in itertools.product(*rentang.values())]
+
+
+def tumpuk_parameter(daftar):
+    """Daftar ParameterPenilaian -> satu ParameterPenilaian berisi array (skenario, 1)"""
+    return ParameterPenilaian(**{n: np.array([getattr(p, n) for p in daftar], dtype=float)[:, None]
+                                 for n in NAMA_PARAMETER})
+
+
+def _basis_skor(K, F, A):
+    """Skor urgensi linear terhadap koefisien: skor = koef_kerusakan x X + (koef_fungsi x bobot_fungsi) x Y.
+    X, Y dihitung sekali per aset lewat skor_urgensi dengan koefisien satuan."""
+    satu = replace(PARAMETER_BAWAAN, koef_kerusakan=1.0, koef_fungsi=1.0, bobot_fungsi=1.0)
+    return skor_urgensi(K, np.full_like(F, 100.0), A, satu), skor_urgensi(np.full_like(K, 100.0), F, A, satu)
+
+
+def _kelas(skor, p):
+    """Indeks kelas (0 = darurat .. 3 = rutin), urutan ambang sama dengan label_prioritas: ditimpa dari
+    kelas teringan ke terberat, jadi ambang yang lebih berat menang seperti np.select"""
+    kelas = np.full(np.shape(skor), 3, dtype=np.int8)
+    for k, batas in ((2, p.batas_perhatian), (1, p.batas_mendesak), (0, p.batas_darurat)):
+        np.copyto(kelas, k, where=skor > batas)
+    return kelas
+
+
+def _teratas(skor, aset_id, top):
+    """aset_id `top` skor tertinggi per baris (argpartition, lalu diurutkan), NaN di belakang"""
+    s = np.where(np.isnan(skor), -np.inf, skor)
+    top = min(top, s.shape[1])
+    idx = np.argpartition(-s, top - 1, axis=1)[:, :top] if top < s.shape[1] else np.tile(np.arange(top), (len(s), 1))
+    urut = np.argsort(-np.take_along_axis(s, idx, 1), axis=1, kind='stable')
+    return aset_id[np.take_along_axis(idx, urut, 1)]
+
+
+def _skor_tanam(faktor_k, P):
+    """Rata-rata nilai_tanam per skenario dari jumlah faktor K di atas tiap ambang (searchsorted atas
+    faktor K terurut, bukan matriks skenario x baris tanam)"""
+    if not len(faktor_k): return np.zeros(len(P.batas_fk_baik))
+    fk = np.sort(faktor_k[~np.isnan(faktor_k)])
+    n_baik = len(fk) - np.searchsorted(fk, P.batas_fk_baik[:, 0], side='left')
+    n_cukup = np.maximum(len(fk) - np.searchsorted(fk, P.batas_fk_cukup[:, 0], side='left') - n_baik, 0)
+    n_kurang = len(faktor_k) - n_baik - n_cukup
+    total = n_baik * P.nilai_fk_baik[:, 0] + n_cukup * P.nilai_fk_cukup[:, 0] + n_kurang * P.nilai_fk_kurang[:, 0]
+    return total / len(faktor_k)
+
+
+def evaluasi_skenario(data, daftar_parameter, acuan=PARAMETER_BAWAAN, top=10, ukuran_blok=4_000_000):
+    """IKSI & peringkat prioritas untuk banyak ParameterPenilaian sekaligus atas data yang sama.
+
+    `data`: dict aset_id, K, F, A (array per aset, dari inspeksi terakhir), total_gl, total_area,
+    ada_fisik, faktor_k (lihat IrigasiBackend.data_skenario). Matriks skor skenario x aset dihitung
+    per blok <= `ukuran_blok` elemen. Hasil satu baris per skenario: parameter yang divariasikan,
+    IKSI, jumlah aset per kelas, aset yang pindah kelas & irisan `top` teratas terhadap `acuan`."""
+    daftar_parameter = list(daftar_parameter)
+    if not daftar_parameter: raise ValueError("Daftar skenario kosong")
+    P = tumpuk_parameter(daftar_parameter)
+    S, aset_id = len(daftar_parameter), np.asarray(data['aset_id'])
+
+    skor_f = skor_fisik(data['total_gl'], data['total_area'], data['ada_fisik'], P)
+    skor_t = _skor_tanam(np.asarray(data['faktor_k'], dtype=float), P)
+    iksi = np.broadcast_to(gabung_iksi(skor_f, skor_t[:, None], P), (S, 1))[:, 0]
+
+    jumlah_kelas = np.zeros((S, len(KOLOM_KELAS)), dtype=np.int64)
+    pindah, irisan = np.zeros(S, dtype=np.int64), np.zeros(S)
+    teratas = np.zeros((S, min(top, len(aset_id))), dtype=aset_id.dtype)
+    if len(aset_id):
+        X, Y = _basis_skor(*(np.asarray(data[k], dtype=float) for k in ('K', 'F', 'A')))
+        skor_acuan = acuan.koef_kerusakan * X + (acuan.koef_fungsi * acuan.bobot_fungsi) * Y
+        kelas_acuan, top_acuan = _kelas(skor_acuan, acuan), _teratas(skor_acuan[None], aset_id, top)[0]
+        blok = max(1, ukuran_blok // len(aset_id))
+        for a in range(0, S, blok):
+            Pb = ParameterPenilaian(**{n: getattr(P, n)[a:a + blok] for n in NAMA_PARAMETER})
+            skor = Pb.koef_kerusakan * X + (Pb.koef_fungsi * Pb.bobot_fungsi) * Y
+            kelas = _kelas(skor, Pb)
+            for k in range(len(KOLOM_KELAS)): jumlah_kelas[a:a + blok, k] = (kelas == k).sum(1)
+            pindah[a:a + blok] = (kelas != kelas_acuan).sum(1)
+            teratas[a:a + blok] = _teratas(skor, aset_id, top)
+        irisan = (teratas[:, :, None] == top_acuan[None, None, :]).any(2).sum(1) / max(len(top_acuan), 1)
+
+    # Kolom parameter hanya yang nilainya berbeda antar skenario
+    hasil = pd.DataFrame({n: getattr(P, n)[:, 0] for n in NAMA_PARAMETER
+                          if np.ptp(getattr(P, n)) > 0})
+    hasil['IKSI'] = iksi
+    hasil['skor_fisik'] = np.broadcast_to(np.asarray(skor_f, dtype=float), (S, 1))[:, 0]
+    hasil['skor_tanam'] = skor_t
+    for k, nama in enumerate(KOLOM_KELAS): hasil[nama] = jumlah_kelas[:, k]
+    hasil['pindah_kelas'] = pindah
+    hasil[f'irisan_top{top}'] = irisan
+    hasil[f'top{top}'] = teratas.tolist()
+    return hasil
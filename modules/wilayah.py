@@ -0,0 +1,183 @@
+import atexit
+import multiprocessing as mp
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+import pandas as pd
+
+from modules.backend import IrigasiBackend
+from modules.iksi import ParameterPenilaian, PARAMETER_BAWAAN, skor_fisik, gabung_iksi
+from modules.prioritas import LABEL_KELAS
+
+# Kode DI dipakai sebagai nama file shard
+POLA_KODE = re.compile(r'^[A-Za-z0-9_-]{1,40}$')
+
+# --- SISI PROSES WORKER ---
+# path -> backend khusus rekap, dipakai ulang antar rekap (cache agregat ikut awet). Juga dipakai rekap
+# serial di proses utama: terpisah dari backend sesi, jadi rekap tidak menutup/mengubah backend yang dipakai user.
+_backend_worker = OrderedDict()
+_kunci_worker = threading.Lock()
+MAKS_BACKEND_WORKER = 128
+
+
+def _agregat_di(path, parameter, top):
+    with _kunci_worker:
+        app = _backend_worker.pop(path, None) or IrigasiBackend(path, pool_baca=1)
+        _backend_worker[path] = app
+        while len(_backend_worker) > MAKS_BACKEND_WORKER:
+            _backend_worker.popitem(last=False)[1].tutup()
+        p = ParameterPenilaian(**parameter)
+        if p != app.parameter: app.atur_parameter(p, ringkasan=False)
+        return app.agregat_iksi(top)
+
+
+def _sidik_file(path):
+    """Sidik perubahan shard tanpa membuka koneksi: (mtime, ukuran) file DB, ukuran & salt header WAL.
+    Commit menambah frame WAL, reset WAL mengganti salt, checkpoint mengubah file DB. WAL kosong sama
+    dengan tidak ada: sekadar membuka koneksi tidak mengubah sidik."""
+    st = os.stat(path)
+    try:
+        with open(f"{path}-wal", 'rb') as f:
+            kepala, ukuran = f.read(32), os.fstat(f.fileno()).st_size
+    except FileNotFoundError:
+        kepala, ukuran = b'', 0
+    return st.st_mtime_ns, st.st_size, ukuran, kepala[16:24]
+
+
+def ringkas_agregat(bagian, p=PARAMETER_BAWAAN):
+    """Gabungkan agregat parsial (IrigasiBackend.agregat_iksi) dari satu atau banyak DI -> skor fisik
+    tertimbang luas, skor tanam, IKSI; hasilnya sama dengan menghitung semua aset dalam satu DB."""
+    total_gl = sum(b['total_gl'] for b in bagian)
+    total_area = sum(b['total_area'] for b in bagian)
+    total_nk, jumlah_tanam = sum(b['total_nk'] for b in bagian), sum(b['jumlah_tanam'] for b in bagian)
+    skor_f = skor_fisik(total_gl, total_area, any(b['jumlah_fisik'] for b in bagian), p)
+    skor_t = total_nk / jumlah_tanam if jumlah_tanam else 0
+    hasil = {'IKSI': gabung_iksi(skor_f, skor_t, p), 'skor_fisik': skor_f, 'skor_tanam': skor_t,
+             'luas_terdampak': total_area, 'jumlah_aset': sum(b['jumlah_fisik'] for b in bagian)}
+    for label in LABEL_KELAS:
+        hasil[label] = sum(b['kelas'].get(label, 0) for b in bagian)
+        hasil[f"biaya {label}"] = sum(b['biaya_kelas'].get(label, 0.0) for b in bagian)
+    return hasil
+
+
+class RegistriDI:
+    """Mode multi-DI: satu file SQLite per Daerah Irigasi di `folder`, didaftar di `folder`/registri.db.
+
+    backend(kode) membuka IrigasiBackend DI tersebut; registri memegang maksimal `maks_terbuka` backend
+    (LRU). Backend yang keluar dari LRU tidak ditutup paksa: selama masih dipegang sesi lain ia tetap
+    hidup & dipakai ulang, dan menutup dirinya sendiri begitu tidak direferensikan lagi. rekap_provinsi() menghitung agregat tiap DI di ProcessPoolExecutor
+    lalu menjumlahkan agregat parsialnya, tanpa menggabungkan baris mentah antar DB. Agregat per DI
+    disimpan bersama sidik file-nya, jadi rekap berikutnya hanya menghitung ulang DI yang berubah.
+    `pelacak` (modules.instrumen.Pelacak) dipasang di tiap backend DI yang dibuka."""
+
+    def __init__(self, folder='database/di', maks_terbuka=16, maks_proses=None, pelacak=None):
+        self.folder = folder
+        self.pelacak = pelacak
+        os.makedirs(folder, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(folder, 'registri.db'), check_same_thread=False)
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS daerah_irigasi (
+            kode TEXT PRIMARY KEY, nama TEXT, kabupaten TEXT, luas_baku REAL, file TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        self.conn.commit()
+        self._kunci = threading.Lock()
+        self._terbuka = OrderedDict()
+        self._dilepas = weakref.WeakValueDictionary()   # kode -> backend yang keluar dari LRU tapi masih dipakai
+        self._maks_terbuka = maks_terbuka
+        self._maks_proses = maks_proses or os.cpu_count() or 1
+        self._pool = None
+        self._agregat = {}   # path -> (sidik file, parameter, top, agregat parsial)
+
+    # --- DAFTAR DI ---
+    def tambah(self, kode, nama, kabupaten=None, luas_baku=None):
+        try:
+            if not POLA_KODE.match(kode or ''): raise ValueError("Kode hanya huruf, angka, - dan _ (maks 40)")
+            with self._kunci, self.conn:
+                self.conn.execute("INSERT INTO daerah_irigasi (kode, nama, kabupaten, luas_baku, file) VALUES (?, ?, ?, ?, ?)",
+                                  (kode, nama, kabupaten, luas_baku, f"{kode}.db"))
+            self.backend(kode)  # buat file & skema
+            return f"✅ DI {nama} Terdaftar!"
+        except sqlite3.IntegrityError: return f"❌ Gagal: kode DI {kode} sudah terdaftar"
+        except Exception as e: return f"❌ Gagal: {e}"
+
+    def hapus(self, kode):
+        """Keluarkan DI dari registri (file database-nya tidak dihapus)"""
+        with self._kunci:
+            # Tidak ditutup paksa: sesi yang masih memegangnya selesai dulu (backend tertutup sendiri)
+            self._terbuka.pop(kode, None)
+            self._dilepas.pop(kode, None)
+            with self.conn: self.conn.execute("DELETE FROM daerah_irigasi WHERE kode = ?", (kode,))
+        return "✅ DI dikeluarkan dari registri (file database tetap disimpan)"
+
+    def daftar(self):
+        with self._kunci:
+            return pd.read_sql("SELECT kode, nama, kabupaten, luas_baku, file FROM daerah_irigasi ORDER BY kode", self.conn)
+
+    def path(self, kode):
+        with self._kunci:
+            baris = self.conn.execute("SELECT file FROM daerah_irigasi WHERE kode = ?", (kode,)).fetchone()
+        if baris is None: raise ValueError(f"DI tidak terdaftar: {kode}")
+        return os.path.join(self.folder, baris[0])
+
+    def backend(self, kode):
+        """IrigasiBackend DI `kode` (dibuka sekali, dipakai ulang)"""
+        path = self.path(kode)
+        with self._kunci:
+            app = self._terbuka.pop(kode, None) or self._dilepas.pop(kode, None) \
+                or IrigasiBackend(path, pelacak=self.pelacak)
+            self._terbuka[kode] = app
+            while len(self._terbuka) > self._maks_terbuka:
+                lama, lepas = self._terbuka.popitem(last=False)
+                self._dilepas[lama] = lepas
+            return app
+
+    # --- REKAP PROVINSI ---
+    def _pool_siap(self):
+        if self._pool is None:
+            # spawn, sama seperti antrian laporan (proses Streamlit punya banyak thread)
+            self._pool = ProcessPoolExecutor(self._maks_proses, mp_context=mp.get_context('spawn'))
+            atexit.register(self.tutup)
+        return self._pool
+
+    def tutup(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        with self._kunci:
+            while self._terbuka: self._terbuka.popitem()[1].tutup()
+
+    def rekap_provinsi(self, kode=None, parameter=PARAMETER_BAWAAN, top=20, paralel=True):
+        """Rekap IKSI & prioritas seluruh DI (atau daftar `kode`). Agregat tiap DI dihitung paralel
+        (satu tugas per DI), lalu digabung. Kembalikan (rekap per DI, rekap provinsi, `top` prioritas
+        teratas provinsi)."""
+        di = self.daftar()
+        if kode is not None: di = di[di['kode'].isin(kode)]
+        if di.empty: return pd.DataFrame(), {}, pd.DataFrame()
+        path = [os.path.join(self.folder, f) for f in di['file']]
+
+        # Hanya DI yang file-nya berubah sejak rekap terakhir (atau parameter/top berbeda) yang dihitung
+        sidik = {p: _sidik_file(p) for p in path}
+        hasil = {p: a[3] for p, a in self._agregat.items() if p in sidik and a[:3] == (sidik[p], parameter, top)}
+        ubah = [(k, p) for k, p in zip(di['kode'], path) if p not in hasil]
+        if paralel and len(ubah) > 1 and self._maks_proses > 1:
+            potongan = max(1, len(ubah) // (4 * self._maks_proses))
+            baru = self._pool_siap().map(_agregat_di, [p for _, p in ubah], [asdict(parameter)] * len(ubah),
+                                         [top] * len(ubah), chunksize=potongan)
+        else:
+            baru = [_agregat_di(p, asdict(parameter), top) for _, p in ubah]
+        for (_, p), agregat in zip(ubah, baru):
+            hasil[p] = agregat
+            self._agregat[p] = (sidik[p], parameter, top, agregat)
+        bagian = [hasil[p] for p in path]
+
+        per_di = pd.DataFrame([{'kode': k, 'nama': n, **ringkas_agregat([b], parameter)}
+                               for k, n, b in zip(di['kode'], di['nama'], bagian)])
+        teratas = pd.DataFrame([{'kode_di': k, **baris} for k, b in zip(di['kode'], bagian) for baris in b['top']])
+        if not teratas.empty:
+            teratas = teratas.sort_values('Skor_Prioritas', ascending=False).head(top).reset_index(drop=True)
+        return per_di, ringkas_agregat(bagian, parameter), teratas
@@ -0,0 +1,19 @@
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.instrumen import Pelacak
+from modules.sintetis import isi_sintetis
+
+UKURAN = [pytest.param(10_000, id='10k'), pytest.param(100_000, id='100k'),
+          pytest.param(1_000_000, id='1M', marks=pytest.mark.sangat_besar)]
+
+
+@pytest.fixture(scope='module', params=UKURAN)
+def sintetis(request, tmp_path_factory):
+    """(IrigasiBackend + Pelacak, jumlah aset): data sintetis n aset x 3 inspeksi, dibagi satu modul test"""
+    n = request.param
+    app = IrigasiBackend(str(tmp_path_factory.mktemp(f"sintetis_{n}") / 'bench.db'), pelacak=Pelacak())
+    isi_sintetis(app, n, 3)
+    app.segarkan_ringkasan()   # tunggu ringkasan (biasanya diisi thread latar) agar benchmark mulai dari keadaan tetap
+    yield app, n
+    app.tutup()
@@ -0,0 +1,68 @@
+"""pilih_paket: tidak pernah melewati anggaran, optimal bila inti DP mencakup semua kandidat dengan
+resolusi biaya penuh, dan dekat optimum (di bawah batas atas LP) dengan pengaturan bawaan."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.anggaran import manfaat_penanganan, pilih_paket, rencana_anggaran
+
+
+def optimum_eksak(nilai, biaya, kapasitas):
+    """Knapsack 0/1 DP penuh atas biaya bulat -> nilai optimum"""
+    terbaik = np.zeros(kapasitas + 1)
+    for v, w in zip(nilai, biaya.astype(int)):
+        if w <= kapasitas: terbaik[w:] = np.maximum(terbaik[w:], terbaik[:kapasitas + 1 - w] + v)
+    return terbaik[-1]
+
+
+def instance(seed, n):
+    rng = np.random.default_rng(seed)
+    nilai, biaya = rng.uniform(1, 100, n), rng.integers(1, 200, n).astype(float)
+    return nilai, biaya, int(biaya.sum() // 4)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_optimal_dengan_inti_penuh(seed):
+    nilai, biaya, kapasitas = instance(seed, 40)
+    pilih, batas_atas = pilih_paket(nilai, biaya, kapasitas, ukuran_inti=40, resolusi=kapasitas)
+    optimum = optimum_eksak(nilai, biaya, kapasitas)
+    assert biaya[pilih].sum() <= kapasitas
+    assert nilai[pilih].sum() == pytest.approx(optimum)
+    assert optimum <= batas_atas + 1e-9
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bawaan_dekat_optimum(seed):
+    nilai, biaya, kapasitas = instance(100 + seed, 300)
+    pilih, batas_atas = pilih_paket(nilai, biaya, kapasitas, ukuran_inti=100)
+    optimum = optimum_eksak(nilai, biaya, kapasitas)
+    assert biaya[pilih].sum() <= kapasitas
+    assert optimum * (1 - 1e-3) <= nilai[pilih].sum() <= optimum + 1e-9 <= batas_atas + 1e-9
+
+
+def test_kasus_tepi():
+    nilai, biaya = np.array([5.0, 0.0, 3.0, 4.0, np.nan]), np.array([2.0, 1.0, 0.0, 9.0, 1.0])
+    # Manfaat 0, biaya 0/NaN dan kandidat yang lebih mahal dari anggaran tidak pernah dipilih
+    pilih, _ = pilih_paket(np.nan_to_num(nilai), biaya, 5)
+    assert pilih.tolist() == [True, False, False, False, False]
+    # Anggaran cukup untuk semua: semua kandidat bernilai diambil, batas atas = total manfaat
+    pilih, batas_atas = pilih_paket([1.0, 2.0], [1.0, 1.0], 10)
+    assert pilih.all() and batas_atas == 3.0
+    assert not pilih_paket([1.0], [5.0], 1)[0].any()
+
+
+def test_rencana_multi_tahun():
+    rng = np.random.default_rng(3)
+    n = 200
+    df = pd.DataFrame({'aset_id': np.arange(n), 'Skor_Prioritas': rng.uniform(0, 200, n),
+                       'luas_terdampak_aktual': rng.uniform(0, 50, n), 'estimasi_biaya': rng.integers(1, 100, n) * 1e6})
+    anggaran = [1e9, 5e8, 2e9]
+    terpilih, ringkasan = rencana_anggaran(df, anggaran, bawa_sisa=True)
+    assert terpilih['aset_id'].is_unique   # aset yang sudah ditangani tidak dipilih lagi tahun berikutnya
+    sisa = 0.0
+    for baris in ringkasan.itertuples():
+        assert baris.anggaran == pytest.approx(anggaran[baris.tahun_ke - 1] + sisa)   # sisa tahun lalu terbawa
+        biaya = terpilih.loc[terpilih['tahun_ke'] == baris.tahun_ke, 'estimasi_biaya'].sum()
+        assert biaya == pytest.approx(baris.terpakai) and biaya <= baris.anggaran
+        sisa = baris.anggaran - baris.terpakai
+    assert terpilih['Manfaat'].to_numpy() == pytest.approx(manfaat_penanganan(terpilih))
@@ -0,0 +1,98 @@
+"""Backup streaming (export_ke_file / export_ke_json) lalu restore (import_dari_json) mengembalikan isi
+semua tabel data apa adanya, di semua format (json, jsonl, polos & .gz). Reset (hapus_semua_data)
+membatalkan cache semua tabel yang dihapus."""
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from modules.backend import IrigasiBackend, TABEL_DATA
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'asal.db'))
+    app.tambah_master_aset("Bendung Cibeet", "Bendung", "Unit", 1980, 2015, 1200.5, 2.5e9, {"h": 3.2, "bahan": "Beton"})
+    app.tambah_master_aset("Saluran Sekunder Citarum ÉÖ", "Saluran", "m", 1975, None, None, 0, {"panjang": 1200})
+    app.tambah_inspeksi(1, "Budi", 60, 45.5, 70, 100, 12.25, "Perbaikan pintu", 1.5e8,
+                        waktu=pd.Timestamp('2024-03-01 08:30'))
+    app.tambah_inspeksi(2, None, 80, None, 100, 70, 0, None, None, waktu=pd.Timestamp('2025-01-15'))
+    app.tambah_data_tanam_lengkap("MT1", 100, 90, 120, 100, 5.5, 2)
+    app.tambah_data_p3a("P3A Tirta", "Desa 'Kutawaringin'", "Berbadan hukum", "Aktif", 45)
+    app.tambah_sdm_sarana("Petugas", "Juru \"Pengairan\"", "Baik", "baris\nbaru")
+    with app._tulis('data_dokumentasi') as cur:
+        cur.executemany("INSERT INTO data_dokumentasi (jenis_dokumen, ada) VALUES (?, ?)", [("Peta", 1), ("Skema", 0)])
+    yield app
+    app.tutup()
+
+
+def isi_tabel(app):
+    with app._baca() as conn:
+        return {t: pd.read_sql(f"SELECT * FROM {t} ORDER BY 1", conn) for t in TABEL_DATA}
+
+
+def sama(a, b):
+    for t in TABEL_DATA:
+        pd.testing.assert_frame_equal(a[t], b[t], check_dtype=False, obj=t)
+
+
+@pytest.mark.parametrize('nama', ['backup.json', 'backup.jsonl', 'backup.json.gz', 'backup.jsonl.gz'])
+def test_backup_restore_bolak_balik(app, tmp_path, nama):
+    asal = isi_tabel(app)
+    path = str(tmp_path / nama)
+    assert app.export_ke_file(path, ukuran_batch=1).startswith("✅")
+
+    tujuan = IrigasiBackend(str(tmp_path / 'tujuan.db'))
+    tujuan.tambah_master_aset("Data lama", "Bendung", "Unit", 2000, 2000, 1, 1, {})   # terhapus saat restore
+    with open(path, 'rb') as f: pesan = tujuan.import_dari_json(f, ukuran_batch=1)
+    assert pesan.startswith("✅"), pesan
+    sama(isi_tabel(tujuan), asal)
+
+    # Kolom generated (dim_*) & FTS ikut terisi kembali; id baru melanjutkan id hasil restore
+    assert tujuan.cari_aset_teknis('Bendung', filter=[('tinggi', '>', 3)])['nama_aset'].tolist() == ["Bendung Cibeet"]
+    assert tujuan.cari_aset('citarum eo')['id'].tolist() == [2]
+    tujuan.tambah_master_aset("Aset baru", "Pintu air", "Unit", 2020, 2020, 1, 1, {})
+    assert tujuan.get_master_aset()['id'].max() == 3
+    tujuan.tutup()
+
+
+def test_export_ke_json_sama_dengan_isi_tabel(app):
+    data = json.loads(app.export_ke_json())
+    assert list(data) == TABEL_DATA
+    for t, df in isi_tabel(app).items():
+        assert len(data[t]) == len(df)
+        assert set(data[t][0]) == set(df.columns) - {c for c in df.columns if c.startswith('dim_')}
+    assert data['data_sdm_sarana'][0]['ket'] == "baris\nbaru"
+
+
+def test_restore_menolak_tabel_asing_tanpa_mengubah_data(app):
+    asal = isi_tabel(app)
+    for isi in [b'{"tabel_asing": [{"id": 1}]}', b'{"master_aset": [1, 2]}', b'{"master_aset": [{"id": 1']:
+        assert app.import_dari_json(io.BytesIO(isi)).startswith("❌")
+        sama(isi_tabel(app), asal)
+
+
+def test_hapus_semua_data_menyegarkan_cache(app, tmp_path):
+    kml = b'''<kml><Placemark><name>Bendung</name><Point><coordinates>110.1,-7.1</coordinates></Point></Placemark></kml>'''
+    assert app.impor_geometri_kmz(io.BytesIO(kml)).startswith("✅")
+    app.segarkan_ringkasan()
+    # Jumlah baris (cache per versi tabel) & hasil prioritas sudah ter-cache sebelum reset
+    assert all(app.hitung_baris(t) > 0 for t in TABEL_DATA)
+    assert len(app.get_prioritas_matematis()) == 2
+    versi = dict(app._versi)
+
+    assert app.hapus_semua_data().startswith("✅")
+    # Versi SEMUA tabel yang dihapus naik (data, geometri & ringkasan), bukan hanya TABEL_DATA
+    assert all(app._versi[t] > v for t, v in versi.items()), app._versi
+    assert {t: app.hitung_baris(t) for t in TABEL_DATA} == dict.fromkeys(TABEL_DATA, 0)
+    assert app.get_prioritas_matematis().empty
+    assert app.get_geometri_viewport(109, -8, 111, -6, 14)['features'] == []
+
+    # Tulisan koneksi lain (data_version berubah) juga menaikkan versi geometri & ringkasan
+    versi = dict(app._versi)
+    lain = IrigasiBackend(app.db_path)
+    assert lain.impor_geometri_kmz(io.BytesIO(kml)).startswith("✅")
+    lain.tutup()
+    assert app.hitung_baris('master_aset') == 0
+    assert all(app._versi[t] > v for t, v in versi.items()), app._versi
@@ -0,0 +1,130 @@
+"""Benchmark regresi IrigasiBackend (pytest-benchmark) di atas data sintetis 10k & 100k aset (1M: -m sangat_besar).
+Backend dipasangi Pelacak: jumlah SQL per panggilan ikut disimpan di extra_info hasil benchmark.
+
+    pytest tests/test_bench_backend.py --benchmark-autosave                       # simpan acuan
+    pytest tests/test_bench_backend.py --benchmark-compare --benchmark-compare-fail=min:25%
+"""
+import itertools
+import os
+import uuid
+
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.sintetis import isi_sintetis
+
+_seed = itertools.count(1)
+
+
+def record_lapangan(n, jumlah_aset):
+    seed = next(_seed)
+    return [{'uuid': str(uuid.UUID(int=seed << 64 | i)), 'aset_id': 1 + (i * 7919) % jumlah_aset,
+             'waktu_survei': '2025-06-01T09:00:00', 'nama_surveyor': 'Bench', 'kondisi_sipil': 60, 'kondisi_me': 55,
+             'nilai_fungsi_sipil': 70, 'nilai_fungsi_me': 70, 'luas_terdampak_aktual': 12.5, 'estimasi_biaya': 2.5e8}
+            for i in range(n)]
+
+
+def ukur(benchmark, app, fungsi, siapkan=None, rounds=None):
+    """Jalankan benchmark; rounds diisi = pedantic (untuk panggilan berat / butuh persiapan per ronde)"""
+    app.pelacak.reset()
+    if rounds: hasil = benchmark.pedantic(fungsi, setup=siapkan, rounds=rounds)
+    else: hasil = benchmark(fungsi)
+    catatan = app.pelacak.terakhir(10 ** 6)
+    if not catatan.empty:
+        teratas = catatan[catatan['kedalaman'] == 0]
+        benchmark.extra_info['sql_per_panggilan'] = float(teratas['jumlah_sql'].mean())
+    assert not (isinstance(hasil, str) and hasil.startswith("❌")), hasil
+    return hasil
+
+
+def test_isi_sintetis(benchmark, tmp_path):
+    urutan = itertools.count()
+
+    def siapkan():
+        return (IrigasiBackend(str(tmp_path / f"isi_{next(urutan)}.db")),), {}
+    hasil = benchmark.pedantic(lambda app: isi_sintetis(app, 10_000, 3), setup=siapkan, rounds=3)
+    assert hasil == (10_000, 30_000)
+
+
+def test_prioritas_dingin(benchmark, sintetis):
+    app, n = sintetis
+    df = ukur(benchmark, app, app.get_prioritas_matematis, siapkan=lambda: app.atur_parameter(None), rounds=5)
+    assert len(df) == n
+
+
+def test_prioritas_hangat(benchmark, sintetis):
+    app, n = sintetis
+    app.get_prioritas_matematis()
+    assert len(ukur(benchmark, app, app.get_prioritas_matematis)) == n
+
+
+def test_iksi_dingin(benchmark, sintetis):
+    app, _ = sintetis
+    iksi, _, _ = ukur(benchmark, app, app.hitung_iksi_lengkap, siapkan=lambda: app.atur_parameter(None), rounds=5)
+    assert 0 <= iksi <= 100
+
+
+def test_iksi_hangat(benchmark, sintetis):
+    app, _ = sintetis
+    app.hitung_iksi_lengkap()
+    ukur(benchmark, app, app.hitung_iksi_lengkap)
+
+
+def test_get_halaman(benchmark, sintetis):
+    app, _ = sintetis
+    assert len(ukur(benchmark, app, lambda: app.get_halaman('master_aset', batas=50))['data']) == 50
+
+
+def test_cari_aset(benchmark, sintetis):
+    app, _ = sintetis
+    assert not ukur(benchmark, app, lambda: app.cari_aset('bendung', batas=20)).empty
+
+
+def test_ringkasan_kondisi(benchmark, sintetis):
+    app, _ = sintetis
+    assert len(ukur(benchmark, app, lambda: app.get_ringkasan_kondisi(batas=50))) == 50
+
+
+def test_tambah_inspeksi(benchmark, sintetis):
+    app, n = sintetis
+    aset = itertools.count()
+    ukur(benchmark, app, lambda: app.tambah_inspeksi(1 + next(aset) % n, 'Bench', 50, 50, 70, 70, 10, '', 1e8))
+
+
+def test_sinkron_inspeksi(benchmark, sintetis):
+    app, n = sintetis
+    hasil = ukur(benchmark, app, lambda: app.sinkron_inspeksi(record_lapangan(1000, n)), rounds=5)
+    assert hasil['diterima'] == 1000
+
+
+def test_rencana_penanganan(benchmark, sintetis):
+    app, _ = sintetis
+    rencana, _ = ukur(benchmark, app, lambda: app.rencana_penanganan([5e9, 5e9]), rounds=5)
+    assert not rencana.empty
+
+
+def test_export_import(benchmark, sintetis):
+    app, _ = sintetis
+    backup = os.path.join(app.db_folder, 'backup.json.gz')
+    assert "✅" in app.export_ke_file(backup)
+
+    def restore():
+        with open(backup, 'rb') as f: return app.import_dari_json(f)
+    assert "✅" in ukur(benchmark, app, restore, rounds=3)
+
+
+def test_export_ke_file(benchmark, sintetis):
+    app, _ = sintetis
+    ukur(benchmark, app, lambda: app.export_ke_file(os.path.join(app.db_folder, 'ekspor.json.gz')), rounds=3)
+
+
+@pytest.mark.parametrize('dengan_pelacak', [True, False], ids=['pelacak', 'tanpa_pelacak'])
+def test_overhead_pelacak(benchmark, sintetis, dengan_pelacak):
+    """Bandingkan kedua id ini untuk biaya instrumentasi per panggilan"""
+    app, _ = sintetis
+    pelacak = app.pelacak
+    if not dengan_pelacak: app.atur_pelacak(None)
+    try:
+        benchmark(lambda: app.get_halaman('master_aset', batas=50))
+    finally:
+        app.atur_pelacak(pelacak)
@@ -0,0 +1,101 @@
+"""Gudang foto: foto sama disimpan sekali (hash isi), bukan-foto ditolak, isi asli terbaca utuh,
+thumbnail dibuat worker, sapu() hanya menghapus foto lama yang tidak dirujuk."""
+import hashlib
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from modules.backend import IrigasiBackend
+from modules.foto import GudangFoto
+
+
+def gambar(seed, format='JPEG', ukuran=(640, 480)):
+    rng = np.random.default_rng(seed)
+    buf = io.BytesIO()
+    Image.fromarray(rng.integers(0, 255, (ukuran[1], ukuran[0], 3), dtype=np.uint8)).save(buf, format)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def gudang(tmp_path):
+    g = GudangFoto(str(tmp_path / 'foto'), sisi_thumb=64, maks_proses=1)
+    yield g
+    g.tutup()
+
+
+def test_simpan_dedupe_dan_baca_utuh(gudang, tmp_path):
+    jpeg, png = gambar(1), gambar(2, 'PNG')
+    path = tmp_path / 'foto.jpg'
+    path.write_bytes(jpeg)
+    h, baru = gudang.simpan(jpeg)
+    assert h == hashlib.sha256(jpeg).hexdigest() and baru
+    # Sumber bytes, path dan file-like dengan isi sama -> hash sama, tidak disimpan ulang
+    assert gudang.simpan(str(path)) == (h, False)
+    assert gudang.simpan(io.BytesIO(jpeg)) == (h, False)
+    h_png, baru = gudang.simpan(io.BytesIO(png))
+    assert baru and gudang.semua_hash() == {h, h_png}
+    assert os.listdir(os.path.join(gudang.folder, 'tmp')) == []
+
+    with gudang.buka(h) as view: assert bytes(view) == jpeg
+    assert b''.join(gudang.stream(h_png, ukuran=1000)) == png
+    assert (gudang.mime(h), gudang.mime(h_png)) == ('image/jpeg', 'image/png')
+
+
+def test_bukan_foto_dan_hash_tidak_valid(gudang):
+    for isi in (b'%PDF-1.4 bukan foto', b'', b'RIFF\0\0\0\0WAVEfmt '):
+        with pytest.raises(ValueError): gudang.simpan(isi)
+        with pytest.raises(ValueError): gudang.simpan(io.BytesIO(isi))
+    assert gudang.semua_hash() == set()
+    with pytest.raises(ValueError): gudang.thumbnail('../../etc/passwd')
+    with pytest.raises(ValueError):
+        with gudang.buka('A' * 64): pass
+    assert gudang.thumbnail('0' * 64) is None
+
+
+def test_thumbnail(gudang):
+    h, _ = gudang.simpan(gambar(3, ukuran=(640, 320)))
+    data = gudang.thumbnail(h, tunggu=120)
+    with Image.open(io.BytesIO(data)) as im:
+        assert im.format == 'JPEG' and im.size == (64, 32)
+    assert os.path.exists(gudang._path_thumb(h))
+    assert gudang.thumbnail(h) is data   # kedua kali dari cache LRU
+
+
+def test_sapu_hanya_foto_lama_tak_terpakai(gudang):
+    dipakai, lama, baru = (gudang.simpan(gambar(i))[0] for i in (4, 5, 6))
+    gudang.thumbnail(lama, tunggu=120)
+    dua_jam_lalu = time.time() - 7200
+    for h in (dipakai, lama): os.utime(gudang._path(h), (dua_jam_lalu, dua_jam_lalu))
+    jumlah, byte = gudang.sapu({dipakai})
+    assert jumlah == 1 and byte == len(gambar(5))
+    assert gudang.semua_hash() == {dipakai, baru}   # foto baru (belum tercatat) masih dalam tenggang
+    assert not os.path.exists(gudang._path_thumb(lama)) and gudang.thumbnail(lama) is None
+
+    # Unggah ulang foto lama menyegarkan mtime: tidak ikut tersapu
+    for h in (dipakai, baru): os.utime(gudang._path(h), (dua_jam_lalu, dua_jam_lalu))
+    assert gudang.simpan(gambar(6)) == (baru, False)
+    assert gudang.sapu({dipakai}) == (0, 0)
+
+
+def test_foto_inspeksi_backend(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'foto.db'))
+    app.tambah_master_aset("Bendung", "Bendung", "Unit", 1990, 2010, 100, 1e9, {})
+    jpeg, png = gambar(7), gambar(8, 'PNG')
+    assert app.tambah_inspeksi(1, "Uji", 60, 60, 70, 70, 5, None, 1e6, waktu=pd.Timestamp('2024-01-01'),
+                               foto=[io.BytesIO(jpeg), io.BytesIO(jpeg)]).startswith("✅")
+    assert app.tambah_inspeksi(1, "Uji", 50, 50, 70, 70, 5, None, 1e6, waktu=pd.Timestamp('2025-01-01')).startswith("✅")
+    assert app.lampirkan_foto(2, [io.BytesIO(png), io.BytesIO(jpeg)]).startswith("✅")
+    assert app.lampirkan_foto(99, [io.BytesIO(png)]).startswith("❌")
+
+    h_jpeg, h_png = hashlib.sha256(jpeg).hexdigest(), hashlib.sha256(png).hexdigest()
+    foto = app.get_foto_aset(1)
+    assert list(zip(foto['inspeksi_id'], foto['hash'])) == [(2, h_png), (2, h_jpeg), (1, h_jpeg)]
+    with app.buka_foto(h_png) as view: assert bytes(view) == png
+    assert app.bersihkan_foto().startswith("✅ 0 foto")
+    assert app._gudang().semua_hash() == {h_jpeg, h_png}
+    app.tutup()
@@ -0,0 +1,130 @@
+"""Geometri KMZ: penyederhanaan Douglas-Peucker (NumPy per iterasi) sama dengan versi rekursif, tiap level
+berisi titik yang dipertahankan pada toleransinya, dan query viewport memilih fitur & level yang benar."""
+import io
+import zipfile
+
+import numpy as np
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.geometri import (SKALA, TOLERANSI_LEVEL, dekode, derajat_per_piksel, level_geometri,
+                              level_untuk_zoom, sederhanakan, urai_kml)
+
+
+def dp_rekursif(xy, toleransi, i=0, j=None):
+    """Douglas-Peucker rekursif klasik (jarak tegak lurus ke garis i-j) -> indeks yang dipertahankan"""
+    j = len(xy) - 1 if j is None else j
+    if j <= i + 1: return [i, j] if j > i else [i]
+    p, q = xy[i], xy[j]
+    d = q - p
+    panjang = np.hypot(*d)
+    tengah = xy[i + 1:j]
+    jarak = (np.abs(d[0] * (tengah[:, 1] - p[1]) - d[1] * (tengah[:, 0] - p[0])) / panjang if panjang > 0
+             else np.hypot(*(tengah - p).T))
+    k = int(np.argmax(jarak))
+    if jarak[k] <= toleransi: return [i, j]
+    return dp_rekursif(xy, toleransi, i, i + 1 + k)[:-1] + dp_rekursif(xy, toleransi, i + 1 + k, j)
+
+
+def jalan_acak(seed, n):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(0, 1e-4, (n, 2)), axis=0) + (110.0, -7.0)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('toleransi', TOLERANSI_LEVEL[1:])
+def test_sederhanakan_sama_dengan_rekursif(seed, toleransi):
+    xy = jalan_acak(seed, 400)
+    assert sederhanakan(xy, toleransi).tolist() == dp_rekursif(xy, toleransi)
+
+
+def test_sederhanakan_titik_kembar_dan_garis_tertutup():
+    xy = np.array([[0, 0], [1, 1], [0, 0], [2, 0], [0, 0]], dtype=float)   # ujung sama = poligon tertutup
+    for tol in (0.1, 1.5, 3.0):
+        assert sederhanakan(xy, tol).tolist() == dp_rekursif(xy, tol)
+    assert sederhanakan(xy[:2], 1.0).tolist() == [0, 1]
+
+
+@pytest.mark.parametrize('tipe', ['LineString', 'Polygon'])
+def test_level_geometri(tipe):
+    xy = jalan_acak(7, 2000) if tipe == 'LineString' else \
+        np.c_[110 + 0.01 * np.cos(np.linspace(0, 2 * np.pi, 500)), -7 + 0.01 * np.sin(np.linspace(0, 2 * np.pi, 500))]
+    level = level_geometri(tipe, xy)
+    assert level[0][0] == 0 and np.abs(dekode(level[0][1]) - xy).max() <= 0.5 / SKALA + 1e-12
+    nomor, titik = [lv for lv, _ in level], [len(dekode(b)) for _, b in level]
+    assert nomor == sorted(set(nomor)) and titik == sorted(titik, reverse=True) and len(set(titik)) == len(titik)
+    minimal = 4 if tipe == 'Polygon' else 2
+    for lv, blob in level[1:]:
+        kasar = dekode(blob)
+        assert len(kasar) >= minimal
+        assert np.array_equal(kasar[[0, -1]], dekode(level[0][1])[[0, -1]])   # ujung dipertahankan
+        # Level = titik asli (dibulatkan) yang dipertahankan Douglas-Peucker dengan toleransi level itu
+        idx = dp_rekursif(xy, TOLERANSI_LEVEL[lv])
+        if len(idx) >= minimal: assert np.array_equal(kasar, dekode(level[0][1])[idx])
+    assert level_geometri('Point', xy[:1]) == [(0, np.round(xy[:1] * SKALA).astype('<i4').tobytes())]
+
+
+def test_level_untuk_zoom():
+    level = [level_untuk_zoom(z) for z in range(0, 22)]
+    assert level == sorted(level, reverse=True) and level[-1] == 0
+    for z, lv in enumerate(level):
+        assert TOLERANSI_LEVEL[lv] <= derajat_per_piksel(z)
+        assert lv == len(TOLERANSI_LEVEL) - 1 or TOLERANSI_LEVEL[lv + 1] > derajat_per_piksel(z)
+
+
+KML = '''<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2"><Document><Folder>
+<Placemark><name>Bendung</name><Point><coordinates>110.10,-7.10,0</coordinates></Point></Placemark>
+<Placemark><name>Saluran</name><LineString><coordinates>{saluran}</coordinates></LineString></Placemark>
+<Placemark><name>Petak</name><Polygon><outerBoundaryIs><LinearRing><coordinates>
+110.50,-7.50 110.60,-7.50 110.60,-7.40 110.50,-7.40 110.50,-7.50</coordinates></LinearRing></outerBoundaryIs>
+<innerBoundaryIs><LinearRing><coordinates>110.52,-7.48 110.53,-7.48 110.53,-7.47 110.52,-7.48</coordinates></LinearRing></innerBoundaryIs>
+</Polygon></Placemark>
+<Placemark><name>Gabungan</name><MultiGeometry><Point><coordinates>111,-8</coordinates></Point>
+<Point><coordinates>111.001,-8.001</coordinates></Point></MultiGeometry></Placemark>
+<Placemark><name>Kosong</name><Point><coordinates></coordinates></Point></Placemark>
+<Placemark><name>Gorong kecil</name><LineString><coordinates>110.3,-7.3 110.30001,-7.30001</coordinates></LineString></Placemark>
+</Folder></Document></kml>'''
+
+
+@pytest.fixture
+def kml():
+    xy = jalan_acak(1, 500) + (0.2, -0.2)
+    return KML.format(saluran=' '.join(f"{x:.6f},{y:.6f},0" for x, y in xy)).encode()
+
+
+def test_urai_kml_dan_kmz_sama(kml):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as z:
+        z.writestr('files/lain.kml', '<kml/>')
+        z.writestr('doc.kml', kml)
+    dari_kml = list(urai_kml(kml))
+    dari_kmz = list(urai_kml(buf.getvalue()))
+    assert [(n, t) for n, t, _ in dari_kml] == [('Bendung', 'Point'), ('Saluran', 'LineString'), ('Petak', 'Polygon'),
+                                               ('Gabungan', 'Point'), ('Gabungan', 'Point'), ('Gorong kecil', 'LineString')]
+    assert all(np.array_equal(a[2], b[2]) for a, b in zip(dari_kml, dari_kmz)) and len(dari_kml) == len(dari_kmz)
+    assert len(dari_kml[2][2]) == 5   # hanya batas luar poligon
+
+
+def test_viewport(kml, tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'geometri.db'))
+    assert app.impor_geometri_kmz(io.BytesIO(kml)).startswith("✅")
+    nama = lambda g: sorted(f['properties']['nama'] for f in g['features'])
+
+    # Hanya fitur yang kotaknya beririsan; Point selalu ikut, garis sub-piksel dilewati di zoom rendah
+    assert nama(app.get_geometri_viewport(110.05, -7.15, 110.15, -7.05, 14)) == ['Bendung']
+    assert nama(app.get_geometri_viewport(110.45, -7.55, 110.65, -7.35, 14)) == ['Petak']
+    assert nama(app.get_geometri_viewport(109, -9, 112, -6, 18)) == \
+        ['Bendung', 'Gabungan', 'Gabungan', 'Gorong kecil', 'Petak', 'Saluran']
+    assert 'Gorong kecil' not in nama(app.get_geometri_viewport(109, -9, 112, -6, 8))
+    assert app.get_geometri_viewport(0, 0, 1, 1, 14)['features'] == []
+
+    # Koordinat dari level sesuai zoom: zoom dekat = geometri asli, zoom jauh = lebih sedikit titik
+    saluran = lambda z: next(f for f in app.get_geometri_viewport(109, -9, 112, -6, z)['features']
+                             if f['properties']['nama'] == 'Saluran')['geometry']['coordinates']
+    assert len(saluran(20)) == 500 and len(saluran(10)) < len(saluran(14)) < 500
+    petak = next(f for f in app.get_geometri_viewport(110.45, -7.55, 110.65, -7.35, 14)['features'])
+    assert petak['geometry']['coordinates'][0][0] == petak['geometry']['coordinates'][0][-1] == [110.5, -7.5]
+    semua = np.concatenate([xy for _, _, xy in urai_kml(kml)])
+    assert app.get_batas_geometri() == pytest.approx((*semua.min(axis=0), *semua.max(axis=0)), rel=1e-6)   # R*Tree menyimpan float32
+    app.tutup()
@@ -0,0 +1,86 @@
+"""get_halaman (keyset) menelusuri tabel halaman demi halaman dengan hasil sama seperti ORDER BY penuh
+(termasuk nilai urut kembar & NULL), dan cari_aset (FTS5) menemukan aset per awalan kata."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.backend import IrigasiBackend
+
+N_ASET = 157
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    app = IrigasiBackend(str(tmp_path_factory.mktemp('halaman') / 'halaman.db'))
+    rng = np.random.default_rng(5)
+    sungai = rng.choice(['Cibeet', 'Citarum', 'Cimanuk', 'Brantas'], N_ASET)
+    # tahun_bangun banyak kembar & sebagian NULL, satuan sebagian NULL
+    tahun = [None if i % 9 == 0 else int(1970 + i % 6) for i in range(N_ASET)]
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (kode_aset, nama_aset, jenis_aset, satuan, tahun_bangun) VALUES (?, ?, ?, ?, ?)",
+                        [(f"SAL-{i}", f"Saluran Sekunder {s} {i}", 'Saluran' if i % 3 else 'Bendung',
+                          None if i % 4 == 0 else 'm', t) for i, (s, t) in enumerate(zip(sungai, tahun))])
+    yield app
+    app.tutup()
+
+
+def semua_halaman(app, batas, **opsi):
+    hasil, kursor = [], None
+    while True:
+        hal = app.get_halaman('master_aset', setelah=kursor, batas=batas, **opsi)
+        assert len(hal['data']) <= batas
+        hasil.append(hal['data'])
+        kursor = hal['berikut']
+        if kursor is None: return pd.concat(hasil, ignore_index=True), hal['total']
+
+
+@pytest.mark.parametrize('urut', ['id', 'tahun_bangun', 'satuan', 'nama_aset'])
+@pytest.mark.parametrize('turun', [False, True], ids=['naik', 'turun'])
+def test_keyset_sama_dengan_order_by(app, urut, turun):
+    filter = [('jenis_aset', '=', 'Saluran')]
+    hasil, total = semua_halaman(app, 10, kolom=list(dict.fromkeys(['id', urut])), filter=filter, urut=urut, turun=turun)
+    with app._baca() as conn:
+        arah = ' DESC' if turun else ''
+        acuan = pd.read_sql(f"SELECT id FROM master_aset WHERE jenis_aset = 'Saluran' "
+                            f"ORDER BY {urut}{arah}, id{arah}", conn)
+    assert total == len(acuan)
+    assert hasil['id'].tolist() == acuan['id'].tolist()
+
+
+def test_halaman_pas_batas_tidak_ada_halaman_kosong(app):
+    hal = app.get_halaman('master_aset', batas=N_ASET)
+    assert len(hal['data']) == N_ASET and hal['berikut'] is None
+    hal = app.get_halaman('master_aset', batas=N_ASET - 1)
+    assert hal['berikut'] == (N_ASET - 1, N_ASET - 1)
+
+
+def test_kolom_dan_operator_divalidasi(app):
+    with pytest.raises(ValueError):
+        app.get_halaman('master_aset', urut='id; DROP TABLE master_aset')
+    with pytest.raises(ValueError):
+        app.get_halaman('master_aset', filter=[('nama_aset', 'glob', '*')])
+
+
+def test_cari_aset_awalan_kata(app):
+    nama = app.get_master_aset().set_index('id')['nama_aset']
+    # Semua token harus cocok sebagai awalan kata, huruf besar/kecil tidak berpengaruh
+    hasil = app.cari_aset('ciman sek', batas=N_ASET)
+    acuan = nama[nama.str.contains('Cimanuk')]
+    assert sorted(hasil['id']) == sorted(acuan.index)
+    assert set(app.cari_aset('SAL-15', batas=N_ASET)['kode_aset']) == {'SAL-15', *(f'SAL-15{i}' for i in range(N_ASET - 150))}
+    assert app.cari_aset('bendung', batas=N_ASET)['jenis_aset'].eq('Bendung').all()
+    assert app.cari_aset('tidakada').empty
+    # Teks kosong / hanya tanda baca -> aset pertama, bukan galat sintaks FTS
+    assert app.cari_aset('"*', batas=3)['id'].tolist() == [1, 2, 3]
+
+
+def test_cari_aset_ikut_perubahan_master(app):
+    with app._tulis() as cur:
+        cur.execute("INSERT INTO master_aset (kode_aset, nama_aset, jenis_aset) VALUES ('BND-X', 'Bendung Ciujung Hilir', 'Bendung')")
+        baru = cur.lastrowid
+    assert app.cari_aset('ciuj')['id'].tolist() == [baru]
+    with app._tulis() as cur: cur.execute("UPDATE master_aset SET nama_aset = 'Bendung Cisadéa' WHERE id = ?", (baru,))
+    assert app.cari_aset('ciuj').empty
+    assert app.cari_aset('cisadea')['id'].tolist() == [baru]   # diakritik diabaikan
+    with app._tulis() as cur: cur.execute("DELETE FROM master_aset WHERE id = ?", (baru,))
+    assert app.cari_aset('cisadea').empty
@@ -0,0 +1,43 @@
+"""Impor blangko PAI lama: contoh blangko terisi di data_lama/contoh/ terurai ke master & inspeksi
+(termasuk tabel ruas saluran), blangko kosong/non-PAI dilewati, dan impor ulang tidak menggandakan."""
+import os
+
+import pytest
+
+from modules import impor_pai
+from modules.backend import IrigasiBackend
+
+CONTOH = os.path.join(impor_pai.FOLDER_TEMPLATE, 'contoh')
+
+
+@pytest.fixture(scope='module')
+def hasil():
+    return {os.path.basename(h['file']): h for h in impor_pai.urai_arsip(impor_pai.FOLDER_TEMPLATE, proses=1)}
+
+
+def test_contoh_terisi_terurai(hasil):
+    terisi = sorted(f for f, h in hasil.items() if 'master' in h)
+    assert terisi == sorted(os.listdir(CONTOH))
+    assert all(hasil[f]['lewati'] in ("blangko kosong", "bukan blangko aset PAI") for f in hasil if f not in terisi)
+
+    lama, baru = hasil['bendung_cibeet_2018.xlsx'], hasil['bendung_cibeet_2021.xlsx']
+    assert lama['master'] == baru['master']
+    m = baru['master']
+    assert (m['kode_aset'], m['jenis_aset'], m['tahun_bangun']) == ('BD.CBT.01', 'Bendung', 1978)
+    assert m['luas_layanan_desain'] == 3200 + 2800   # kiri + kanan
+    assert m['nilai_aset_baru'] == 12.5e9 + 2.5e9
+    i = baru['inspeksi']
+    assert (i['tanggal_inspeksi'], i['kondisi_sipil'], i['kondisi_me'], i['estimasi_biaya']) == ('2021-01-01', 70, 55, 575e6)
+
+    ruas = hasil['saluran_sekunder_cibeet_kiri_2021.xlsx']['master']['dimensi_teknis']['ruas']
+    assert [(r['awal'], r['akhir'], r['lining']) for r in ruas] == \
+        [(0, 1200, 'Pasangan batu'), (1200, 2600, 'Tanah'), (2600, 3450, 'Beton')]
+
+
+def test_impor_contoh_idempoten(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'pai.db'))
+    for baru in (3, 0):
+        assert app.impor_pai_lama(impor_pai.FOLDER_TEMPLATE, proses=1).startswith(f"✅ Impor PAI: 2 aset, {baru} inspeksi baru")
+    assert sorted(app.get_master_aset()['kode_aset']) == ['BD.CBT.01', 'SL.CBT.S1']
+    assert len(app.get_table_data('inspeksi_aset')) == 3
+    app.tutup()
@@ -0,0 +1,123 @@
+"""Konkurensi backend bersama: pembaca & penulis jalan bersamaan tanpa 'database is locked' dan pembaca
+hanya pernah melihat transaksi utuh (snapshot WAL), termasuk selama restore."""
+import itertools
+import math
+import threading
+import time
+import uuid
+
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.sintetis import isi_sintetis
+
+N_ASET = 2_000
+BATCH = 50
+DURASI = 3.0
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'konkurensi.db'))
+    isi_sintetis(app, N_ASET, 1)
+    yield app
+    app.tutup()
+
+
+def jalankan_bersamaan(tugas, durasi=DURASI):
+    """Jalankan tiap fungsi tugas(berhenti) di thread sendiri selama `durasi` detik -> daftar galat"""
+    berhenti, galat = threading.Event(), []
+
+    def bungkus(fungsi):
+        try: fungsi(berhenti)
+        except Exception as e: galat.append(f"{type(e).__name__}: {e}")
+        finally: berhenti.set()   # satu thread gagal -> semua berhenti
+    thread = [threading.Thread(target=bungkus, args=(f,)) for f in tugas]
+    for t in thread: t.start()
+    time.sleep(durasi)
+    berhenti.set()
+    for t in thread: t.join(60)
+    return galat
+
+
+def test_pembaca_dan_penulis_bersamaan(app):
+    n0 = app.hitung_baris('inspeksi_aset')
+    # Penulis "proses lain": backend terpisah di file yang sama, tiap batch inspeksi = satu transaksi
+    luar = IrigasiBackend(app.db_path)
+    urutan, batch_tertulis, tanam_tertulis = itertools.count(), [0], [0]
+
+    def penulis_luar(berhenti):
+        while not berhenti.is_set():
+            b = next(urutan)
+            hasil = luar.sinkron_inspeksi([{'uuid': str(uuid.UUID(int=b << 32 | i)), 'aset_id': 1 + (b * BATCH + i) % N_ASET,
+                                            'waktu_survei': '2025-06-01T08:00:00', 'nama_surveyor': 'Uji',
+                                            'kondisi_sipil': 60, 'kondisi_me': 50, 'nilai_fungsi_sipil': 70,
+                                            'nilai_fungsi_me': 70, 'luas_terdampak_aktual': 5, 'estimasi_biaya': 1e6}
+                                           for i in range(BATCH)], batas_tarik=1)
+            assert hasil['pesan'].startswith("✅") and hasil['diterima'] == BATCH, hasil['pesan']
+            batch_tertulis[0] += 1
+
+    def penulis_sesi(berhenti):
+        while not berhenti.is_set():
+            pesan = app.tambah_data_tanam_lengkap("MT1", 100, 90, 120, 100, 5, 2)
+            assert pesan.startswith("✅"), pesan
+            tanam_tertulis[0] += 1
+
+    def pembaca(berhenti):
+        terakhir = n0
+        while not berhenti.is_set():
+            n = app.hitung_baris('inspeksi_aset')
+            assert (n - n0) % BATCH == 0, f"batch setengah jadi terbaca: {n - n0} baris"
+            assert n >= terakhir, "jumlah baris mundur"
+            terakhir = n
+            assert len(app.get_prioritas_matematis()) == N_ASET
+            iksi, fisik, tanam = app.hitung_iksi_lengkap()
+            assert all(math.isfinite(x) for x in (iksi, fisik, tanam)) and 0 <= iksi <= 100
+            assert len(app.get_halaman('inspeksi_aset', urut='id', turun=True, batas=20)['data']) == 20
+
+    galat = jalankan_bersamaan([penulis_luar, penulis_sesi] + [pembaca] * 4)
+    luar.tutup()
+    assert not [g for g in galat if 'locked' in g], galat
+    assert not galat, galat
+    assert batch_tertulis[0] > 0 and tanam_tertulis[0] > 0
+
+    # Cache backend bersama ikut melihat tulisan backend lain; hasil sama dengan backend segar
+    assert app.hitung_baris('inspeksi_aset') == n0 + BATCH * batch_tertulis[0]
+    assert app.hitung_baris('data_tanam') >= tanam_tertulis[0]
+    segar = IrigasiBackend(app.db_path)
+    assert app.hitung_iksi_lengkap() == pytest.approx(segar.hitung_iksi_lengkap())
+    segar.tutup()
+
+
+def test_restore_atomik_saat_dibaca(app, tmp_path):
+    backup = str(tmp_path / 'backup.json.gz')
+    assert "✅" in app.export_ke_file(backup)
+    n_inspeksi = app.hitung_baris('inspeksi_aset')
+    jumlah_restore = [0]
+
+    def restore(berhenti):
+        while not berhenti.is_set():
+            with open(backup, 'rb') as f: pesan = app.import_dari_json(f)
+            assert pesan.startswith("✅"), pesan
+            jumlah_restore[0] += 1
+
+    def pembaca(berhenti):
+        # Restore = hapus + isi ulang dalam satu transaksi: pembaca tidak pernah melihat DB kosong/setengah
+        while not berhenti.is_set():
+            assert app.hitung_baris('master_aset') == N_ASET
+            assert app.hitung_baris('inspeksi_aset') == n_inspeksi
+            assert len(app.get_prioritas_matematis()) == N_ASET
+
+    galat = jalankan_bersamaan([restore] + [pembaca] * 3)
+    assert not galat, galat
+    assert jumlah_restore[0] > 0
+
+    # Restore gagal di tengah (kolom asing di record terakhir) -> data lama utuh
+    rusak = str(tmp_path / 'rusak.jsonl')
+    with open(rusak, 'w') as f:
+        f.write('{"tabel": "master_aset", "data": {"id": 1, "nama_aset": "X"}}\n')
+        f.write('{"tabel": "master_aset", "data": {"id": 2, "kolom_asing": 1}}\n')
+    with open(rusak, 'rb') as f: pesan = app.import_dari_json(f)
+    assert pesan.startswith("❌"), pesan
+    assert app.hitung_baris('master_aset') == N_ASET
+    assert app.hitung_baris('inspeksi_aset') == n_inspeksi
@@ -0,0 +1,136 @@
+"""TabelParadox mendekode record per kolom dengan nilai yang sama persis dengan yang ditulis: angka
+negatif, teks cp1252, field kosong, rantai blok yang tidak urut fisik dan blok kosong di tengah rantai.
+Riwayat tanpa kode dicocokkan ke master lewat nama ternormalisasi."""
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.paradox import TabelParadox
+
+SUMBER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data_lama', 'prioritas.db')
+N = 60
+
+
+def kode_angka(v):
+    # Double big-endian: positif -> bit tanda dibalik, negatif -> semua bit dibalik, kosong -> nol semua
+    if v is None: return bytes(8)
+    b = struct.pack('>d', v)
+    return bytes([b[0] ^ 0x80]) + b[1:] if v >= 0 else bytes(x ^ 0xFF for x in b)
+
+
+def kode_long(v):
+    if v is None: return bytes(4)
+    b = bytearray(struct.pack('>i', v))
+    b[0] ^= 0x80
+    return bytes(b)
+
+
+def kode_teks(v, ukuran):
+    return bytes(ukuran) if v is None else v.encode('cp1252').ljust(ukuran, b'\0')
+
+
+def nilai_uji(i):
+    return {'Urut': float(i + 1),
+            'N_aset': None if i % 7 == 3 else f"Bendung Ciléngkrang {i}",
+            'Thn_dibangun': None if i % 5 == 0 else 1900 + i - 30,
+            'Biaya': None if i % 6 == 1 else (-1) ** i * 1.25e6 * i}
+
+
+@pytest.fixture(scope='module')
+def path_paradox(tmp_path_factory):
+    """Salin header prioritas.db, tulis N record di blok-blok baru: blok fisik urut terbalik terhadap
+    rantai, plus satu blok kosong di tengah rantai (dilewati pembaca)."""
+    path = str(tmp_path_factory.mktemp('paradox') / 'uji.db')
+    with TabelParadox(SUMBER) as px:
+        header = bytearray(px._mm[:px.ukuran_header])
+        rs, bs, field = px.ukuran_record, px.ukuran_blok, px.field
+        contoh = bytes(px._mm[px.ukuran_header + (px.blok_pertama - 1) * bs + 6:][:rs])
+    posisi = {n: (off, uk) for n, _, uk, off in field}
+    record = []
+    for i in range(N):
+        r = bytearray(contoh)
+        for nama, v in nilai_uji(i).items():
+            off, uk = posisi[nama]
+            r[off:off + uk] = kode_teks(v, uk) if nama == 'N_aset' else kode_long(v) if nama == 'Thn_dibangun' else kode_angka(v)
+        record.append(bytes(r))
+
+    per_blok = (bs - 6) // rs
+    isi = [record[i:i + per_blok] for i in range(0, N, per_blok)]
+    isi.insert(len(isi) // 2, [])
+    n_blok = len(isi)
+    fisik = list(range(n_blok, 0, -1))   # blok logis ke-k disimpan di nomor blok fisik[k]
+    blok = {}
+    for k, r in enumerate(isi):
+        berikut = fisik[k + 1] if k + 1 < n_blok else 0
+        blok[fisik[k]] = (struct.pack('<HHh', berikut, k, (len(r) - 1) * rs) + b''.join(r)).ljust(bs, b'\0')
+    struct.pack_into('<I', header, 0x06, N)
+    struct.pack_into('<HHHH', header, 0x0A, n_blok + 1, n_blok, fisik[0], fisik[-1])
+    with open(path, 'wb') as f:
+        f.write(header)
+        for b in range(1, n_blok + 1): f.write(blok[b])
+    return path
+
+
+def test_dekode_kolom_sama_dengan_nilai_asli(path_paradox):
+    harap = [nilai_uji(i) for i in range(N)]
+    with TabelParadox(path_paradox) as px:
+        kolom = px.kolom(['Urut', 'N_aset', 'Thn_dibangun', 'Biaya'])
+    assert list(kolom) == ['Urut', 'N_aset', 'Thn_dibangun', 'Biaya']
+    assert kolom['Urut'].tolist() == [h['Urut'] for h in harap]
+    assert kolom['N_aset'].tolist() == [h['N_aset'] for h in harap]
+    for nama in ('Thn_dibangun', 'Biaya'):
+        acuan = np.array([np.nan if h[nama] is None else h[nama] for h in harap], dtype=float)
+        assert np.array_equal(kolom[nama], acuan, equal_nan=True), nama
+
+
+def test_potongan_sama_dengan_kolom_penuh(path_paradox):
+    with TabelParadox(path_paradox) as px:
+        penuh = px.kolom()
+        bagian = list(px.potongan(10))
+    assert len(bagian) > 1
+    for nama, nilai in penuh.items():
+        gabung = np.concatenate([b[nama] for b in bagian])
+        if nilai.dtype == object: assert gabung.tolist() == nilai.tolist(), nama
+        else: assert np.array_equal(gabung, nilai, equal_nan=True), nama
+
+
+def test_file_asli_dan_migrasi(path_paradox, tmp_path):
+    with TabelParadox(SUMBER) as px:
+        asli = px.kolom()
+        assert px.jumlah_record == len(asli['Urut']) == 17
+        assert asli['Urut'].tolist() == list(range(1, 18))
+
+    app = IrigasiBackend(str(tmp_path / 'migrasi.db'))
+    for _ in range(2):   # migrasi ulang file yang sama mengganti barisnya, tidak menggandakan
+        assert app.migrasi_paradox(path_paradox, ukuran_potongan=10).startswith("✅")
+    with app._baca() as conn:
+        baris = conn.execute("SELECT urut, n_aset, thn_dibangun, biaya FROM riwayat_prioritas ORDER BY id").fetchall()
+    assert baris == [tuple(nilai_uji(i).values()) for i in range(N)]
+    app.tutup()
+
+
+def test_perbandingan_cocok_nama_ternormalisasi(path_paradox, tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'banding.db'))
+    app.migrasi_paradox(path_paradox)
+    # Nama master beda huruf besar/kecil, spasi, tanda baca & diakritik dari nama Paradox
+    nama = {i: f"  BENDUNG cilengkrang-{i}." for i in range(10)}
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (kode_aset, nama_aset, jenis_aset) VALUES (?, ?, 'Bendung')",
+                        [(f"BD-{i}", n) for i, n in nama.items()] +
+                        [('BD-11a', 'Bendung Cilengkrang 11'), ('BD-11b', 'bendung  ciléngkrang 11'), ('KD-20', 'Lain')])
+        cur.execute("UPDATE riwayat_prioritas SET kode = 'KD-20' WHERE urut = 21")
+        aset = dict(cur.execute("SELECT kode_aset, id FROM master_aset"))
+    for a in aset.values():
+        app.tambah_inspeksi(a, 'Uji', 60, 60, 70, 70, 5, None, 1e6, waktu=pd.Timestamp('2024-01-01'))
+
+    hasil = app.get_perbandingan_prioritas()
+    assert hasil.attrs['pencocokan'] == {'kode': 1, 'nama': 9, 'tidak_cocok': N - 10}
+    cocok = hasil.dropna(subset=['aset_id']).set_index('nama_lama')['aset_id']
+    assert cocok.to_dict() == {**{nilai_uji(i)['N_aset']: aset[f"BD-{i}"] for i in range(10) if i != 3},
+                               nilai_uji(20)['N_aset']: aset['KD-20']}
+    assert hasil['Skor_Prioritas'].notna().sum() == 10 and hasil['Selisih_Skor'].notna().sum() == 10
+    app.tutup()
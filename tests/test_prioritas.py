@@ -0,0 +1,127 @@
+"""hitung_prioritas (NumPy per kolom) harus sama dengan rumus lama per baris (df.apply), termasuk nilai
+kosong, skor tepat di ambang kelas dan parameter penilaian selain bawaan. Cache frame prioritas yang
+diperbarui per insert tetap sama dengan hitung ulang penuh."""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.iksi import PARAMETER_BAWAAN, ParameterPenilaian
+from modules.prioritas import LABEL_KELAS, hitung_prioritas, label_prioritas
+from modules.sintetis import isi_sintetis
+
+KUSTOM = ParameterPenilaian(koef_kerusakan=0.5, koef_fungsi=1.1, bobot_fungsi=0.8, batas_darurat=150,
+                            batas_mendesak=75, batas_perhatian=25)
+
+
+def skor_acuan(row, p):
+    # Rumus lama (app lama: min() bawaan Python + math.log10), koefisien dari p
+    K = min(row['kondisi_sipil'], row['kondisi_me'])
+    F = min(row['nilai_fungsi_sipil'], row['nilai_fungsi_me'])
+    A_as = row['luas_terdampak_aktual']
+    Impact_Factor = math.log10(A_as + 1) if A_as > 0 else 0
+    return ((100 - K) * p.koef_kerusakan + (100 - F) * p.koef_fungsi * p.bobot_fungsi) * Impact_Factor
+
+
+def label_acuan(skor, p):
+    if skor > p.batas_darurat: return LABEL_KELAS[0]
+    if skor > p.batas_mendesak: return LABEL_KELAS[1]
+    if skor > p.batas_perhatian: return LABEL_KELAS[2]
+    return LABEL_KELAS[3]
+
+
+def prioritas_acuan(df, p):
+    df = df.copy()
+    df['Skor_Prioritas'] = df.apply(skor_acuan, axis=1, p=p)
+    df['Kelas_Prioritas'] = df['Skor_Prioritas'].apply(label_acuan, p=p)
+    return df
+
+
+def data_uji(p, n=2_000, seed=7):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'aset_id': np.arange(n),
+        'kondisi_sipil': rng.integers(0, 101, n).astype(float),
+        'kondisi_me': rng.integers(0, 101, n).astype(float),
+        'nilai_fungsi_sipil': rng.choice([100.0, 70.0, 40.0], n),
+        'nilai_fungsi_me': rng.choice([100.0, 70.0, 0.0], n),
+        'luas_terdampak_aktual': np.where(rng.random(n) < 0.1, 0.0, rng.gamma(2.0, 150.0, n)),
+    })
+    # Nilai kosong di salah satu / kedua anggota pasangan kondisi & fungsi, dan luas kosong/negatif
+    kosong = [
+        (np.nan, 50, 70, 70, 100), (50, np.nan, 70, 70, 100), (np.nan, np.nan, 70, 70, 100),
+        (60, 60, np.nan, 40, 100), (60, 60, 40, np.nan, 100), (60, 60, np.nan, np.nan, 100),
+        (60, 60, 70, 70, np.nan), (60, 60, 70, 70, -5), (np.nan, np.nan, np.nan, np.nan, np.nan),
+    ]
+    # Skor tepat di tiap ambang: F = 100, A = 99 (log10 = 2) -> skor = (100 - K) * koef_kerusakan * 2
+    ambang = [(100 - b / (2 * p.koef_kerusakan), 100, 100, 100, 99) for b in p.batas_kelas]
+    tambahan = pd.DataFrame(kosong + ambang, columns=df.columns[1:])
+    tambahan.insert(0, 'aset_id', np.arange(n, n + len(tambahan)))
+    return pd.concat([df, tambahan], ignore_index=True)
+
+
+@pytest.mark.parametrize('p', [PARAMETER_BAWAAN, KUSTOM], ids=['bawaan', 'kustom'])
+def test_sama_dengan_rumus_per_baris(p):
+    df = data_uji(p)
+    baru = hitung_prioritas(df, p).sort_values('aset_id')
+    lama = prioritas_acuan(df, p).sort_values('aset_id')
+    assert np.allclose(baru['Skor_Prioritas'], lama['Skor_Prioritas'], rtol=0, atol=1e-9, equal_nan=True)
+    assert (baru['Kelas_Prioritas'].to_numpy() == lama['Kelas_Prioritas'].to_numpy()).all()
+    # Urutan: skor menurun (NaN di belakang, sama dengan sort_values lama)
+    skor = hitung_prioritas(df, p)['Skor_Prioritas'].to_numpy()
+    ada = skor[~np.isnan(skor)]
+    assert (np.diff(ada) <= 0).all() and np.isnan(skor[len(ada):]).all()
+
+
+def test_data_kosong_none_sama_dengan_nan():
+    df = data_uji(PARAMETER_BAWAAN, n=10).astype(object)
+    df.iloc[0, 1] = None
+    df.iloc[1, 4] = None
+    hasil = hitung_prioritas(df).sort_values('aset_id')
+    acuan = prioritas_acuan(df.astype(float), PARAMETER_BAWAAN).sort_values('aset_id')
+    assert np.allclose(hasil['Skor_Prioritas'].astype(float), acuan['Skor_Prioritas'], equal_nan=True)
+    assert (hasil['Kelas_Prioritas'].to_numpy() == acuan['Kelas_Prioritas'].to_numpy()).all()
+
+
+@pytest.mark.parametrize('p', [PARAMETER_BAWAAN, KUSTOM], ids=['bawaan', 'kustom'])
+def test_label_tepat_di_ambang(p):
+    skor = []
+    for b in p.batas_kelas: skor += [np.nextafter(b, -np.inf), b, np.nextafter(b, np.inf)]
+    skor += [np.nan, -1.0, 0.0, 1e9]
+    assert label_prioritas(skor, p).tolist() == [label_acuan(s, p) for s in skor]
+
+
+def test_cache_diperbarui_per_insert_sama_dengan_hitung_ulang(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'cache.db'))
+    isi_sintetis(app, 300, 2)
+    app.segarkan_ringkasan()   # thread latar selesai dulu: hasil yang dihitung saat ada penulisan tidak di-cache
+    app.get_prioritas_matematis()
+    agregat_lama = app._agregat_fisik()
+    salinan = dict(agregat_lama['kontribusi'])
+    # Setelah cache hangat, insert satu per satu hanya memperbarui baris aset itu (tidak hitung ulang penuh)
+    app._hitung_prioritas = lambda: pytest.fail("frame prioritas dihitung ulang penuh")
+    app._hitung_agregat_fisik = lambda: pytest.fail("agregat fisik dihitung ulang penuh")
+    waktu = pd.Timestamp('2030-01-01')
+    for aset, nilai in [(5, (10, 20, 40, 0, 500)), (5, (95, 90, 100, 100, 1)), (17, (None, 30, 70, None, 80)),
+                        (42, (50, 50, 70, 70, None))]:
+        assert app.tambah_inspeksi(aset, "Uji", *nilai, None, 1e6, waktu=waktu).startswith("✅")
+    # Inspeksi bertanggal lama tidak menggeser inspeksi terakhir
+    assert app.tambah_inspeksi(8, "Uji", 0, 0, 0, 0, 1e4, None, 1e6, waktu=pd.Timestamp('1990-01-01')).startswith("✅")
+    assert app.tambah_master_aset("Aset baru", "Pintu", "Unit", 2020, 2020, 10, 1e8, {}).startswith("✅")
+    baru = int(app.get_master_aset()['id'].max())
+    assert app.tambah_inspeksi(baru, "Uji", 20, 20, 40, 40, 300, None, 1e6, waktu=waktu).startswith("✅")
+
+    hasil = app.get_prioritas_matematis()
+    skor = hasil['Skor_Prioritas'].to_numpy()
+    assert (np.diff(skor[~np.isnan(skor)]) <= 0).all() and hasil.index.is_unique
+    segar = IrigasiBackend(app.db_path)
+    acuan = segar.get_prioritas_matematis()
+    urut = lambda df: df.sort_values('aset_id').reset_index(drop=True)
+    pd.testing.assert_frame_equal(urut(hasil), urut(acuan))
+    assert app.hitung_iksi_lengkap() == pytest.approx(segar.hitung_iksi_lengkap())
+    # Agregat lama yang masih dipegang pembaca tidak ikut berubah
+    assert agregat_lama['kontribusi'] == salinan
+    segar.tutup()
+    app.tutup()
@@ -0,0 +1,65 @@
+"""Ringkasan kondisi & prediksi memakai parameter penilaian aktif (sama dengan label_prioritas)."""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.backend import IrigasiBackend
+from modules.iksi import PARAMETER_BAWAAN, ParameterPenilaian
+from modules.prioritas import LABEL_KELAS, label_prioritas, skor_urgensi
+from modules.riwayat import hitung_ringkasan, proyeksi
+
+KETAT = ParameterPenilaian(koef_kerusakan=0.9, koef_fungsi=2.0, batas_darurat=120, batas_mendesak=60,
+                           batas_perhatian=20)
+
+
+def riwayat(n=200, seed=1):
+    rng = np.random.default_rng(seed)
+    baris = []
+    for a in range(1, n + 1):
+        k, f = rng.uniform(60, 100, 2)
+        for j, tahun in enumerate((2016.5, 2019.5, 2023.5)):
+            baris.append({'aset_id': a, 'tahun': tahun, 'kondisi_sipil': k - j * rng.uniform(0, 8),
+                          'kondisi_me': k - j * rng.uniform(0, 8), 'nilai_fungsi_sipil': f - j * rng.uniform(0, 8),
+                          'nilai_fungsi_me': f - j * rng.uniform(0, 8), 'luas_terdampak_aktual': rng.uniform(1, 500),
+                          'tahun_bangun': 2000, 'tahun_rehab_terakhir': 0})
+    return pd.DataFrame(baris)
+
+
+@pytest.mark.parametrize('p', [PARAMETER_BAWAAN, KETAT], ids=['bawaan', 'ketat'])
+def test_prediksi_konsisten_dengan_label(p):
+    df = riwayat()
+    r = hitung_ringkasan(df, p)
+    akhir = df.groupby('aset_id').last()
+    assert np.allclose(r['skor_terakhir'], skor_urgensi(r['kondisi_terakhir'], r['fungsi_terakhir'],
+                                                        akhir['luas_terdampak_aktual'].to_numpy(), p))
+    # Di akhir tahun prediksi tiap kelas, label (ambang p) sudah kelas itu atau lebih berat ("1." < "2." < ...)
+    for kolom, kelas in zip(['tahun_darurat', 'tahun_mendesak', 'tahun_perhatian'], LABEL_KELAS):
+        ada = r[kolom].notna().to_numpy()
+        assert ada.any()
+        t = r[kolom].to_numpy(dtype=float, na_value=np.nan)[ada]
+        argumen = (r['kondisi_terakhir'][ada], r['fungsi_terakhir'][ada], akhir['luas_terdampak_aktual'][ada],
+                   r['laju_kondisi'][ada], r['laju_fungsi'][ada])
+        _, _, s_sesudah = proyeksi(*argumen, t + 1 - r['tahun_terakhir'][ada], p)
+        assert (label_prioritas(s_sesudah, p) <= kelas).all()
+
+
+def test_atur_parameter_menyegarkan_ringkasan(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'riwayat.db'))
+    for a in range(1, 31):
+        app.tambah_master_aset(f"Aset {a}", "Bendung", "bh", 2000, 0, 100, 1e9, {})
+        for tahun, nilai in ((2018, 90), (2024, 60)):
+            app.tambah_inspeksi(a, 'Uji', nilai, nilai, nilai, nilai, 50, '', 1e6, waktu=pd.Timestamp(f"{tahun}-06-01"))
+    lama = app.get_ringkasan_kondisi('aset_id').set_index('aset_id')
+    app.atur_parameter(KETAT)
+    for _ in range(200):
+        with app._baca() as conn:
+            if not conn.execute("SELECT COUNT(*) FROM ringkasan_antri").fetchone()[0]: break
+        time.sleep(0.05)
+    baru = app.get_ringkasan_kondisi('aset_id').set_index('aset_id')
+    prioritas = app.get_prioritas_matematis().set_index('aset_id')
+    assert np.allclose(baru['skor_terakhir'], prioritas.loc[baru.index, 'Skor_Prioritas'])
+    assert (baru['skor_terakhir'] > lama['skor_terakhir']).all()
+    assert (baru['tahun_mendesak'].fillna(9999) <= lama['tahun_mendesak'].fillna(9999)).all()
+    app.tutup()
@@ -0,0 +1,101 @@
+"""Sinkron lapangan: kiriman idempoten per uuid, konflik revisi tidak menimpa data server, kursor
+tarik_perubahan hanya mengembalikan delta master (dan reset setelah restore)."""
+import io
+import uuid
+
+import pytest
+
+from modules.backend import IrigasiBackend
+
+N_ASET = 30
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = IrigasiBackend(str(tmp_path / 'sinkron.db'))
+    with app._tulis() as cur:
+        cur.executemany("INSERT INTO master_aset (id, kode_aset, nama_aset, jenis_aset) VALUES (?, ?, ?, 'Bendung')",
+                        [(a, f"BND-{a}", f"Aset {a}") for a in range(1, N_ASET + 1)])
+    yield app
+    app.tutup()
+
+
+def record(i, **ubah):
+    return {'uuid': str(uuid.UUID(int=i + 1)), 'aset_id': 1 + i % N_ASET, 'waktu_survei': '2025-06-01T08:00:00+07:00',
+            'nama_surveyor': 'Uji', 'kondisi_sipil': 60, 'kondisi_me': 50, 'nilai_fungsi_sipil': 70,
+            'nilai_fungsi_me': 70, 'luas_terdampak_aktual': 5, 'estimasi_biaya': 1e6, **ubah}
+
+
+def isi_server(app, u):
+    with app._baca() as conn:
+        return conn.execute("SELECT revisi, rekomendasi_penanganan, kondisi_sipil, waktu_survei FROM inspeksi_aset "
+                            "WHERE uuid = ?", (u,)).fetchone()
+
+
+def test_kirim_ulang_konflik_dan_edit(app):
+    kiriman = [record(i) for i in range(10)]
+    h = app.sinkron_inspeksi(kiriman)
+    assert (h['diterima'], h['duplikat'], h['konflik'], h['ditolak']) == (10, 0, [], []), h['pesan']
+    assert set(h['revisi'].values()) == {1}
+
+    # Kiriman ulang batch yang sama (mis. koneksi putus sebelum jawaban diterima) -> duplikat semua
+    h = app.sinkron_inspeksi(kiriman)
+    assert (h['diterima'], h['duplikat']) == (0, 10)
+    assert app.hitung_baris('inspeksi_aset') == 10
+
+    # Edit dari revisi terbaru -> diperbarui; perangkat lain dengan revisi lama -> konflik, server tidak ditimpa
+    u = kiriman[0]['uuid']
+    h = app.sinkron_inspeksi([record(0, rekomendasi_penanganan='Perbaikan', revisi_dasar=1)])
+    assert h['diperbarui'] == 1 and h['revisi'] == {u: 2}
+    h = app.sinkron_inspeksi([record(0, kondisi_sipil=10, revisi_dasar=1)])
+    assert h['diperbarui'] == 0 and len(h['konflik']) == 1
+    konflik = h['konflik'][0]
+    assert konflik['uuid'] == u and konflik['revisi_server'] == 2
+    assert konflik['server']['rekomendasi_penanganan'] == 'Perbaikan' and konflik['server']['kondisi_sipil'] == 60
+    assert isi_server(app, u) == (2, 'Perbaikan', 60, '2025-06-01T08:00:00+07:00')
+
+    # Uuid sama dua kali dalam satu batch: kiriman kedua dinilai terhadap hasil yang pertama
+    h = app.sinkron_inspeksi([record(50), record(50), record(50, kondisi_sipil=1, revisi_dasar=1)])
+    assert (h['diterima'], h['duplikat'], h['diperbarui']) == (1, 1, 1)
+    assert isi_server(app, str(uuid.UUID(int=51)))[:3] == (2, None, 1)
+
+
+def test_record_tidak_valid_ditolak_satu_per_satu(app):
+    h = app.sinkron_inspeksi([record(0), record(1, aset_id=N_ASET + 1), record(2, uuid='bukan-uuid'),
+                              record(3, waktu_survei='2999-01-01T00:00:00'), {'uuid': str(uuid.UUID(int=99))},
+                              record(4, kondisi_sipil='sedang')])
+    assert h['diterima'] == 1 and len(h['ditolak']) == 5, h['ditolak']
+    assert app.hitung_baris('inspeksi_aset') == 1
+    with pytest.raises(ValueError):
+        app.sinkron_inspeksi([record(5)], kursor='epoch-tanpa-seq')
+
+
+def test_kursor_hanya_menarik_delta(app):
+    awal = app.tarik_perubahan(batas=10)
+    assert len(awal['master_aset']) == 10 and awal['lagi'] and not awal['reset']
+    lanjut = app.tarik_perubahan(awal['kursor'], batas=100)
+    assert [m['id'] for m in lanjut['master_aset']] == list(range(11, N_ASET + 1)) and not lanjut['lagi']
+    kursor = lanjut['kursor']
+    assert app.tarik_perubahan(kursor)['master_aset'] == []
+
+    with app._tulis() as cur:
+        cur.execute("UPDATE master_aset SET nama_aset = 'Aset 5 (rev)' WHERE id = 5")
+        cur.execute("DELETE FROM master_aset WHERE id = 7")
+        cur.execute("INSERT INTO master_aset (id, kode_aset, nama_aset) VALUES (100, 'BND-100', 'Aset baru')")
+    delta = app.tarik_perubahan(kursor)
+    assert [(m['id'], m['nama_aset']) for m in delta['master_aset']] == [(5, 'Aset 5 (rev)'), (100, 'Aset baru')]
+    assert delta['hapus'] == [7]
+
+    # sinkron_inspeksi ikut mengembalikan delta yang sama
+    assert app.sinkron_inspeksi([record(0)], kursor=kursor)['perubahan']['hapus'] == [7]
+    assert app.tarik_perubahan(delta['kursor'])['master_aset'] == []
+
+
+def test_kursor_reset_setelah_restore(app):
+    kursor = app.tarik_perubahan(batas=N_ASET)['kursor']
+    backup = io.BytesIO(app.export_ke_json().encode())
+    assert app.import_dari_json(backup).startswith("✅")
+    # Epoch baru: perangkat dengan kursor lama wajib memuat ulang seluruh master
+    hasil = app.tarik_perubahan(kursor, batas=N_ASET)
+    assert hasil['reset'] and len(hasil['master_aset']) == N_ASET
+    assert not app.tarik_perubahan(hasil['kursor'])['reset']